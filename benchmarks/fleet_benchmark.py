@@ -0,0 +1,422 @@
+"""
+SOS device fleet load benchmark.
+
+Runs create_app("testing") in-process and simulates a fleet of devices that
+trigger SOS events, stream a location every --interval seconds and file
+complaints, while admins poll the dashboard, the live map and analytics.
+Reports throughput and p50/p95/p99 latency per endpoint for each database.
+
+    python -m benchmarks.fleet_benchmark --devices 200 --admins 4 --duration 60 \\
+        --database sqlite --database postgresql://localhost/pyraksha_bench
+
+"sqlite" runs against a fresh temporary file. Any other URL is used as-is;
+pass --drop to drop the application's tables in it first.
+"""
+
+import argparse
+import heapq
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+from src.core.constants import SOS_LOCATION_UPDATE_INTERVAL
+
+PASSWORD = "benchmark-password"
+PERCENTILES = (50, 95, 99)
+
+
+class Recorder:
+    """Collects request latencies per endpoint, safe to share across threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies = defaultdict(list)
+        self._errors = defaultdict(int)
+        self._exceptions = defaultdict(lambda: defaultdict(int))
+        self._lag = []
+
+    def call(self, name, request, *args, **kwargs):
+        """
+        Time one request. Returns the response, or None when the request
+        raised (TESTING propagates view exceptions); either failure is
+        counted against `name` and the run carries on.
+        """
+        started = time.perf_counter()
+        try:
+            response = request(*args, **kwargs)
+        except Exception as error:
+            self.fail(name, error)
+            return None
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._latencies[name].append(elapsed)
+            if response.status_code >= 400:
+                self._errors[name] += 1
+        return response
+
+    def fail(self, name, error):
+        with self._lock:
+            self._errors[name] += 1
+            self._exceptions[name][f"{type(error).__name__}: {error}"[:200]] += 1
+
+    def lag(self, seconds):
+        with self._lock:
+            self._lag.append(seconds)
+
+    def report(self, duration):
+        endpoints = {}
+        for name in sorted(set(self._latencies) | set(self._errors)):
+            latencies = self._latencies[name]
+            endpoints[name] = {
+                "requests": len(latencies),
+                "errors": self._errors[name],
+                "throughput_per_sec": round(len(latencies) / duration, 2),
+                **_summarize(latencies),
+            }
+            if name in self._exceptions:
+                endpoints[name]["exceptions"] = dict(self._exceptions[name])
+        total = sum(len(latencies) for latencies in self._latencies.values())
+        return {
+            "requests": total,
+            "errors": sum(self._errors.values()),
+            "throughput_per_sec": round(total / duration, 2),
+            "schedule_lag": _summarize(self._lag),
+            "endpoints": endpoints,
+        }
+
+
+def _summarize(samples):
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    # Nearest-rank percentiles
+    summary = {
+        f"p{p}_ms": round(
+            ordered[max(math.ceil(len(ordered) * p / 100) - 1, 0)] * 1000, 2
+        )
+        for p in PERCENTILES
+    }
+    summary["max_ms"] = round(ordered[-1] * 1000, 2)
+    return summary
+
+
+class Device:
+    def __init__(self, index, token, rng):
+        self.index = index
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.latitude = 19.0 + rng.random()
+        self.longitude = 72.8 + rng.random()
+        self.sos_id = None
+        self.updates = 0
+
+    def location(self, rng):
+        self.latitude += rng.uniform(-0.0005, 0.0005)
+        self.longitude += rng.uniform(-0.0005, 0.0005)
+        return {
+            "latitude": round(self.latitude, 6),
+            "longitude": round(self.longitude, 6),
+            "accuracy": round(rng.uniform(3, 30), 1),
+        }
+
+
+def _create_users(app, count, role, prefix):
+    from src.core.extensions import db
+    from src.models.user import User
+
+    emails = []
+    with app.app_context():
+        password_hash = None
+        for index in range(count):
+            email = f"{prefix}-{index}-{uuid.uuid4().hex[:8]}@pyraksha.test"
+            user = User(
+                user_id=str(uuid.uuid4()),
+                name=f"{prefix} {index}",
+                email=email,
+                phone="0",
+                role=role,
+            )
+            # Hashing once keeps setup fast for large fleets
+            if password_hash is None:
+                user.set_password(PASSWORD)
+                password_hash = user.password_hash
+            user.password_hash = password_hash
+            db.session.add(user)
+            emails.append(email)
+        db.session.commit()
+    return emails
+
+
+def _device_step(client, device, recorder, options, rng):
+    if device.sos_id is None:
+        sos_id = f"bench-{uuid.uuid4()}"
+        response = recorder.call(
+            "POST /api/sos/trigger",
+            client.post,
+            "/api/sos/trigger",
+            json={"sos_id": sos_id, "location": device.location(rng)},
+            headers=device.headers,
+        )
+        # Trigger again on the next step rather than stream to a missing event
+        if response is not None and response.status_code < 400:
+            device.sos_id = sos_id
+        return
+
+    recorder.call(
+        "POST /api/sos/update_location",
+        client.post,
+        "/api/sos/update_location",
+        json={"sos_id": device.sos_id, "location": device.location(rng)},
+        headers=device.headers,
+    )
+    device.updates += 1
+
+    if options.complaint_every and device.updates % options.complaint_every == 0:
+        recorder.call(
+            "POST /api/complaints/file",
+            client.post,
+            "/api/complaints/file",
+            json={
+                "complaint_id": str(uuid.uuid4()),
+                "title": "Benchmark complaint",
+                "description": "Street light not working near the bus stop",
+                **device.location(rng),
+            },
+            headers=device.headers,
+        )
+
+
+def _run_devices(app, devices, recorder, options, stop_at):
+    """
+    Replay every device on its own schedule with a fixed pool of client
+    threads. Lag between when a step was due and when it started shows when
+    the pool, and so the server, can no longer keep up.
+    """
+    start = time.monotonic()
+    rng = random.Random(options.seed)
+    schedule = [
+        # Spread the first SOS triggers evenly over one interval
+        (start + options.interval * index / len(devices), index)
+        for index in range(len(devices))
+    ]
+    heapq.heapify(schedule)
+    lock = threading.Lock()
+
+    def worker(seed):
+        client = app.test_client()
+        worker_rng = random.Random(seed)
+        while True:
+            with lock:
+                due, index = heapq.heappop(schedule)
+                if due >= stop_at:
+                    heapq.heappush(schedule, (due, index))
+                    return
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                recorder.lag(-delay)
+
+            try:
+                _device_step(client, devices[index], recorder, options, worker_rng)
+            except Exception as error:
+                recorder.fail("device step", error)
+            with lock:
+                heapq.heappush(schedule, (due + options.interval, index))
+
+    pool = [
+        threading.Thread(target=worker, args=(rng.random(),))
+        for _ in range(options.threads)
+    ]
+    for thread in pool:
+        thread.start()
+    return pool
+
+
+def _map_version(response):
+    """The map cursor from a /admin/map/changes response, or None."""
+    if response is None:
+        return None
+    return (response.get_json(silent=True) or {}).get("version")
+
+
+def _run_admin(app, email, recorder, options, stop_at):
+    client = app.test_client()
+    recorder.call(
+        "POST /auth/login",
+        client.post,
+        "/auth/login",
+        data={"email": email, "password": PASSWORD},
+    )
+    version = _map_version(
+        recorder.call("GET /admin/map/changes", client.get, "/admin/map/changes")
+    )
+
+    polls = (
+        ("GET /admin/dashboard", "/admin/dashboard"),
+        ("GET /admin/analytics", "/admin/analytics"),
+    )
+    while time.monotonic() < stop_at:
+        try:
+            url = "/admin/map/changes"
+            if version is not None:
+                url += f"?since={version}"
+            # A failed poll starts over with a full reload
+            version = _map_version(
+                recorder.call("GET /admin/map/changes", client.get, url)
+            )
+            for name, url in polls:
+                recorder.call(name, client.get, url)
+        except Exception as error:
+            recorder.fail("admin poll", error)
+        time.sleep(options.admin_interval)
+
+
+def _drop_tables(url):
+    """
+    Drop everything bootstrap creates, so it starts again from an empty
+    database: the models' tables, the alembic revision (otherwise upgrade
+    thinks the schema is current and creates nothing) and the SQLite
+    full-text table. Its triggers, and the PostgreSQL search column and
+    index, go with the complaints table.
+    """
+    from sqlalchemy import create_engine
+    from src.core.extensions import db
+    from src.services.search_service import SQLITE_FTS_TABLE
+    import src.models  # noqa: F401  registers every table on db.metadata
+
+    engine = create_engine(url)
+    db.metadata.drop_all(engine)
+    with engine.begin() as connection:
+        for table in (SQLITE_FTS_TABLE, "alembic_version"):
+            connection.exec_driver_sql(f"DROP TABLE IF EXISTS {table}")
+    engine.dispose()
+
+
+def _run_database(options):
+    """Runs in a fresh process, with TEST_DATABASE_URL already set."""
+    if options.drop:
+        _drop_tables(os.environ["TEST_DATABASE_URL"])
+
+    from src.app import create_app
+    from src.core.extensions import db
+    from src.services.location_writer import location_writer
+
+    app = create_app("testing")
+    device_emails = _create_users(app, options.devices, "user", "device")
+    admin_emails = _create_users(app, options.admins, "admin", "admin")
+
+    client = app.test_client()
+    rng = random.Random(options.seed)
+    devices = []
+    for index, email in enumerate(device_emails):
+        response = client.post(
+            "/api/auth/login", json={"email": email, "password": PASSWORD}
+        )
+        devices.append(Device(index, response.get_json()["token"], rng))
+
+    recorder = Recorder()
+    started = time.monotonic()
+    stop_at = started + options.duration
+    admins = [
+        threading.Thread(
+            target=_run_admin, args=(app, email, recorder, options, stop_at)
+        )
+        for email in admin_emails
+    ]
+    for thread in admins:
+        thread.start()
+    for thread in _run_devices(app, devices, recorder, options, stop_at) + admins:
+        thread.join()
+    elapsed = time.monotonic() - started
+    location_writer.stop()
+
+    with app.app_context():
+        dialect = db.engine.dialect.name
+
+    return {"database": dialect, **recorder.report(elapsed)}
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--devices", type=int, default=100)
+    parser.add_argument("--admins", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=SOS_LOCATION_UPDATE_INTERVAL,
+        help="seconds between location updates of one device",
+    )
+    parser.add_argument(
+        "--complaint-every",
+        type=int,
+        default=30,
+        help="file a complaint every this many updates (0 to disable)",
+    )
+    parser.add_argument("--admin-interval", type=float, default=2.0)
+    parser.add_argument("--threads", type=int, default=(os.cpu_count() or 1) * 4)
+    parser.add_argument(
+        "--database",
+        action="append",
+        help='"sqlite" or a database URL; repeat to compare (default: sqlite)',
+    )
+    parser.add_argument(
+        "--drop", action="store_true", help="drop the app's tables in URLs first"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for database in args.database or ["sqlite"]:
+        if database == "sqlite":
+            url = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "fleet.db")
+            options = argparse.Namespace(**{**vars(args), "drop": False})
+        else:
+            url, options = database, args
+
+        # Read by TestingConfig when the child process imports the app
+        os.environ["TEST_DATABASE_URL"] = url
+        with context.Pool(1) as pool:
+            results.append(pool.apply(_run_database, (options,)))
+
+    config = {key: value for key, value in vars(args).items() if key != "database"}
+    report = {
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "config": config,
+        "results": results,
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
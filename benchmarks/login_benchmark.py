@@ -0,0 +1,129 @@
+"""
+Login throughput benchmark.
+
+Measures password verifications per second, and optionally full
+/api/auth/login round-trips, for one or more bcrypt cost factors, and
+normalises them per core of hashing capacity.
+
+    python -m benchmarks.login_benchmark --rounds 10,12 --threads 8 --http
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+
+from src.app import create_app
+from src.core.extensions import db
+from src.core.security import password_hasher
+from src.models.user import User
+
+PASSWORD = "benchmark-password"
+
+
+def _run_for(duration, threads, operation):
+    stop_at = time.monotonic() + duration
+    counts = [0] * threads
+    errors = [0] * threads
+
+    def worker(index):
+        while time.monotonic() < stop_at:
+            if operation():
+                counts[index] += 1
+            else:
+                errors[index] += 1
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    started = time.monotonic()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    return sum(counts) / elapsed, sum(errors)
+
+
+def benchmark_rounds(app, rounds, workers, threads, duration, http):
+    app.config["BCRYPT_LOG_ROUNDS"] = rounds
+    app.config["PASSWORD_HASH_WORKERS"] = workers
+    password_hasher.init_app(app)
+
+    email = f"bench-{uuid.uuid4().hex[:8]}@pyraksha.test"
+    with app.app_context():
+        user = User(user_id=str(uuid.uuid4()), name="Bench", email=email, phone="0")
+        user.set_password(PASSWORD)
+        db.session.add(user)
+        db.session.commit()
+        password_hash = user.password_hash
+
+    cores = min(workers, os.cpu_count() or 1)
+    verify_rate, verify_errors = _run_for(
+        duration, threads, lambda: password_hasher.verify(PASSWORD, password_hash)
+    )
+    result = {
+        "rounds": rounds,
+        "hash_workers": workers,
+        "client_threads": threads,
+        "verify_per_sec": round(verify_rate, 2),
+        "verify_per_sec_per_core": round(verify_rate / cores, 2),
+        "verify_errors": verify_errors,
+    }
+
+    if http:
+        local = threading.local()
+
+        def login():
+            if not hasattr(local, "client"):
+                local.client = app.test_client()
+            response = local.client.post(
+                "/api/auth/login", json={"email": email, "password": PASSWORD}
+            )
+            return response.status_code == 200
+
+        login_rate, login_errors = _run_for(duration, threads, login)
+        result.update(
+            {
+                "logins_per_sec": round(login_rate, 2),
+                "logins_per_sec_per_core": round(login_rate / cores, 2),
+                "login_errors": login_errors,
+            }
+        )
+
+    with app.app_context():
+        User.query.filter_by(email=email).delete()
+        db.session.commit()
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", default="10,12", help="comma separated costs")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--threads", type=int, default=(os.cpu_count() or 1) * 2)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--http", action="store_true", help="also run logins")
+    parser.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args()
+
+    app = create_app("testing")
+    results = [
+        benchmark_rounds(
+            app, int(rounds), args.workers, args.threads, args.duration, args.http
+        )
+        for rounds in args.rounds.split(",")
+    ]
+
+    report = {"cpu_count": os.cpu_count(), "results": results}
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
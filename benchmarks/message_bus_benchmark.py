@@ -0,0 +1,82 @@
+"""
+Socket.IO message bus benchmark.
+
+Publishes messages through the SQLite-backed client manager from one or
+more processes while a listener in this process counts them, and reports
+publish throughput and end-to-end delivery rate.
+
+    python -m benchmarks.message_bus_benchmark --messages 20000 --publishers 4
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+
+from src.core.message_bus import SQLiteManager
+
+
+def _publish(url, count):
+    manager = SQLiteManager(url, channel="benchmark", write_only=True)
+    for index in range(count):
+        manager._publish(
+            {"method": "emit", "event": "benchmark", "data": {"index": index}}
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--publishers", type=int, default=4)
+    parser.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args()
+
+    url = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bus.db")
+    listener = SQLiteManager(url, channel="benchmark")
+    received = []
+    per_publisher = args.messages // args.publishers
+    expected = per_publisher * args.publishers
+
+    def listen():
+        for _ in listener._listen():
+            received.append(time.perf_counter())
+            if len(received) >= expected:
+                return
+
+    thread = threading.Thread(target=listen, daemon=True)
+    thread.start()
+    time.sleep(0.1)
+
+    started = time.perf_counter()
+    publishers = [
+        multiprocessing.Process(target=_publish, args=(url, per_publisher))
+        for _ in range(args.publishers)
+    ]
+    for process in publishers:
+        process.start()
+    for process in publishers:
+        process.join()
+    published = time.perf_counter() - started
+
+    thread.join(timeout=30)
+    delivered = (received[-1] - started) if received else float("inf")
+
+    report = {
+        "publishers": args.publishers,
+        "messages": expected,
+        "received": len(received),
+        "publish_per_sec": round(expected / published, 2),
+        "delivered_per_sec": round(len(received) / delivered, 2),
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+App startup benchmark.
+
+Times how long a process takes to serve its first request in four cases:
+
+  cold_boot_bootstrap  fresh interpreter, create_app() bootstrapping the schema
+                       and admin on every start (BOOTSTRAP_ON_STARTUP=true)
+  cold_boot_lean       fresh interpreter, lean create_app()
+  worker_fork_cold     worker forked from a master that has not loaded the app,
+                       as gunicorn does without preload_app
+  worker_fork_warm     worker forked from a master that ran create_app() and
+                       warm_up(), as gunicorn.conf.py does with preload_app
+
+    python -m benchmarks.startup_benchmark --runs 20 --database sqlite
+
+The worker_fork_* cases are what a worker recycle (max_requests, a crash, a
+HUP) costs; the cold_boot_* cases include interpreter startup.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+CASES = (
+    "cold_boot_bootstrap",
+    "cold_boot_lean",
+    "worker_fork_cold",
+    "worker_fork_warm",
+)
+
+
+def _summarize(samples):
+    ordered = sorted(samples)
+    return {
+        "runs": len(ordered),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 1),
+        "p95_ms": round(ordered[max(int(len(ordered) * 0.95) - 1, 0)] * 1000, 1),
+        "min_ms": round(ordered[0] * 1000, 1),
+        "max_ms": round(ordered[-1] * 1000, 1),
+    }
+
+
+def _serve_first_request(url, app=None):
+    if app is None:
+        from src.app import create_app
+
+        app = create_app("testing")
+    response = app.test_client().get(url)
+    if response.status_code >= 400:
+        raise SystemExit(f"GET {url} returned {response.status_code}")
+
+
+def _child_boot(url):
+    """Runs in a fresh interpreter; reports its own phases on stdout."""
+    started = time.perf_counter()
+    from src.app import create_app
+
+    imported = time.perf_counter()
+    app = create_app("testing")
+    created = time.perf_counter()
+    _serve_first_request(url, app)
+    finished = time.perf_counter()
+    print(
+        json.dumps(
+            {
+                "import": imported - started,
+                "create_app": created - imported,
+                "first_request": finished - created,
+            }
+        )
+    )
+
+
+def _child_forks(url, runs, warm):
+    """
+    Plays a gunicorn master: loads and warms the app first when `warm`, then
+    forks `runs` workers one after the other and reports how long each took
+    from fork() to its first response.
+    """
+    app = None
+    if warm:
+        from src.app import create_app, warm_up
+
+        app = create_app("testing")
+        warm_up(app)
+
+    timings = []
+    for _ in range(runs):
+        read_fd, write_fd = os.pipe()
+        started = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            if warm:
+                from src.app import after_fork
+
+                after_fork(app)
+            _serve_first_request(url, app)
+            os.write(write_fd, str(time.perf_counter() - started).encode())
+            os._exit(0)
+
+        os.close(write_fd)
+        with os.fdopen(read_fd) as pipe:
+            elapsed = pipe.read()
+        os.waitpid(pid, 0)
+        if not elapsed:
+            raise SystemExit("forked worker failed to serve its first request")
+        timings.append(float(elapsed))
+
+    print(json.dumps(timings))
+
+
+def _run_child(args, env):
+    command = [sys.executable, "-m", "benchmarks.startup_benchmark", *args]
+    started = time.perf_counter()
+    output = subprocess.run(
+        command, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return time.perf_counter() - started, json.loads(output.strip().splitlines()[-1])
+
+
+def _cold_boots(options, env, bootstrap):
+    env = {**env, "BOOTSTRAP_ON_STARTUP": "true" if bootstrap else "false"}
+    totals, phases = [], {"import": [], "create_app": [], "first_request": []}
+    for _ in range(options.runs):
+        elapsed, child = _run_child(["--child", "boot", "--url", options.url], env)
+        totals.append(elapsed)
+        for phase, seconds in child.items():
+            phases[phase].append(seconds)
+    return {
+        **_summarize(totals),
+        "phases_p50_ms": {
+            phase: _summarize(samples)["p50_ms"] for phase, samples in phases.items()
+        },
+    }
+
+
+def _worker_forks(options, env, warm):
+    env = {**env, "BOOTSTRAP_ON_STARTUP": "false"}
+    child = ["--child", "forks", "--url", options.url, "--runs", str(options.runs)]
+    if warm:
+        child.append("--warm")
+    _, timings = _run_child(child, env)
+    return _summarize(timings)
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--url", default="/auth/login", help="first request each process serves"
+    )
+    parser.add_argument(
+        "--database",
+        default="sqlite",
+        help='"sqlite" for a fresh temporary file, or a database URL',
+    )
+    parser.add_argument("--case", action="append", choices=CASES)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--child", choices=("boot", "forks"), help=argparse.SUPPRESS)
+    parser.add_argument("--warm", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child == "boot":
+        return _child_boot(args.url)
+    if args.child == "forks":
+        return _child_forks(args.url, args.runs, args.warm)
+
+    url = args.database
+    if url == "sqlite":
+        url = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "startup.db")
+    # Read by TestingConfig in every child process
+    env = {**os.environ, "TEST_DATABASE_URL": url}
+
+    # Create the schema once, so every case starts from the same database
+    _run_child(["--child", "boot", "--url", args.url], env)
+
+    cases = {
+        "cold_boot_bootstrap": lambda: _cold_boots(args, env, bootstrap=True),
+        "cold_boot_lean": lambda: _cold_boots(args, env, bootstrap=False),
+        "worker_fork_cold": lambda: _worker_forks(args, env, warm=False),
+        "worker_fork_warm": lambda: _worker_forks(args, env, warm=True),
+    }
+    results = {name: cases[name]() for name in args.case or CASES}
+
+    config = {key: value for key, value in vars(args).items() if key in ("runs", "url")}
+    report = {
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "database": url.split(":", 1)[0],
+        "config": config,
+        "results": results,
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
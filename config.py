@@ -1,6 +1,8 @@
 import os
+import tempfile
 from datetime import timedelta
 from typing import Type
+from src.core.constants import MAX_LOCATION_HISTORY
 
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 
@@ -25,6 +27,109 @@ class Config:
     SOCKETIO_ASYNC_MODE = os.environ.get("SOCKETIO_ASYNC_MODE", "threading")
     SOCKETIO_CORS_ALLOWED_ORIGINS = "*"
 
+    # Pub/sub queue that relays emits between workers: sqlite:///<path> for the
+    # built-in single-host broker, or any URL Flask-SocketIO supports
+    # (redis://, amqp://, ...) across hosts; empty for a single process
+    SOCKETIO_MESSAGE_QUEUE = os.environ.get(
+        "SOCKETIO_MESSAGE_QUEUE",
+        f"sqlite:///{os.path.join(BASE_DIR, 'instance', 'socketio_bus.db')}",
+    )
+    SOCKETIO_CHANNEL = "pyraksha"
+    SOCKETIO_BUS_POLL_INTERVAL_MS = 10
+    SOCKETIO_BUS_RETENTION = 60
+
+    # Write-behind pipeline for location rows; durability is "sync" (wait for
+    # the group commit) or "async" (return once queued)
+    LOCATION_WRITE_BEHIND = (
+        os.environ.get("LOCATION_WRITE_BEHIND", "false").lower() == "true"
+    )
+    LOCATION_WRITE_DURABILITY = os.environ.get("LOCATION_WRITE_DURABILITY", "sync")
+    LOCATION_WRITE_BATCH_SIZE = 500
+    LOCATION_WRITE_MAX_DELAY_MS = 50
+    LOCATION_WRITE_TIMEOUT = 5
+
+    # Retention per location update_type, applied by `flask locations prune`.
+    # Points older than full_resolution_days are thinned to one per
+    # downsample_seconds per track, points older than max_age_days are
+    # deleted, and each user keeps at most max_per_user points; None disables
+    # a rule. Tracks of active SOS events are never touched.
+    LOCATION_RETENTION_POLICIES = {
+        "sos": {
+            "full_resolution_days": 30,
+            "downsample_seconds": 60,
+            "max_age_days": None,
+            "max_per_user": None,
+        },
+        "periodic": {
+            "full_resolution_days": 1,
+            "downsample_seconds": 300,
+            "max_age_days": 90,
+            "max_per_user": MAX_LOCATION_HISTORY,
+        },
+        "manual": {
+            "full_resolution_days": None,
+            "downsample_seconds": None,
+            "max_age_days": 365,
+            "max_per_user": MAX_LOCATION_HISTORY,
+        },
+    }
+    LOCATION_RETENTION_BATCH_SIZE = 1000
+
+    # Seconds before a worker rebuilds its active-SOS registry from the database
+    # to pick up SOS events created or resolved by other workers
+    ACTIVE_SOS_REGISTRY_TTL = 5
+
+    # Seconds the admin dashboard counters are cached between writes
+    METRICS_CACHE_TTL = 5
+
+    # Heatmaps are computed over windows ending at the start of the current
+    # HEATMAP_BUCKET_SECONDS bucket and cached until the next one begins
+    HEATMAP_BUCKET_SECONDS = 60
+    HEATMAP_CACHE_SIZE = 256
+    HEATMAP_CELLS_PER_TILE = 32
+    HEATMAP_CHUNK_SIZE = 50000
+
+    # Rows fetched and encoded per step of a streaming export
+    EXPORT_CHUNK_SIZE = 5000
+
+    # Prometheus metrics for this worker process, served at METRICS_PATH;
+    # scrapes must send "Authorization: Bearer <METRICS_TOKEN>" when it is set
+    METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_PATH = "/metrics"
+    METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+
+    # Create the schema, indexes and default admin in create_app() instead
+    # of leaving it to `flask bootstrap`
+    BOOTSTRAP_ON_STARTUP = (
+        os.environ.get("BOOTSTRAP_ON_STARTUP", "false").lower() == "true"
+    )
+    # Alembic revisions that `flask bootstrap` and `flask db upgrade` apply
+    MIGRATIONS_DIR = os.path.join(BASE_DIR, "migrations")
+
+    # Per-request SQL recording that flags repeated statement shapes (N+1)
+    # and requests over their query budget; strict mode raises on either
+    QUERY_AUDIT = os.environ.get("QUERY_AUDIT", "false").lower() == "true"
+    QUERY_AUDIT_STRICT = os.environ.get("QUERY_AUDIT_STRICT", "false").lower() == "true"
+    # Above the three near-identical analytics series, below the audit's rows
+    QUERY_AUDIT_REPEAT_THRESHOLD = 4
+
+    # Identity snapshots used to authorize API tokens without a user query
+    AUTH_CACHE_SIZE = 10000
+    AUTH_CACHE_TTL = 60
+    # Seconds between each worker's reads of the role, password and account
+    # changes other workers committed; 0 leaves them to AUTH_CACHE_TTL
+    AUTH_CACHE_SYNC_INTERVAL = 1.0
+
+    # bcrypt cost factor; existing hashes are upgraded on the next login after
+    # it changes
+    BCRYPT_LOG_ROUNDS = int(os.environ.get("BCRYPT_LOG_ROUNDS", 12))
+    PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_TIMEOUT = 30
+    # Hashes allowed to wait for a worker before logins are turned away with
+    # a 503, and the Retry-After (seconds) sent with it
+    PASSWORD_HASH_MAX_QUEUE = int(os.environ.get("PASSWORD_HASH_MAX_QUEUE", 32))
+    PASSWORD_HASH_RETRY_AFTER = 2
+
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024
 
     UPLOAD_FOLDER = os.path.join(
@@ -36,17 +141,38 @@ class Config:
 class DevelopmentConfig(Config):
     DEBUG = True
     TESTING = False
+    QUERY_AUDIT = True
+    BOOTSTRAP_ON_STARTUP = (
+        os.environ.get("BOOTSTRAP_ON_STARTUP", "true").lower() == "true"
+    )
 
 
 class ProductionConfig(Config):
     DEBUG = False
     TESTING = False
     SESSION_COOKIE_SECURE = True
+    # Off unless scrapes are authenticated, or METRICS_ENABLED=true says the
+    # endpoint is only reachable from a trusted network
+    METRICS_ENABLED = (
+        os.environ.get(
+            "METRICS_ENABLED", "true" if Config.METRICS_TOKEN else "false"
+        ).lower()
+        == "true"
+    )
 
 
 class TestingConfig(Config):
     TESTING = True
-    SQLALCHEMY_DATABASE_URI = "sqlite:///test_pyraksha.db"
+    BOOTSTRAP_ON_STARTUP = (
+        os.environ.get("BOOTSTRAP_ON_STARTUP", "true").lower() == "true"
+    )
+    BCRYPT_LOG_ROUNDS = int(os.environ.get("BCRYPT_LOG_ROUNDS", 4))
+    SOCKETIO_MESSAGE_QUEUE = os.environ.get("SOCKETIO_MESSAGE_QUEUE", "")
+    # Outside the repo, so test runs leave no database behind in instance/
+    SQLALCHEMY_DATABASE_URI = os.environ.get(
+        "TEST_DATABASE_URL",
+        f"sqlite:///{os.path.join(tempfile.gettempdir(), 'pyraksha_test.db')}",
+    )
 
 
 config_by_name = {
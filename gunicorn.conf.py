@@ -0,0 +1,38 @@
+"""
+Gunicorn settings, read from the working directory by default:
+
+    BOOTSTRAP_ON_STARTUP=false flask --app 'src.app:create_app("production")' bootstrap
+    gunicorn 'src.app:create_app("production")'
+
+The app is imported once in the master and warmed there, so every worker
+forks with the modules, templates and registries already loaded instead of
+building them itself. Schema creation and the admin seed are left to
+`flask bootstrap`, run once per deploy.
+"""
+
+import os
+
+# The release step owns the schema; workers never bootstrap
+os.environ.setdefault("BOOTSTRAP_ON_STARTUP", "false")
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", 4))
+threads = int(os.environ.get("GUNICORN_THREADS", 1))
+preload_app = os.environ.get("GUNICORN_PRELOAD", "true").lower() == "true"
+# Recycle workers now and then; with preload a replacement starts warm
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 0))
+max_requests_jitter = max_requests // 10
+
+
+def when_ready(server):
+    if preload_app:
+        from src.app import warm_up
+
+        warm_up(server.app.wsgi())
+
+
+def post_fork(server, worker):
+    if preload_app:
+        from src.app import after_fork
+
+        after_fork(server.app.wsgi())
@@ -0,0 +1,108 @@
+"""initial schema
+
+Revision ID: 49b5bee086f8
+Revises:
+Create Date: 2026-10-18 13:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '49b5bee086f8'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('email', sa.String(length=120), nullable=False),
+    sa.Column('phone', sa.String(length=20), nullable=False),
+    sa.Column('password_hash', sa.String(length=256), nullable=False),
+    sa.Column('role', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('last_login', sa.DateTime(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_user_id'), 'users', ['user_id'], unique=True)
+    op.create_table('complaints',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('complaint_id', sa.String(length=36), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('timestamp', sa.DateTime(), nullable=False),
+    sa.Column('resolved_at', sa.DateTime(), nullable=True),
+    sa.Column('resolved_by', sa.Integer(), nullable=True),
+    sa.Column('resolution_notes', sa.Text(), nullable=True),
+    sa.Column('latitude', sa.Float(), nullable=True),
+    sa.Column('longitude', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['resolved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_complaints_complaint_id'), 'complaints', ['complaint_id'], unique=True)
+    op.create_index(op.f('ix_complaints_status'), 'complaints', ['status'], unique=False)
+    op.create_index(op.f('ix_complaints_timestamp'), 'complaints', ['timestamp'], unique=False)
+    op.create_index(op.f('ix_complaints_user_id'), 'complaints', ['user_id'], unique=False)
+    op.create_table('sos',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('sos_id', sa.String(length=36), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('start_time', sa.DateTime(), nullable=False),
+    sa.Column('end_time', sa.DateTime(), nullable=True),
+    sa.Column('resolved_by', sa.Integer(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['resolved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sos_sos_id'), 'sos', ['sos_id'], unique=True)
+    op.create_index(op.f('ix_sos_start_time'), 'sos', ['start_time'], unique=False)
+    op.create_index(op.f('ix_sos_status'), 'sos', ['status'], unique=False)
+    op.create_index(op.f('ix_sos_user_id'), 'sos', ['user_id'], unique=False)
+    op.create_table('locations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('sos_id', sa.Integer(), nullable=True),
+    sa.Column('latitude', sa.Float(), nullable=False),
+    sa.Column('longitude', sa.Float(), nullable=False),
+    sa.Column('accuracy', sa.Float(), nullable=True),
+    sa.Column('timestamp', sa.DateTime(), nullable=False),
+    sa.Column('update_type', sa.String(length=20), nullable=True),
+    sa.ForeignKeyConstraint(['sos_id'], ['sos.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_locations_sos_id'), 'locations', ['sos_id'], unique=False)
+    op.create_index(op.f('ix_locations_timestamp'), 'locations', ['timestamp'], unique=False)
+    op.create_index(op.f('ix_locations_user_id'), 'locations', ['user_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_locations_user_id'), table_name='locations')
+    op.drop_index(op.f('ix_locations_timestamp'), table_name='locations')
+    op.drop_index(op.f('ix_locations_sos_id'), table_name='locations')
+    op.drop_table('locations')
+    op.drop_index(op.f('ix_sos_user_id'), table_name='sos')
+    op.drop_index(op.f('ix_sos_status'), table_name='sos')
+    op.drop_index(op.f('ix_sos_start_time'), table_name='sos')
+    op.drop_index(op.f('ix_sos_sos_id'), table_name='sos')
+    op.drop_table('sos')
+    op.drop_index(op.f('ix_complaints_user_id'), table_name='complaints')
+    op.drop_index(op.f('ix_complaints_timestamp'), table_name='complaints')
+    op.drop_index(op.f('ix_complaints_status'), table_name='complaints')
+    op.drop_index(op.f('ix_complaints_complaint_id'), table_name='complaints')
+    op.drop_table('complaints')
+    op.drop_index(op.f('ix_users_user_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
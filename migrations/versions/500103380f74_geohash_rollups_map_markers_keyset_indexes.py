@@ -0,0 +1,103 @@
+"""geohash columns, rollups, map markers, checkpoints and keyset indexes
+
+Revision ID: 500103380f74
+Revises: 49b5bee086f8
+Create Date: 2026-10-18 13:45:00.000000
+
+Databases bootstrapped with create_all() before migrations existed may
+already have any of these tables, and newer ones already had the columns
+and indexes, so every step checks first. Rows stored before the geohash
+columns existed are filled in by BootstrapService after the upgrade.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '500103380f74'
+down_revision = '49b5bee086f8'
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ('ix_complaints_geohash', 'complaints', ['geohash']),
+    ('ix_complaints_timestamp_id', 'complaints', ['timestamp', 'id']),
+    ('ix_complaints_user_id_timestamp_id', 'complaints', ['user_id', 'timestamp', 'id']),
+    ('ix_locations_geohash', 'locations', ['geohash']),
+    (
+        'ix_locations_update_type_user_id_timestamp_id',
+        'locations',
+        ['update_type', 'user_id', 'timestamp', 'id'],
+    ),
+    ('ix_sos_start_time_id', 'sos', ['start_time', 'id']),
+    ('ix_sos_user_id_start_time_id', 'sos', ['user_id', 'start_time', 'id']),
+    ('ix_users_created_at_id', 'users', ['created_at', 'id']),
+)
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table('activity_rollups'):
+        op.create_table('activity_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('granularity', sa.String(length=10), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('kind', 'granularity', 'bucket_start', 'status', name='uq_activity_rollups_bucket')
+        )
+
+    if not inspector.has_table('job_checkpoints'):
+        op.create_table('job_checkpoints',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('position', sa.Text(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+        )
+
+    if not inspector.has_table('map_markers'):
+        op.create_table('map_markers',
+        sa.Column('sos_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('latitude', sa.Float(), nullable=False),
+        sa.Column('longitude', sa.Float(), nullable=False),
+        sa.Column('accuracy', sa.Float(), nullable=True),
+        sa.Column('timestamp', sa.DateTime(), nullable=False),
+        sa.Column('active', sa.Boolean(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['sos_id'], ['sos.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('sos_id')
+        )
+        op.create_index(op.f('ix_map_markers_version'), 'map_markers', ['version'], unique=False)
+
+    # Map versions no longer come from a shared counter row
+    if inspector.has_table('sync_versions'):
+        op.drop_table('sync_versions')
+
+    for table in ('complaints', 'locations'):
+        columns = {column['name'] for column in inspector.get_columns(table)}
+        if 'geohash' not in columns:
+            op.add_column(table, sa.Column('geohash', sa.String(length=12), nullable=True))
+
+    for name, table, columns in INDEXES:
+        existing = {index['name'] for index in inspector.get_indexes(table)}
+        if name not in existing:
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    with op.batch_alter_table('locations') as batch_op:
+        batch_op.drop_column('geohash')
+    with op.batch_alter_table('complaints') as batch_op:
+        batch_op.drop_column('geohash')
+    op.drop_index(op.f('ix_map_markers_version'), table_name='map_markers')
+    op.drop_table('map_markers')
+    op.drop_table('job_checkpoints')
+    op.drop_table('activity_rollups')
@@ -0,0 +1,69 @@
+"""version and updated_at on sos and complaints
+
+Revision ID: 796d19ae68f4
+Revises: 500103380f74
+Create Date: 2026-10-18 13:50:00.000000
+
+Existing rows start at version 1, with updated_at taken from the last
+time the row is known to have changed. SQLite cannot add a column with a
+non-constant default, so there updated_at is added nullable, filled in,
+and then given its default and NOT NULL by rebuilding the table; the
+table's triggers (the complaints full-text index) are recreated after the
+rebuild.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '796d19ae68f4'
+down_revision = '500103380f74'
+branch_labels = None
+depends_on = None
+
+LAST_CHANGED = {
+    'sos': 'coalesce(end_time, start_time)',
+    'complaints': 'coalesce(resolved_at, timestamp)',
+}
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    sqlite = bind.dialect.name == 'sqlite'
+
+    for table, last_changed in LAST_CHANGED.items():
+        columns = {column['name'] for column in inspector.get_columns(table)}
+        if 'version' not in columns:
+            op.add_column(table, sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+        if 'updated_at' in columns:
+            continue
+
+        if not sqlite:
+            op.add_column(table, sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=False))
+            op.execute(f'UPDATE {table} SET updated_at = {last_changed}')
+            continue
+
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(), nullable=True))
+        op.execute(f'UPDATE {table} SET updated_at = {last_changed}')
+        triggers = bind.execute(
+            sa.text("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = :table"),
+            {'table': table},
+        ).scalars().all()
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(
+                'updated_at',
+                existing_type=sa.DateTime(),
+                server_default=sa.func.now(),
+                nullable=False,
+            )
+        for trigger in triggers:
+            op.execute(trigger)
+
+
+def downgrade():
+    for table in LAST_CHANGED:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('updated_at')
+            batch_op.drop_column('version')
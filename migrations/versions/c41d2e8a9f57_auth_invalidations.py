@@ -0,0 +1,31 @@
+"""auth cache invalidations
+
+Revision ID: c41d2e8a9f57
+Revises: 796d19ae68f4
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41d2e8a9f57'
+down_revision = '796d19ae68f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('auth_invalidations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_auth_invalidations_created_at'), 'auth_invalidations', ['created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_auth_invalidations_created_at'), table_name='auth_invalidations')
+    op.drop_table('auth_invalidations')
@@ -3,6 +3,7 @@ from flask_login import current_user
 import jwt
 from datetime import datetime, timedelta
 from src.services.auth_service import AuthService
+from src.services.auth_cache import auth_cache
 from src.core.constants import UserRole
 from config import Config
 
@@ -56,6 +57,9 @@ def login():
     if not user.is_active:
         return jsonify({"success": False, "message": "Account deactivated"}), 403
 
+    if user.password_needs_rehash():
+        user.set_password(password)
+
     user.last_login = datetime.utcnow()
     from src.core.extensions import db
 
@@ -89,7 +93,7 @@ def verify_token():
     try:
         token = auth_header.split(" ")[1]
         payload = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=["HS256"])
-        user = AuthService.get_user_by_id(payload["user_id"])
+        user = auth_cache.get(payload["user_id"])
 
         if user and user.is_active:
             return jsonify({"success": True, "user": user.to_dict()}), 200
@@ -0,0 +1,44 @@
+import hashlib
+from datetime import datetime, timezone
+from typing import Callable, Optional
+from flask import Response, make_response, request
+from src.api.encoding import negotiate
+
+
+def make_etag(*parts) -> str:
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def conditional(
+    etag: str, last_modified: Optional[datetime], build: Callable
+) -> Response:
+    """
+    Answer 304 Not Modified when the request's If-None-Match (or, without
+    one, If-Modified-Since) still matches, otherwise return what `build`
+    renders. `build` only runs for a miss, so a revalidation neither loads
+    nor serializes the rows. ETags are weak: they follow the row versions,
+    not the exact bytes.
+    """
+    # The same rows are encoded differently per negotiated representation
+    etag = make_etag(etag, negotiate())
+    if last_modified is not None:
+        # HTTP dates have whole-second resolution
+        last_modified = last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+
+    if request.if_none_match:
+        fresh = request.if_none_match.contains_weak(etag)
+    else:
+        fresh = (
+            last_modified is not None
+            and request.if_modified_since is not None
+            and last_modified <= request.if_modified_since
+        )
+
+    response = Response(status=304) if fresh else make_response(build())
+    response.set_etag(etag, weak=True)
+    response.vary.add("Accept")
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
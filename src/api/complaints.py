@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
 from src.api.decorators import token_required
+from src.api.caching import conditional, make_etag
 from src.services.complaint_service import ComplaintService
+from src.services.serialization_service import SerializationService
+from src.utils.pagination import clamp_page_size
 
 api_complaints = Blueprint("api_complaints", __name__, url_prefix="/api/complaints")
 
@@ -41,31 +44,50 @@ def list_complaints(current_user):
 
     if current_user.is_admin():
         user_id = request.args.get("user_id", type=int)
-        if user_id:
-            complaints = ComplaintService.get_user_complaints(user_id, status)
-        else:
-            complaints = ComplaintService.get_all_complaints(status)
+        default_limit = 50 if user_id else 100
     else:
-        complaints = ComplaintService.get_user_complaints(current_user.id, status)
+        user_id = current_user.id
+        default_limit = 50
+
+    limit = clamp_page_size(request.args.get("limit", type=int), default_limit)
+    page = (user_id, status, request.args.get("cursor"), limit)
+
+    try:
+        rows, next_cursor = ComplaintService.get_complaints_page_versions(*page)
+    except ValueError:
+        return jsonify({"success": False, "message": "Invalid cursor"}), 400
+
+    def render():
+        complaints, next_cursor = ComplaintService.get_complaints_page(*page)
+        return jsonify(
+            {
+                "success": True,
+                "complaints": SerializationService.complaints_to_dict(complaints),
+                "next_cursor": next_cursor,
+            }
+        )
 
-    return (
-        jsonify({"success": True, "complaints": [c.to_dict() for c in complaints]}),
-        200,
-    )
+    etag = make_etag("complaints", [(row.id, row.version) for row in rows], next_cursor)
+    return conditional(etag, None, render)
 
 
 @api_complaints.route("/<complaint_id>", methods=["GET"])
 @token_required
 def get_complaint(current_user, complaint_id):
-    complaint = ComplaintService.get_complaint_by_id(complaint_id)
+    state = ComplaintService.get_complaint_version(complaint_id)
 
-    if not complaint:
+    if not state:
         return jsonify({"success": False, "message": "Complaint not found"}), 404
 
-    if complaint.user_id != current_user.id and not current_user.is_admin():
+    if state.user_id != current_user.id and not current_user.is_admin():
         return jsonify({"success": False, "message": "Unauthorized"}), 403
 
-    return jsonify({"success": True, "complaint": complaint.to_dict()}), 200
+    def render():
+        complaint = ComplaintService.get_complaint_by_id(complaint_id)
+        return jsonify({"success": True, "complaint": complaint.to_dict()})
+
+    etag = make_etag("complaint", state.id, state.version)
+    return conditional(etag, state.updated_at, render)
 
 
 @api_complaints.route("/<complaint_id>/status", methods=["PUT"])
@@ -99,12 +121,21 @@ def search_complaints(current_user):
     if not query:
         return jsonify({"success": False, "message": "Search query is required"}), 400
 
-    if current_user.is_admin():
-        complaints = ComplaintService.search_complaints(query)
-    else:
-        complaints = ComplaintService.search_complaints(query, current_user.id)
+    page = max(request.args.get("page", 1, type=int), 1)
+    limit = clamp_page_size(request.args.get("limit", type=int), 50)
+    user_id = None if current_user.is_admin() else current_user.id
+
+    complaints, next_page = ComplaintService.search_complaints(
+        query, user_id, page, limit
+    )
 
     return (
-        jsonify({"success": True, "complaints": [c.to_dict() for c in complaints]}),
+        jsonify(
+            {
+                "success": True,
+                "complaints": SerializationService.complaints_to_dict(complaints),
+                "next_page": next_page,
+            }
+        ),
         200,
     )
@@ -1,8 +1,22 @@
 from functools import wraps
+from typing import Optional
 from flask import request, jsonify
 import jwt
 from config import Config
-from src.services.auth_service import AuthService
+from src.services.auth_cache import auth_cache, CachedUser
+
+
+def get_user_from_token(token: str) -> Optional[CachedUser]:
+    """
+    Return the active user a JWT was issued to. Raises jwt.InvalidTokenError
+    (or ExpiredSignatureError) for tokens that do not verify.
+    """
+    payload = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=["HS256"])
+    current_user = auth_cache.get(payload["user_id"])
+
+    if not current_user or not current_user.is_active:
+        return None
+    return current_user
 
 
 def token_required(f):
@@ -15,10 +29,9 @@ def token_required(f):
 
         try:
             token = auth_header.split(" ")[1]
-            payload = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=["HS256"])
-            current_user = AuthService.get_user_by_id(payload["user_id"])
+            current_user = get_user_from_token(token)
 
-            if not current_user or not current_user.is_active:
+            if not current_user:
                 return jsonify({"success": False, "message": "Invalid token"}), 401
 
         except (jwt.ExpiredSignatureError, jwt.InvalidTokenError, IndexError):
@@ -0,0 +1,145 @@
+from datetime import datetime, timezone
+from typing import Any, Tuple
+from flask import Response, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON_MIMETYPE = "application/json"
+MSGPACK_MIMETYPE = "application/msgpack"
+_MSGPACK_ALIASES = (MSGPACK_MIMETYPE, "application/x-msgpack")
+
+# Accept parameter asking for location lists as one array per field
+COLUMNAR_LAYOUT = ("layout", "columnar")
+
+# Keys whose values are lists of Location.to_dict() rows
+LOCATION_LIST_KEYS = ("location_history", "locations")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def negotiate() -> Tuple[str, bool]:
+    """
+    Pick the response media type from the Accept header, and whether the
+    client asked for the columnar layout, e.g.
+    "Accept: application/msgpack; layout=columnar". JSON is the default.
+    """
+    if not has_request_context():
+        return JSON_MIMETYPE, False
+
+    for value, quality in request.accept_mimetypes:
+        if quality <= 0:
+            continue
+        mimetype, *params = [part.strip().lower() for part in value.split(";")]
+        if mimetype in _MSGPACK_ALIASES:
+            if msgpack is None:
+                continue
+            mimetype = MSGPACK_MIMETYPE
+        elif mimetype in (JSON_MIMETYPE, "application/*", "*/*"):
+            mimetype = JSON_MIMETYPE
+        else:
+            continue
+
+        columnar = any(
+            tuple(part.strip() for part in param.split("=", 1)) == COLUMNAR_LAYOUT
+            for param in params
+        )
+        return mimetype, columnar
+
+    return JSON_MIMETYPE, False
+
+
+def _epoch_millis(value):
+    if not value:
+        return value
+    timestamp = datetime.fromisoformat(value)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return round((timestamp - _EPOCH).total_seconds() * 1000)
+
+
+def _columns(rows: list) -> dict:
+    names = list(rows[0]) if rows else []
+    columns = {name: [row.get(name) for row in rows] for name in names}
+    if "timestamp" in columns:
+        columns["timestamp"] = [_epoch_millis(value) for value in columns["timestamp"]]
+    return columns
+
+
+def to_columnar(obj: Any) -> Any:
+    """
+    Rewrite every list of location dicts in `obj` as a struct of arrays, so
+    field names are sent once per list instead of once per point, and
+    timestamps as epoch milliseconds instead of ISO strings.
+    """
+    if isinstance(obj, dict):
+        return {
+            key: (
+                _columns(value)
+                if key in LOCATION_LIST_KEYS
+                and isinstance(value, list)
+                and all(isinstance(row, dict) for row in value)
+                else to_columnar(value)
+            )
+            for key, value in obj.items()
+        }
+    if isinstance(obj, list):
+        return [to_columnar(item) for item in obj]
+    return obj
+
+
+class APIJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider whose responses follow the request's Accept header: JSON
+    (through orjson when it is installed) by default, or MessagePack, either
+    of them optionally in the columnar layout. Every jsonify() call goes
+    through it.
+    """
+
+    def response(self, *args, **kwargs) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        mimetype, columnar = negotiate()
+        if columnar:
+            obj = to_columnar(obj)
+
+        if mimetype == MSGPACK_MIMETYPE:
+            body = msgpack.packb(obj, default=self.default)
+        else:
+            body = self._dump_json(obj)
+
+        response = self._app.response_class(body, mimetype=mimetype)
+        response.vary.add("Accept")
+        return response
+
+    def _dump_json(self, obj: Any):
+        """
+        Encode `obj` as JSON with the provider's sort_keys and compact
+        settings. The orjson output is equivalent to the stdlib encoder's but
+        not byte-identical: orjson always writes non-ASCII text as raw UTF-8
+        where Flask's ensure_ascii escapes it as \\uXXXX, and it writes NaN
+        and infinities as null. Both are valid JSON for any client.
+        """
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        if orjson is None:
+            dump_args = {"indent": 2} if pretty else {"separators": (",", ":")}
+            return f"{self.dumps(obj, **dump_args)}\n"
+
+        # Datetimes go through the same default() as the stdlib encoder
+        option = (
+            orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_APPEND_NEWLINE
+        )
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
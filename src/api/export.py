@@ -0,0 +1,33 @@
+from datetime import datetime
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from src.api.decorators import admin_required
+from src.services.export_service import (
+    ExportService,
+    ExportOptions,
+    EXPORT_FORMATS,
+    FORMAT_CSV,
+)
+
+api_export = Blueprint("api_export", __name__, url_prefix="/api/export")
+
+
+@api_export.route("/<dataset>", methods=["GET"])
+@admin_required
+def export(current_user, dataset):
+    export_format = request.args.get("format", FORMAT_CSV).lower()
+    valid, message = ExportService.validate(dataset, export_format)
+    if not valid:
+        return jsonify({"success": False, "message": message}), 400
+
+    try:
+        options = ExportOptions.from_args(request.args)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
+    mimetype, extension = EXPORT_FORMATS[export_format]
+    filename = f"{dataset}-{datetime.utcnow():%Y%m%dT%H%M%S}.{extension}"
+    return Response(
+        stream_with_context(ExportService.stream(dataset, export_format, options)),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
@@ -0,0 +1,198 @@
+from flask import Blueprint, request, jsonify
+from src.api.decorators import token_required, admin_required
+from src.services.location_service import LocationService, parse_timestamp
+from src.services.complaint_service import ComplaintService
+from src.services.serialization_service import SerializationService
+from src.core.constants import (
+    MAX_SEARCH_RADIUS_METERS,
+    MAX_PAGE_SIZE,
+    DEFAULT_PAGE_SIZE,
+    MAX_HEATMAP_HOURS,
+    MAX_HEATMAP_ZOOM,
+)
+from src.utils.pagination import clamp_page_size
+
+api_geo = Blueprint("api_geo", __name__, url_prefix="/api/geo")
+
+MODE_NEAREST = "nearest"
+MODE_RADIUS = "radius"
+MODE_BBOX = "bbox"
+
+
+def _parse_geo_args(args) -> dict:
+    """
+    Read one of three searches from the query string: lat, lon and k for the
+    k nearest; lat, lon and radius (meters) for a circle; or min_lat,
+    min_lon, max_lat and max_lon for a bounding box. Raises ValueError.
+    """
+    limit = clamp_page_size(args.get("limit", type=int), DEFAULT_PAGE_SIZE)
+
+    if "k" in args or "radius" in args:
+        latitude = args.get("lat", type=float)
+        longitude = args.get("lon", type=float)
+        if latitude is None or longitude is None:
+            raise ValueError("lat and lon are required")
+        if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+            raise ValueError("lat or lon out of range")
+
+        if "k" in args:
+            k = args.get("k", type=int)
+            if not k or not 1 <= k <= MAX_PAGE_SIZE:
+                raise ValueError(f"k must be between 1 and {MAX_PAGE_SIZE}")
+            return {"mode": MODE_NEAREST, "lat": latitude, "lon": longitude, "k": k}
+
+        radius = args.get("radius", type=float)
+        if not radius or not 0 < radius <= MAX_SEARCH_RADIUS_METERS:
+            raise ValueError(
+                f"radius must be between 0 and {MAX_SEARCH_RADIUS_METERS} meters"
+            )
+        return {
+            "mode": MODE_RADIUS,
+            "lat": latitude,
+            "lon": longitude,
+            "radius": radius,
+            "limit": limit,
+        }
+
+    box = _parse_box(args)
+    if box is None:
+        raise ValueError("Provide lat/lon with k or radius, or a bounding box")
+    return {"mode": MODE_BBOX, "box": box, "limit": limit}
+
+
+def _parse_box(args):
+    box = tuple(
+        args.get(name, type=float)
+        for name in ("min_lat", "min_lon", "max_lat", "max_lon")
+    )
+    if None in box:
+        return None
+    min_lat, min_lon, max_lat, max_lon = box
+    if not -90 <= min_lat <= max_lat <= 90:
+        raise ValueError("Invalid latitude range")
+    if not (-180 <= min_lon <= 180 and -180 <= max_lon <= 180):
+        raise ValueError("Invalid longitude range")
+    return box
+
+
+def _with_distance(item: dict, distance: float) -> dict:
+    item["distance_m"] = round(distance, 1)
+    return item
+
+
+@api_geo.route("/locations", methods=["GET"])
+@admin_required
+def search_locations(current_user):
+    try:
+        query = _parse_geo_args(request.args)
+        since = request.args.get("since")
+        since = parse_timestamp(since) if since else None
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
+    update_type = request.args.get("update_type")
+
+    if query["mode"] == MODE_BBOX:
+        locations = LocationService.find_in_bbox(
+            query["box"], update_type, since, query["limit"]
+        )
+        results = [location.to_dict() for location in locations]
+    else:
+        if query["mode"] == MODE_NEAREST:
+            hits = LocationService.find_nearest(
+                query["lat"], query["lon"], query["k"], update_type, since
+            )
+        else:
+            hits = LocationService.find_within_radius(
+                query["lat"],
+                query["lon"],
+                query["radius"],
+                update_type,
+                since,
+                query["limit"],
+            )
+        results = [
+            _with_distance(location.to_dict(), distance) for location, distance in hits
+        ]
+
+    return jsonify({"success": True, "locations": results}), 200
+
+
+@api_geo.route("/heatmap", methods=["GET"])
+@admin_required
+def heatmap(current_user):
+    hours = request.args.get("hours", 24, type=int)
+    zoom = request.args.get("zoom", 12, type=int)
+    if not 1 <= hours <= MAX_HEATMAP_HOURS:
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "message": f"hours must be between 1 and {MAX_HEATMAP_HOURS}",
+                }
+            ),
+            400,
+        )
+    if not 0 <= zoom <= MAX_HEATMAP_ZOOM:
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "message": f"zoom must be between 0 and {MAX_HEATMAP_ZOOM}",
+                }
+            ),
+            400,
+        )
+    try:
+        box = _parse_box(request.args)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
+    data = LocationService.get_heatmap_data(
+        hours, zoom, box, request.args.get("update_type")
+    )
+    return jsonify({"success": True, "heatmap": data}), 200
+
+
+@api_geo.route("/complaints", methods=["GET"])
+@token_required
+def search_complaints(current_user):
+    try:
+        query = _parse_geo_args(request.args)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
+    status = request.args.get("status")
+    if current_user.is_admin():
+        user_id = request.args.get("user_id", type=int)
+    else:
+        user_id = current_user.id
+
+    if query["mode"] == MODE_BBOX:
+        complaints = ComplaintService.find_in_bbox(
+            query["box"], user_id, status, query["limit"]
+        )
+        return (
+            jsonify(
+                {
+                    "success": True,
+                    "complaints": SerializationService.complaints_to_dict(complaints),
+                }
+            ),
+            200,
+        )
+
+    if query["mode"] == MODE_NEAREST:
+        hits = ComplaintService.find_nearest(
+            query["lat"], query["lon"], query["k"], user_id, status
+        )
+    else:
+        hits = ComplaintService.find_within_radius(
+            query["lat"], query["lon"], query["radius"], user_id, status, query["limit"]
+        )
+
+    complaints = SerializationService.complaints_to_dict([c for c, _ in hits])
+    results = [
+        _with_distance(item, distance) for item, (_, distance) in zip(complaints, hits)
+    ]
+    return jsonify({"success": True, "complaints": results}), 200
@@ -0,0 +1,76 @@
+from typing import Optional
+from flask import session
+from flask_login import current_user
+from flask_socketio import join_room, leave_room, ConnectionRefusedError
+import jwt
+from src.api.decorators import get_user_from_token
+from src.services.auth_cache import auth_cache, CachedUser
+from src.services.realtime_service import (
+    RealtimeService,
+    ADMINS_ROOM,
+    user_room,
+    sos_room,
+)
+
+_SESSION_KEY = "socket_user_id"
+
+
+def register_socket_handlers(socketio):
+    socketio.on_event("connect", handle_connect)
+    socketio.on_event("subscribe", handle_subscribe)
+    socketio.on_event("unsubscribe", handle_unsubscribe)
+
+
+def handle_connect(auth=None):
+    # Browser sockets carry the login session cookie; API clients send
+    # their JWT as {"token": ...} in the connection auth payload
+    user = _authenticate(auth)
+    if not user:
+        raise ConnectionRefusedError("Authentication required")
+
+    session[_SESSION_KEY] = user.id
+    join_room(user_room(user.id))
+    if user.is_admin():
+        join_room(ADMINS_ROOM)
+
+
+def handle_subscribe(data):
+    user = _socket_user()
+    sos_id = (data or {}).get("sos_id")
+
+    if not user:
+        return {"success": False, "message": "Authentication required"}
+    if not sos_id:
+        return {"success": False, "message": "SOS ID is required"}
+    if not RealtimeService.can_watch(user, sos_id):
+        return {"success": False, "message": "Unauthorized"}
+
+    join_room(sos_room(sos_id))
+    return {"success": True, "sos_id": sos_id}
+
+
+def handle_unsubscribe(data):
+    sos_id = (data or {}).get("sos_id")
+    if not sos_id:
+        return {"success": False, "message": "SOS ID is required"}
+
+    leave_room(sos_room(sos_id))
+    return {"success": True, "sos_id": sos_id}
+
+
+def _authenticate(auth) -> Optional[CachedUser]:
+    token = auth.get("token") if isinstance(auth, dict) else None
+    if token:
+        try:
+            return get_user_from_token(token)
+        except (jwt.InvalidTokenError, KeyError):
+            return None
+
+    if current_user.is_authenticated and current_user.is_active:
+        return auth_cache.get(current_user.id)
+    return None
+
+
+def _socket_user() -> Optional[CachedUser]:
+    user_id = session.get(_SESSION_KEY)
+    return auth_cache.get(user_id) if user_id else None
@@ -1,7 +1,12 @@
 from flask import Blueprint, request, jsonify
 from src.api.decorators import token_required
+from src.api.caching import conditional, make_etag
+from src.core.constants import SOSStatus
 from src.services.sos_service import SOSService
-from src.core.extensions import socketio
+from src.services.serialization_service import SerializationService
+from src.services.track_service import TrackOptions
+from src.services.realtime_service import RealtimeService
+from src.utils.pagination import clamp_page_size
 
 api_sos = Blueprint("api_sos", __name__, url_prefix="/api/sos")
 
@@ -22,23 +27,11 @@ def trigger_sos(current_user):
     )
 
     if success and sos:
-        socketio.emit(
-            "sos_triggered",
-            {
-                "sos": sos.to_dict(include_locations=True),
-                "user": current_user.to_dict(),
-            },
-            broadcast=True,
-        )
+        sos_data = sos.to_dict(include_locations=True)
+        RealtimeService.notify_sos_triggered(sos_data, current_user)
 
         return (
-            jsonify(
-                {
-                    "success": True,
-                    "message": message,
-                    "sos": sos.to_dict(include_locations=True),
-                }
-            ),
+            jsonify({"success": True, "message": message, "sos": sos_data}),
             201,
         )
     else:
@@ -62,11 +55,9 @@ def update_location(current_user):
     success, message = SOSService.add_location_update(sos_id, location)
 
     if success:
-        sos = SOSService.get_sos_by_id(sos_id)
-        socketio.emit(
-            "sos_location_update",
+        RealtimeService.notify_location_update(
+            sos_id,
             {"sos_id": sos_id, "location": location, "user_id": current_user.id},
-            broadcast=True,
         )
 
         return jsonify({"success": True, "message": message}), 200
@@ -74,6 +65,52 @@ def update_location(current_user):
         return jsonify({"success": False, "message": message}), 400
 
 
+@api_sos.route("/update_locations", methods=["POST"])
+@token_required
+def update_locations(current_user):
+    data = request.get_json()
+
+    sos_id = data.get("sos_id")
+    locations = data.get("locations")
+
+    if not sos_id or not locations:
+        return (
+            jsonify({"success": False, "message": "SOS ID and locations are required"}),
+            400,
+        )
+
+    success, message, rows = SOSService.add_location_updates(
+        sos_id, locations, current_user.id
+    )
+
+    if success:
+        points = [
+            {
+                "latitude": row["latitude"],
+                "longitude": row["longitude"],
+                "accuracy": row["accuracy"],
+                "timestamp": row["timestamp"].isoformat(),
+            }
+            for row in rows
+        ]
+        RealtimeService.notify_location_update(
+            sos_id,
+            {
+                "sos_id": sos_id,
+                "location": points[-1],
+                "locations": points,
+                "user_id": current_user.id,
+            },
+        )
+
+        return (
+            jsonify({"success": True, "message": message, "count": len(points)}),
+            200,
+        )
+    else:
+        return jsonify({"success": False, "message": message}), 400
+
+
 @api_sos.route("/resolve", methods=["POST"])
 @token_required
 def resolve_sos(current_user):
@@ -97,11 +134,7 @@ def resolve_sos(current_user):
     )
 
     if success:
-        socketio.emit(
-            "sos_resolved",
-            {"sos_id": sos_id, "resolved_by": current_user.id},
-            broadcast=True,
-        )
+        RealtimeService.notify_sos_resolved(sos_id, sos.user_id, current_user.id)
 
         return jsonify({"success": True, "message": message}), 200
     else:
@@ -112,21 +145,25 @@ def resolve_sos(current_user):
 @token_required
 def get_active_sos(current_user):
     if current_user.is_admin():
-        sos_events = SOSService.get_active_sos_events()
+        active = SOSService.get_active_sos_snapshots()
     else:
-        sos_events = [
-            sos
-            for sos in SOSService.get_active_sos_events()
-            if sos.user_id == current_user.id
-        ]
+        entry = SOSService.get_user_active_sos(current_user.id)
+        active = [entry] if entry else []
+
+    try:
+        track = TrackOptions.from_args(request.args)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
+    sos_events = SOSService.get_sos_events_by_ids([entry.id for entry in active])
 
     return (
         jsonify(
             {
                 "success": True,
-                "sos_events": [
-                    sos.to_dict(include_locations=True) for sos in sos_events
-                ],
+                "sos_events": SerializationService.sos_events_to_dict(
+                    sos_events, include_locations=True, track=track
+                ),
             }
         ),
         200,
@@ -138,28 +175,67 @@ def get_active_sos(current_user):
 def get_sos_history(current_user):
     if current_user.is_admin():
         user_id = request.args.get("user_id", type=int)
-        if user_id:
-            sos_events = SOSService.get_user_sos_history(user_id)
-        else:
-            sos_events = SOSService.get_all_sos_events(limit=100)
+        default_limit = 50 if user_id else 100
     else:
-        sos_events = SOSService.get_user_sos_history(current_user.id)
+        user_id = current_user.id
+        default_limit = 50
 
-    return (
-        jsonify({"success": True, "sos_events": [sos.to_dict() for sos in sos_events]}),
-        200,
+    limit = clamp_page_size(request.args.get("limit", type=int), default_limit)
+    page = (user_id, request.args.get("status"), request.args.get("cursor"), limit)
+
+    try:
+        rows, next_cursor = SOSService.get_sos_page_versions(*page)
+    except ValueError:
+        return jsonify({"success": False, "message": "Invalid cursor"}), 400
+
+    def render():
+        sos_events, next_cursor = SOSService.get_sos_page(*page)
+        return jsonify(
+            {
+                "success": True,
+                "sos_events": SerializationService.sos_events_to_dict(sos_events),
+                "next_cursor": next_cursor,
+            }
+        )
+
+    # Active events report a duration_seconds that grows every second
+    # without a version bump, so a page holding one is never fresh
+    if any(row.status == SOSStatus.ACTIVE.value for row in rows):
+        return render()
+
+    etag = make_etag(
+        "sos_history", [(row.id, row.version) for row in rows], next_cursor
     )
+    return conditional(etag, None, render)
 
 
 @api_sos.route("/<sos_id>", methods=["GET"])
 @token_required
 def get_sos_details(current_user, sos_id):
-    sos = SOSService.get_sos_by_id(sos_id)
+    state = SOSService.get_sos_version(sos_id)
 
-    if not sos:
+    if not state:
         return jsonify({"success": False, "message": "SOS not found"}), 404
 
-    if sos.user_id != current_user.id and not current_user.is_admin():
+    if state.user_id != current_user.id and not current_user.is_admin():
         return jsonify({"success": False, "message": "Unauthorized"}), 403
 
-    return jsonify({"success": True, "sos": sos.to_dict(include_locations=True)}), 200
+    try:
+        track = TrackOptions.from_args(request.args)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
+    def render():
+        sos = SOSService.get_sos_by_id(sos_id)
+        sos_data = SerializationService.sos_events_to_dict(
+            [sos], include_locations=True, track=track
+        )[0]
+        return jsonify({"success": True, "sos": sos_data})
+
+    # duration_seconds grows every second while the SOS is active, without
+    # a version bump, so only an ended SOS can be revalidated
+    if state.status == SOSStatus.ACTIVE.value:
+        return render()
+
+    etag = make_etag("sos", state.id, state.version, request.query_string)
+    return conditional(etag, state.updated_at, render)
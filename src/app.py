@@ -1,9 +1,9 @@
-from flask import Flask, render_template, redirect, url_for
+from flask import Flask, flash, jsonify, render_template, redirect, request, url_for
 from flask_login import current_user
 from config import get_config
 from src.core.extensions import init_extensions
+from src.core.security import PasswordHasherBusy
 import os
-import uuid
 
 
 def create_app(config_name="default"):
@@ -15,22 +15,56 @@ def create_app(config_name="default"):
 
     init_extensions(app)
 
-    with app.app_context():
-        from src.core.extensions import db
-        from src.models import User, Location, SOS, Complaint
+    from src.api.encoding import APIJSONProvider
+
+    app.json = APIJSONProvider(app)
+
+    from src.core.security import password_hasher
+    from src.core.instrumentation import instrumentation
+    from src.core.query_audit import query_audit
+    from src.services.location_writer import location_writer
+    from src.services.sos_registry import active_sos_registry
+    from src.services.auth_cache import auth_cache
+
+    password_hasher.init_app(app)
+    instrumentation.init_app(app)
+    query_audit.init_app(app)
+    location_writer.init_app(app)
+    active_sos_registry.init_app(app)
+    auth_cache.init_app(app)
+
+    if app.config["BOOTSTRAP_ON_STARTUP"]:
+        from src.services.bootstrap_service import BootstrapService
 
-        db.create_all()
+        with app.app_context():
+            BootstrapService.create_schema()
+            BootstrapService.install_indexes()
+            BootstrapService.backfill_geohashes()
+            BootstrapService.backfill_rollups()
+            created, message = BootstrapService.create_default_admin()
+            if created:
+                print(message)
 
-        # AUTO-CREATE ADMIN USER
-        _create_default_admin()
+    from src.commands import register_commands
+
+    register_commands(app)
+
+    from src.core.extensions import socketio
+    from src.api.sockets import register_socket_handlers
+
+    register_socket_handlers(socketio)
 
     from src.api.auth import api_auth
     from src.api.sos import api_sos
     from src.api.complaints import api_complaints
+    from src.api.geo import api_geo
+    from src.api.export import api_export
 
     app.register_blueprint(api_auth)
     app.register_blueprint(api_sos)
     app.register_blueprint(api_complaints)
+    app.register_blueprint(api_geo)
+    app.register_blueprint(api_export)
 
     from src.web.blueprints.auth import auth_bp
     from src.web.blueprints.user import user_bp
@@ -52,6 +86,20 @@ def create_app(config_name="default"):
     def not_found(e):
         return render_template("errors/404.html"), 404
 
+    @app.errorhandler(PasswordHasherBusy)
+    def password_hasher_busy(e):
+        if request.path.startswith("/api/"):
+            response = jsonify(
+                {"success": False, "message": "Server busy, please retry shortly"}
+            )
+            response.status_code = 503
+            response.headers["Retry-After"] = str(
+                app.config["PASSWORD_HASH_RETRY_AFTER"]
+            )
+            return response
+        flash("Too many sign-ins right now, please try again in a moment.", "warning")
+        return redirect(request.url)
+
     @app.errorhandler(500)
     def server_error(e):
         return render_template("errors/500.html"), 500
@@ -59,49 +107,35 @@ def create_app(config_name="default"):
     return app
 
 
-def _create_default_admin():
+def warm_up(app) -> None:
     """
-    Create default admin user if none exists.
-    Credentials can be set via environment variables.
+    Load state every worker would otherwise build on its own first requests,
+    for a server that preloads the app and forks workers from it: the active
+    SOS registry, compiled templates and the lazily imported services. Leaves
+    no database connection open to be inherited.
     """
-    from src.models import User
     from src.core.extensions import db
+    from src.services.sos_registry import active_sos_registry
+    import src.services.heatmap_service  # noqa: F401  pulls in numpy
 
-    # Check if any admin exists
-    admin = User.query.filter_by(role="admin").first()
-
-    if admin:
-        print("Admin user already exists")
-        return
-
-    # Get credentials from environment variables (for Railway/production)
-    admin_name = os.getenv("ADMIN_NAME", "Admin")
-    admin_email = os.getenv("ADMIN_EMAIL", "admin@pyraksha.com")
-    admin_password = os.getenv("ADMIN_PASSWORD", "Admin@2024")
-    admin_phone = os.getenv("ADMIN_PHONE", "+919876543210")
-
-    # Create admin user
-    admin_user = User(
-        user_id=str(uuid.uuid4()),  # <-- add this
-        name=admin_name,
-        email=admin_email,
-        phone=admin_phone,
-        role="admin",
-    )
-
-    # Set password (assuming your User model has set_password method)
-    admin_user.set_password(admin_password)
-
-    try:
-        db.session.add(admin_user)
-        db.session.commit()
-
-        print("Default admin user created successfully!")
-        print(f"   Email: {admin_email}")
-        print(f"   Password: {admin_password}")
-        print(f"   Phone: {admin_phone}")
-        print("\nIMPORTANT: Change the password after first login!")
-
-    except Exception as e:
-        db.session.rollback()
-        print(f"Failed to create admin user: {e}")
+    with app.app_context():
+        active_sos_registry.rebuild()
+        for name in app.jinja_env.list_templates():
+            app.jinja_env.get_template(name)
+        db.session.remove()
+        db.engine.dispose()
+
+
+def after_fork(app) -> None:
+    """
+    Run in each forked worker. Pooled connections belong to the parent;
+    drop them without closing the parent's sockets. Metrics the parent
+    recorded while warming up are not this worker's.
+    """
+    from src.core.extensions import db
+    from src.core.instrumentation import instrumentation
+
+    instrumentation.reset()
+
+    with app.app_context():
+        db.engine.dispose(close=False)
@@ -0,0 +1,134 @@
+import click
+from flask import current_app
+from flask.cli import AppGroup, with_appcontext
+from src.services.rollup_service import RollupService
+from src.services.retention_service import LocationRetentionService
+from src.services.geo_service import GeoService
+from src.services.export_service import (
+    ExportService,
+    ExportOptions,
+    EXPORT_DATASETS,
+    EXPORT_FORMATS,
+)
+from src.services.location_service import parse_timestamp
+from src.services.bootstrap_service import BootstrapService
+from src.models.location import Location
+from src.models.complaint import Complaint
+
+rollups_cli = AppGroup("rollups", help="Maintain the analytics rollup tables.")
+locations_cli = AppGroup("locations", help="Maintain the location history.")
+geo_cli = AppGroup("geo", help="Maintain the geospatial index columns.")
+export_cli = AppGroup("export", help="Export raw data for analysis.")
+queries_cli = AppGroup("queries", help="Check the SQL each route runs.")
+
+
+@click.command("bootstrap")
+@with_appcontext
+def bootstrap():
+    """Create or upgrade the schema, install indexes and seed the admin."""
+    for line in BootstrapService.run():
+        click.echo(line)
+
+
+@rollups_cli.command("backfill")
+@click.option("--batch-size", default=10000, show_default=True)
+def backfill_rollups(batch_size):
+    """Rebuild the rollups from the raw SOS and complaint tables."""
+    totals = RollupService.backfill(batch_size)
+    for kind, events in totals.items():
+        click.echo(f"{kind}: {events} events rolled up")
+
+
+@locations_cli.command("prune")
+@click.option("--batch-size", type=int, help="Rows per batch.")
+@click.option("--max-batches", type=int, help="Stop after this many batches.")
+@click.option("--pause-ms", default=0, show_default=True, help="Sleep between batches.")
+@click.option(
+    "--type", "update_types", multiple=True, help="Only apply these update types."
+)
+def prune_locations(batch_size, max_batches, pause_ms, update_types):
+    """Apply the location retention policies in resumable batches."""
+    totals = LocationRetentionService.run(
+        batch_size or current_app.config["LOCATION_RETENTION_BATCH_SIZE"],
+        max_batches,
+        pause_ms / 1000.0,
+        update_types,
+    )
+    for update_type, rules in totals.items():
+        summary = ", ".join(f"{rule} {count}" for rule, count in rules.items())
+        click.echo(f"{update_type}: {summary or 'no rules'}")
+
+
+@geo_cli.command("backfill")
+@click.option("--batch-size", default=10000, show_default=True)
+def backfill_geohashes(batch_size):
+    """Compute geohashes for rows stored before the column existed."""
+    for model in (Location, Complaint):
+        count = GeoService.backfill(model, batch_size)
+        click.echo(f"{model.__tablename__}: {count} rows indexed")
+
+
+@export_cli.command("dump")
+@click.argument("dataset", type=click.Choice(list(EXPORT_DATASETS)))
+@click.option(
+    "--format",
+    "export_format",
+    type=click.Choice(list(EXPORT_FORMATS)),
+    default="csv",
+    show_default=True,
+)
+@click.option("--since", help="ISO 8601 start of the time range.")
+@click.option("--until", help="ISO 8601 end of the time range.")
+@click.option("--user-id", type=int, help="Only rows owned by this user.")
+@click.option(
+    "--status", help="Only rows with this status (update type for locations)."
+)
+@click.option("--output", "-o", type=click.File("wb"), default="-")
+def dump_export(dataset, export_format, since, until, user_id, status, output):
+    """Stream a dataset to a file or stdout."""
+    valid, message = ExportService.validate(dataset, export_format)
+    if not valid:
+        raise click.UsageError(message)
+
+    options = ExportOptions(
+        parse_timestamp(since) if since else None,
+        parse_timestamp(until) if until else None,
+        user_id,
+        status,
+    )
+    for chunk in ExportService.stream(dataset, export_format, options):
+        output.write(chunk)
+
+
+@queries_cli.command("audit")
+def audit_queries():
+    """Run every route once and check it against its query budget."""
+    if not (current_app.testing or current_app.debug):
+        raise click.UsageError(
+            "The audit writes fixtures; run it with FLASK_ENV=testing or development."
+        )
+
+    from src.devtools.route_audit import RouteAudit
+
+    worst, missing, failures = RouteAudit.run()
+    failed = bool(failures)
+    for failure in failures:
+        click.echo(f"{failure}  [failed]")
+    for status, line in RouteAudit.budget_report(worst):
+        failed = failed or status != "ok"
+        click.echo(line if status == "ok" else f"{line}  [{status}]")
+    for endpoint in missing:
+        failed = True
+        click.echo(f"{endpoint}: not exercised")
+
+    if failed:
+        raise SystemExit(1)
+
+
+def register_commands(app):
+    app.cli.add_command(bootstrap)
+    app.cli.add_command(rollups_cli)
+    app.cli.add_command(locations_cli)
+    app.cli.add_command(geo_cli)
+    app.cli.add_command(export_cli)
+    app.cli.add_command(queries_cli)
@@ -25,7 +25,27 @@ class LocationUpdateType(Enum):
     PERIODIC = "periodic"
 
 
+class ActivityType(Enum):
+    SOS = "sos"
+    COMPLAINT = "complaint"
+
+
+class RollupGranularity(Enum):
+    HOUR = "hour"
+    DAY = "day"
+
+
 SOS_LOCATION_UPDATE_INTERVAL = 10
 SESSION_TIMEOUT_DAYS = 30
 MAX_LOCATION_HISTORY = 1000
+MAX_LOCATION_BATCH_SIZE = 500
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+DEFAULT_TRACK_TOLERANCE_METERS = 5.0
+MAX_TRACK_POINTS = 500
+NEAREST_INITIAL_RADIUS_METERS = 500
+MAX_SEARCH_RADIUS_METERS = 100000
+MAX_HEATMAP_HOURS = 24 * 30
+MAX_HEATMAP_ZOOM = 18
+MAX_UNBOXED_HEATMAP_ZOOM = 8
 ADMIN_EMAIL_DOMAIN = "admin.pyraksha.org"
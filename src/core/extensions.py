@@ -3,6 +3,7 @@ from flask_migrate import Migrate
 from flask_login import LoginManager
 from flask_socketio import SocketIO
 from flask_cors import CORS
+from src.core.message_bus import message_queue_options
 
 db = SQLAlchemy()
 migrate = Migrate()
@@ -13,12 +14,15 @@ cors = CORS()
 
 def init_extensions(app):
     db.init_app(app)
-    migrate.init_app(app, db)
+    migrate.init_app(
+        app, db, directory=app.config["MIGRATIONS_DIR"], render_as_batch=True
+    )
     login_manager.init_app(app)
     socketio.init_app(
         app,
         cors_allowed_origins=app.config["SOCKETIO_CORS_ALLOWED_ORIGINS"],
         async_mode=app.config["SOCKETIO_ASYNC_MODE"],
+        **message_queue_options(app),
     )
     cors.init_app(app)
 
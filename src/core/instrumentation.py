@@ -0,0 +1,333 @@
+import bisect
+import hmac
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from flask import Response, g, has_request_context, request
+from socketio import packet
+from sqlalchemy import event
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _labels(
+    names: Sequence[str], values: Sequence[str], extra: str = "", const: str = ""
+) -> str:
+    pairs = [const] if const else []
+    pairs += [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def collect(self, const: str = "") -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            suffix = _labels(self.labelnames, labels, const=const)
+            lines.append(f"{self.name}{suffix} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram; observe() is one bisect and a lock."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._values: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def collect(self, const: str = "") -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            values = sorted(
+                (labels, (list(state[0]), state[1], state[2]))
+                for labels, state in self._values.items()
+            )
+        for labels, (counts, total, count) in values:
+            cumulative = 0
+            for bound, bucket in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket
+                le = _labels(self.labelnames, labels, f'le="{_number(bound)}"', const)
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            suffix = _labels(self.labelnames, labels, const=const)
+            lines.append(f"{self.name}_sum{suffix} {_number(total)}")
+            lines.append(f"{self.name}_count{suffix} {count}")
+        return lines
+
+
+class Gauge:
+    """Read from `callback` at scrape time, so it costs nothing in between."""
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], float]):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+
+    def collect(self, const: str = "") -> List[str]:
+        try:
+            value = self.callback()
+        except Exception:
+            return []
+        if value is None:
+            return []
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} gauge",
+            f"{self.name}{_labels((), (), const=const)} {_number(value)}",
+        ]
+
+
+class _MeasuredPacket(packet.Packet):
+    """
+    Socket.IO packet that reports the size of each event it encodes. The
+    manager encodes an emit once for all of its recipients, so this costs
+    a len() instead of a second encode.
+    """
+
+    def encode(self):
+        encoded = super().encode()
+        if self.packet_type in (packet.EVENT, packet.BINARY_EVENT) and self.data:
+            parts = encoded if isinstance(encoded, list) else [encoded]
+            instrumentation.observe_emit(self.data[0], sum(len(part) for part in parts))
+        return encoded
+
+
+class Instrumentation:
+    """
+    In-process metrics in the Prometheus text format: request latency per
+    blueprint and endpoint, SQL query counts and time per request (from
+    engine events), Socket.IO emits and payload sizes, and queue depths.
+    Each worker process keeps its own series, served at METRICS_PATH with a
+    worker="<pid>" label, so series scraped from different workers behind
+    one address stay apart and can be summed.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.token: Optional[str] = None
+        self.requests = Counter(
+            "http_requests_total",
+            "HTTP requests by endpoint and status.",
+            ("blueprint", "endpoint", "method", "status"),
+        )
+        self.request_latency = Histogram(
+            "http_request_duration_seconds",
+            "HTTP request latency.",
+            ("blueprint", "endpoint", "method"),
+        )
+        self.request_queries = Histogram(
+            "http_request_db_queries",
+            "SQL statements executed per request.",
+            ("endpoint",),
+            COUNT_BUCKETS,
+        )
+        self.request_db_time = Histogram(
+            "http_request_db_seconds",
+            "Time spent in SQL statements per request.",
+            ("endpoint",),
+        )
+        self.queries = Histogram(
+            "db_query_duration_seconds",
+            "SQL statement latency, inside and outside requests.",
+            ("context",),
+            QUERY_BUCKETS,
+        )
+        self.emits = Histogram(
+            "socketio_emit_payload_bytes",
+            "Socket.IO events sent by this worker, with their encoded size.",
+            ("event",),
+            SIZE_BUCKETS,
+        )
+        self.location_write_failures = Counter(
+            "location_write_failures_total",
+            "Location rows the write-behind thread failed to commit.",
+            ("durability",),
+        )
+        self.gauges: List[Gauge] = []
+        self._engines = set()
+
+    def init_app(self, app) -> None:
+        self.enabled = app.config["METRICS_ENABLED"]
+        self.token = app.config["METRICS_TOKEN"]
+        app.extensions["instrumentation"] = self
+        if not self.enabled:
+            return
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.add_url_rule(app.config["METRICS_PATH"], "metrics", self._metrics_view)
+
+        from src.core.extensions import db
+
+        with app.app_context():
+            engine = db.engine
+        if engine not in self._engines:
+            event.listen(engine, "before_cursor_execute", self._before_cursor)
+            event.listen(engine, "after_cursor_execute", self._after_cursor)
+            self._engines.add(engine)
+
+        from src.core.security import password_hasher
+        from src.services.location_writer import location_writer
+        from src.core.extensions import socketio
+
+        socketio.server.packet_class = _MeasuredPacket
+
+        self.gauges = [
+            Gauge(
+                "location_writer_queue_depth",
+                "Location batches waiting for the write-behind thread.",
+                location_writer.queue_depth,
+            ),
+            Gauge(
+                "password_hash_queue_depth",
+                "Password hashes waiting for a bcrypt worker.",
+                password_hasher.queue_depth,
+            ),
+            Gauge(
+                "socketio_bus_backlog",
+                "Relayed Socket.IO messages this worker has not read yet.",
+                lambda: getattr(socketio.server.manager, "backlog", lambda: None)(),
+            ),
+        ]
+
+    def observe_emit(self, event_name: str, size: int) -> None:
+        if self.enabled:
+            self.emits.observe(size, event_name)
+
+    def reset(self) -> None:
+        """Drop every series; a forked worker starts without its parent's."""
+        for metric in (
+            self.requests,
+            self.request_latency,
+            self.request_queries,
+            self.request_db_time,
+            self.queries,
+            self.emits,
+            self.location_write_failures,
+        ):
+            metric.clear()
+
+    def render(self) -> str:
+        worker = f'worker="{os.getpid()}"'
+        lines = []
+        for metric in (
+            self.requests,
+            self.request_latency,
+            self.request_queries,
+            self.request_db_time,
+            self.queries,
+            self.emits,
+            self.location_write_failures,
+            *self.gauges,
+        ):
+            lines.extend(metric.collect(worker))
+        return "\n".join(lines) + "\n"
+
+    def _metrics_view(self):
+        if self.token:
+            supplied = request.headers.get("Authorization", "")
+            if not hmac.compare_digest(supplied, f"Bearer {self.token}"):
+                return Response("Unauthorized\n", status=401, mimetype="text/plain")
+        return Response(self.render(), content_type=CONTENT_TYPE)
+
+    @staticmethod
+    def _before_request() -> None:
+        g._metrics_started = time.perf_counter()
+        g._metrics_queries = 0
+        g._metrics_db_time = 0.0
+
+    def _after_request(self, response):
+        started = g.pop("_metrics_started", None)
+        if started is None:
+            return response
+
+        elapsed = time.perf_counter() - started
+        endpoint = request.endpoint or "unmatched"
+        blueprint = request.blueprint or ""
+        self.request_latency.observe(elapsed, blueprint, endpoint, request.method)
+        self.requests.inc(
+            blueprint, endpoint, request.method, str(response.status_code)
+        )
+        self.request_queries.observe(g.pop("_metrics_queries", 0), endpoint)
+        self.request_db_time.observe(g.pop("_metrics_db_time", 0.0), endpoint)
+        return response
+
+    @staticmethod
+    def _before_cursor(conn, cursor, statement, parameters, context, executemany):
+        conn.info["_metrics_started"] = time.perf_counter()
+
+    def _after_cursor(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["_metrics_started"]
+        if has_request_context() and "_metrics_queries" in g:
+            g._metrics_queries += 1
+            g._metrics_db_time += elapsed
+            self.queries.observe(elapsed, "request")
+        else:
+            self.queries.observe(elapsed, "background")
+
+
+instrumentation = Instrumentation()
@@ -0,0 +1,165 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Optional
+from socketio import PubSubManager
+
+SQLITE_SCHEME = "sqlite:///"
+
+
+class SQLiteManager(PubSubManager):
+    """
+    Socket.IO client manager that relays emits between processes through a
+    SQLite table, for deployments that run several workers on one host and
+    have no Redis or AMQP broker.
+
+    Publishers append pickled messages in WAL mode, so writers never block
+    the readers. Each worker's listener thread polls for rows above the last
+    id it has seen and prunes rows older than `retention` seconds.
+    """
+
+    name = "sqlite"
+
+    def __init__(
+        self,
+        url: str,
+        channel: str = "socketio",
+        write_only: bool = False,
+        logger=None,
+        poll_interval: float = 0.01,
+        retention: float = 60.0,
+        batch_size: int = 1000,
+    ):
+        if not url.startswith(SQLITE_SCHEME):
+            raise ValueError(f"Unsupported message queue URL: {url}")
+
+        self.path = url[len(SQLITE_SCHEME) :]
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.batch_size = batch_size
+        self._local = threading.local()
+        self._last_seen_id: Optional[int] = None
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._create_schema()
+
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _get_connection(self) -> sqlite3.Connection:
+        # Connections are per thread, and never reused across fork()
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = self._connect()
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _create_schema(self) -> None:
+        conn = self._connect()
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS socketio_messages ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "channel TEXT NOT NULL, "
+                "created_at REAL NOT NULL, "
+                "payload BLOB NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_socketio_messages_channel_id "
+                "ON socketio_messages (channel, id)"
+            )
+        finally:
+            conn.close()
+
+    def _publish(self, data) -> None:
+        self._get_connection().execute(
+            "INSERT INTO socketio_messages (channel, created_at, payload) "
+            "VALUES (?, ?, ?)",
+            (self.channel, time.time(), pickle.dumps(data)),
+        )
+
+    def _last_id(self, conn: sqlite3.Connection) -> int:
+        row = conn.execute(
+            "SELECT MAX(id) FROM socketio_messages WHERE channel = ?",
+            (self.channel,),
+        ).fetchone()
+        return row[0] or 0
+
+    def backlog(self) -> Optional[int]:
+        """Messages on the channel this worker's listener has not read yet."""
+        if self._last_seen_id is None:
+            return None
+        return max(self._last_id(self._get_connection()) - self._last_seen_id, 0)
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            "DELETE FROM socketio_messages WHERE created_at < ?",
+            (time.time() - self.retention,),
+        )
+
+    def _listen(self):
+        conn = self._connect()
+        # Only messages published after this worker started are delivered
+        last_id = self._last_seen_id = self._last_id(conn)
+        next_prune = time.monotonic() + self.retention
+
+        while True:
+            rows = conn.execute(
+                "SELECT id, payload FROM socketio_messages "
+                "WHERE channel = ? AND id > ? ORDER BY id LIMIT ?",
+                (self.channel, last_id, self.batch_size),
+            ).fetchall()
+
+            for message_id, payload in rows:
+                last_id = self._last_seen_id = message_id
+                yield payload
+
+            if time.monotonic() >= next_prune:
+                try:
+                    self._prune(conn)
+                except sqlite3.OperationalError:
+                    pass
+                next_prune = time.monotonic() + self.retention
+
+            if len(rows) < self.batch_size:
+                self._sleep(self.poll_interval)
+
+    def _sleep(self, seconds: float) -> None:
+        # Cooperative under eventlet/gevent when attached to a server
+        if self.server is not None:
+            self.server.sleep(seconds)
+        else:
+            time.sleep(seconds)
+
+
+def message_queue_options(app) -> dict:
+    """
+    Build the SocketIO.init_app() keyword arguments for the configured
+    SOCKETIO_MESSAGE_QUEUE; empty when workers do not share a queue.
+    """
+    url: Optional[str] = app.config.get("SOCKETIO_MESSAGE_QUEUE")
+    channel = app.config["SOCKETIO_CHANNEL"]
+
+    if not url:
+        return {}
+
+    if url.startswith(SQLITE_SCHEME):
+        return {
+            "client_manager": SQLiteManager(
+                url,
+                channel=channel,
+                poll_interval=app.config["SOCKETIO_BUS_POLL_INTERVAL_MS"] / 1000,
+                retention=app.config["SOCKETIO_BUS_RETENTION"],
+            )
+        }
+
+    return {"message_queue": url, "channel": channel}
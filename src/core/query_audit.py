@@ -0,0 +1,208 @@
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+# Most SQL statements one request to each endpoint may run. Kept in step
+# with `flask queries audit`, which exercises every route and fails when a
+# route goes over its budget or has no budget at all.
+QUERY_BUDGETS: Dict[str, int] = {
+    "index": 0,
+    "metrics": 0,
+    "static": 0,
+    # Web auth
+    "auth.register": 2,
+    "auth.login": 3,
+    "auth.logout": 1,
+    # User pages
+    "user.dashboard": 2,
+    "user.complaints": 1,
+    "user.new_complaint": 2,
+    "user.map_view": 1,
+    "user.profile": 0,
+    "user.sos_history": 2,
+    # Admin pages
+    "admin.dashboard": 5,
+    "admin.sos_list": 1,
+    "admin.sos_detail": 3,
+    "admin.resolve_sos": 5,
+    "admin.complaints_list": 1,
+    "admin.complaint_detail": 1,
+    "admin.update_complaint_status": 3,
+    "admin.users_list": 1,
+    "admin.user_detail": 6,
+    "admin.map_view": 2,
+    "admin.map_locations": 1,
+    "admin.map_changes": 2,
+    "admin.analytics": 4,
+    # API
+    "api_auth.register": 3,
+    "api_auth.login": 3,
+    "api_auth.verify_token": 1,
+    "api_sos.trigger_sos": 9,
+    "api_sos.update_location": 3,
+    "api_sos.update_locations": 3,
+    "api_sos.resolve_sos": 6,
+    "api_sos.get_active_sos": 3,
+    "api_sos.get_sos_details": 4,
+    "api_sos.get_sos_history": 3,
+    "api_complaints.file_complaint": 4,
+    "api_complaints.list_complaints": 2,
+    "api_complaints.get_complaint": 2,
+    "api_complaints.search_complaints": 1,
+    "api_complaints.update_complaint_status": 3,
+    # A nearest search widens its radius up to five times before giving up
+    "api_geo.search_locations": 5,
+    "api_geo.search_complaints": 2,
+    "api_geo.heatmap": 1,
+    "api_export.export": 1,
+}
+
+_IN_LIST = re.compile(
+    r"\((?:\s*(?:\?|%s|%\(\w+\)s|:\w+)\s*,)+\s*(?:\?|%s|%\(\w+\)s|:\w+)\s*\)"
+)
+_NUMBERED_PARAM = re.compile(r"(%\(|:)([a-zA-Z_]+?)(?:_\d+)+(\)s)?")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalize a statement so executions that differ only in bound values,
+    or in the length of an expanded IN list, compare equal.
+    """
+    shape = _NUMBERED_PARAM.sub(r"\1\2\3", statement)
+    shape = _IN_LIST.sub("(?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class RequestQueries:
+    """The statements one request ran, and what the audit made of them."""
+
+    def __init__(self, endpoint: str, method: str, statements: List[str]):
+        self.endpoint = endpoint
+        self.method = method
+        self.statements = statements
+        self.budget = QUERY_BUDGETS.get(endpoint)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def repeated(self) -> Dict[str, int]:
+        """Statement shapes run often enough in one request to look like N+1."""
+        threshold = current_app.config["QUERY_AUDIT_REPEAT_THRESHOLD"]
+        shapes = Counter(statement_shape(statement) for statement in self.statements)
+        return {shape: n for shape, n in shapes.items() if n >= threshold}
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+    def problems(self) -> List[str]:
+        problems = []
+        if self.over_budget:
+            problems.append(
+                f"{self.endpoint} ran {self.count} queries, budget {self.budget}"
+            )
+        for shape, n in self.repeated.items():
+            problems.append(f"{self.endpoint} repeated {n}x: {shape[:200]}")
+        return problems
+
+
+class QueryAudit:
+    """
+    Development and test aid, enabled with QUERY_AUDIT. Records the SQL each
+    request runs, reports statement shapes repeated QUERY_AUDIT_REPEAT_THRESHOLD
+    or more times (the signature of an N+1 lazy load) and requests over
+    their QUERY_BUDGETS entry. Problems are logged and summarized in
+    X-Query-Count / X-Query-Budget headers; with QUERY_AUDIT_STRICT they
+    raise QueryBudgetExceeded instead.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.strict = False
+        self._engines = set()
+        self._captures = threading.local()
+
+    def init_app(self, app) -> None:
+        self.enabled = app.config["QUERY_AUDIT"]
+        self.strict = app.config["QUERY_AUDIT_STRICT"]
+        app.extensions["query_audit"] = self
+        if self.enabled:
+            self.install(app)
+
+    def install(self, app) -> None:
+        from src.core.extensions import db
+
+        if not app.extensions.get("query_audit_installed"):
+            app.before_request(self._before_request)
+            app.after_request(self._after_request)
+            app.extensions["query_audit_installed"] = True
+
+        with app.app_context():
+            engine = db.engine
+        if engine not in self._engines:
+            event.listen(engine, "before_cursor_execute", self._record)
+            self._engines.add(engine)
+
+    @contextmanager
+    def capture(self):
+        """
+        Collect a RequestQueries for every request made in this thread while
+        the block runs, e.g. to assert a route's budget from a test:
+
+            with query_audit.capture() as requests:
+                client.get("/admin/dashboard")
+            assert requests[0].count <= QUERY_BUDGETS["admin.dashboard"]
+        """
+        captured: List[RequestQueries] = []
+        previous = getattr(self._captures, "current", None)
+        self._captures.current = captured
+        try:
+            yield captured
+        finally:
+            self._captures.current = previous
+
+    @staticmethod
+    def _before_request() -> None:
+        g._audit_statements = []
+
+    def _after_request(self, response):
+        statements = g.pop("_audit_statements", None)
+        if statements is None:
+            return response
+
+        queries = RequestQueries(
+            request.endpoint or "unmatched", request.method, statements
+        )
+        captured: Optional[list] = getattr(self._captures, "current", None)
+        if captured is not None:
+            captured.append(queries)
+
+        response.headers["X-Query-Count"] = str(queries.count)
+        if queries.budget is not None:
+            response.headers["X-Query-Budget"] = str(queries.budget)
+
+        problems = queries.problems()
+        for problem in problems:
+            current_app.logger.warning("Query audit: %s", problem)
+        if problems and self.strict:
+            raise QueryBudgetExceeded("; ".join(problems))
+        return response
+
+    @staticmethod
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if has_request_context() and "_audit_statements" in g:
+            g._audit_statements.append(statement)
+
+
+query_audit = QueryAudit()
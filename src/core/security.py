@@ -0,0 +1,106 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Optional
+import bcrypt
+from werkzeug.security import check_password_hash
+
+BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+
+class PasswordHasherBusy(RuntimeError):
+    """The hash pool is saturated; the request should be retried later."""
+
+
+class PasswordHasher:
+    """
+    bcrypt password hashing on a bounded thread pool.
+
+    bcrypt releases the GIL while it works, so running it on a fixed pool of
+    PASSWORD_HASH_WORKERS threads caps how many cores a login burst can take
+    without the request threads spinning on CPU themselves. Hashes created
+    by werkzeug before the switch to bcrypt still verify, and
+    needs_rehash() reports them so they are upgraded on the next login.
+    With PASSWORD_HASH_MAX_QUEUE hashes already waiting, or after waiting
+    PASSWORD_HASH_TIMEOUT seconds, PasswordHasherBusy is raised instead of
+    holding the request thread any longer.
+    """
+
+    def __init__(self):
+        self.rounds = 12
+        self.workers = 2
+        self.timeout = 30.0
+        self.max_queue = 32
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app) -> None:
+        self.rounds = app.config["BCRYPT_LOG_ROUNDS"]
+        self.workers = app.config["PASSWORD_HASH_WORKERS"]
+        self.timeout = app.config["PASSWORD_HASH_TIMEOUT"]
+        self.max_queue = app.config["PASSWORD_HASH_MAX_QUEUE"]
+        app.extensions["password_hasher"] = self
+
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def hash(self, password: str) -> str:
+        return self._run(self._hash, password)
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        if password is None or not password_hash:
+            return False
+        if password_hash.startswith(BCRYPT_PREFIXES):
+            return self._run(self._verify, password, password_hash)
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        if not password_hash.startswith(BCRYPT_PREFIXES):
+            return True
+        try:
+            return int(password_hash.split("$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def _hash(self, password: str) -> str:
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+    @staticmethod
+    def _verify(password: str, password_hash: str) -> bool:
+        return bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("utf-8"))
+
+    def queue_depth(self) -> int:
+        executor = self._executor
+        if executor is None or self._pid != os.getpid():
+            return 0
+        return executor._work_queue.qsize()
+
+    def _run(self, fn, *args):
+        executor = self._get_executor()
+        if self.max_queue and executor._work_queue.qsize() >= self.max_queue:
+            raise PasswordHasherBusy("Password hash queue is full")
+
+        future = executor.submit(fn, *args)
+        try:
+            return future.result(self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise PasswordHasherBusy("Timed out waiting for a password hash worker")
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Pools do not survive fork(); each worker builds its own
+        if self._executor is None or self._pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix="password-hash"
+                    )
+                    self._pid = os.getpid()
+        return self._executor
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,5 @@
+"""
+Developer tools that drive the app through its test client. Only the CLI
+commands that need them import this package; nothing on the request path
+does.
+"""
@@ -0,0 +1,307 @@
+import uuid
+from typing import Dict, List, Tuple
+from flask import current_app
+from flask.testing import FlaskClient
+from src.core.extensions import db
+from src.core.query_audit import QUERY_BUDGETS, RequestQueries, query_audit
+from src.core.constants import UserRole
+from src.models.user import User
+from src.services.sos_registry import active_sos_registry
+
+AUDIT_PASSWORD = "query-audit-password"
+
+# Rows of each kind created before pages are read; more than
+# QUERY_AUDIT_REPEAT_THRESHOLD, so a per-row query in a list shows up
+AUDIT_ROWS = 6
+
+
+class AuditClient(FlaskClient):
+    """
+    Test client that records every response outside the statuses the audit
+    expects, so a route that failed early is not mistaken for a cheap one.
+    API calls expect a non-error status, page loads 200 and form posts a
+    redirect, unless the call passes `expect`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.failures: List[str] = []
+
+    def open(self, *args, expect=None, **kwargs):
+        response = super().open(*args, **kwargs)
+        request = response.request
+        if expect is None:
+            if request.path.startswith("/api/"):
+                expect = range(200, 400)
+            elif request.method == "GET":
+                expect = (200,)
+            else:
+                expect = (302,)
+        if response.status_code not in expect:
+            self.failures.append(
+                f"{request.method} {request.full_path.rstrip('?')} "
+                f"returned {response.status_code}"
+            )
+        return response
+
+
+class RouteAudit:
+    """
+    Drives every route of the app once through the test client, against the
+    configured database, and reports the SQL each endpoint ran next to its
+    budget. Creates its own users, SOS events and complaints.
+    """
+
+    @staticmethod
+    def run() -> Tuple[Dict[str, RequestQueries], List[str], List[str]]:
+        """
+        Return the worst request seen per endpoint, the endpoints that were
+        never reached, and the requests that got an unexpected status.
+        """
+        app = current_app._get_current_object()
+        query_audit.install(app)
+
+        # Start from a loaded registry and keep its periodic rebuild out of
+        # the counts, as it lands on whichever request finds it stale
+        active_sos_registry.rebuild()
+        ttl, active_sos_registry.ttl = active_sos_registry.ttl, 0
+        try:
+            with query_audit.capture() as captured:
+                failures = RouteAudit._exercise(app)
+        finally:
+            active_sos_registry.ttl = ttl
+
+        worst: Dict[str, RequestQueries] = {}
+        for queries in captured:
+            current = worst.get(queries.endpoint)
+            if current is None or queries.count > current.count:
+                worst[queries.endpoint] = queries
+
+        missing = sorted(
+            rule.endpoint
+            for rule in app.url_map.iter_rules()
+            if rule.endpoint not in worst
+        )
+        return worst, missing, failures
+
+    @staticmethod
+    def _create_admin() -> str:
+        email = f"audit-admin-{uuid.uuid4().hex[:8]}@pyraksha.test"
+        admin = User(
+            user_id=str(uuid.uuid4()),
+            name="Audit Admin",
+            email=email,
+            phone="0",
+            role=UserRole.ADMIN.value,
+        )
+        admin.set_password(AUDIT_PASSWORD)
+        db.session.add(admin)
+        db.session.commit()
+        return email
+
+    @staticmethod
+    def _exercise(app) -> List[str]:
+        suffix = uuid.uuid4().hex[:8]
+        email = f"audit-{suffix}@pyraksha.test"
+        admin_email = RouteAudit._create_admin()
+        api = AuditClient(app, app.response_class, use_cookies=True)
+
+        # Device API
+        token = api.post(
+            "/api/auth/register",
+            json={
+                "name": "Audit User",
+                "email": email,
+                "phone": "0",
+                "password": AUDIT_PASSWORD,
+            },
+        ).get_json()["token"]
+        api.post("/api/auth/login", json={"email": email, "password": AUDIT_PASSWORD})
+        user = {"Authorization": f"Bearer {token}"}
+        api.post("/api/auth/verify", headers=user)
+
+        location = {"latitude": 19.07, "longitude": 72.87, "accuracy": 5}
+        RouteAudit._seed(api, user, suffix, location)
+
+        sos_id = f"audit-{suffix}"
+        api.post(
+            "/api/sos/trigger",
+            json={"sos_id": sos_id, "location": location},
+            headers=user,
+        )
+        api.post(
+            "/api/sos/update_location",
+            json={"sos_id": sos_id, "location": location},
+            headers=user,
+        )
+        api.post(
+            "/api/sos/update_locations",
+            json={"sos_id": sos_id, "locations": [location] * 5},
+            headers=user,
+        )
+        complaint_id = f"audit-{suffix}"
+        api.post(
+            "/api/complaints/file",
+            json={
+                "complaint_id": complaint_id,
+                "title": "Audit complaint",
+                "description": "Street light broken near the park",
+                **location,
+            },
+            headers=user,
+        )
+
+        for url in (
+            "/api/sos/active",
+            f"/api/sos/{sos_id}",
+            "/api/sos/history",
+            "/api/complaints/list",
+            f"/api/complaints/{complaint_id}",
+            "/api/complaints/search?q=street",
+            "/api/geo/complaints?lat=19.07&lon=72.87&radius=1000",
+        ):
+            api.get(url, headers=user)
+
+        # Admin API
+        admin_token = api.post(
+            "/api/auth/login",
+            json={"email": admin_email, "password": AUDIT_PASSWORD},
+        ).get_json()["token"]
+        admin = {"Authorization": f"Bearer {admin_token}"}
+        for url in (
+            "/api/sos/active",
+            "/api/sos/history",
+            "/api/complaints/list",
+            "/api/geo/locations?lat=19.07&lon=72.87&k=10",
+            "/api/geo/heatmap?zoom=12",
+            "/api/export/sos?format=ndjson",
+        ):
+            api.get(url, headers=admin).get_data()
+        api.put(
+            f"/api/complaints/{complaint_id}/status",
+            json={"status": "in_progress"},
+            headers=admin,
+        )
+        api.post("/api/sos/resolve", json={"sos_id": sos_id}, headers=user)
+
+        # User web pages
+        web = AuditClient(app, app.response_class, use_cookies=True)
+        web.get("/auth/register")
+        web.post(
+            "/auth/register",
+            data={
+                "name": "Audit Web",
+                "email": f"audit-web-{suffix}@pyraksha.test",
+                "phone": "0",
+                "password": AUDIT_PASSWORD,
+                "confirm_password": AUDIT_PASSWORD,
+            },
+        )
+        web.get("/auth/login")
+        web.post("/auth/login", data={"email": email, "password": AUDIT_PASSWORD})
+        # Signed in, the landing page sends users on to their dashboard
+        web.get("/", expect=(302,))
+        for url in (
+            "/user/dashboard",
+            "/user/complaints",
+            "/user/complaints/new",
+            "/user/map",
+            "/user/profile",
+            "/user/sos-history",
+        ):
+            web.get(url)
+        web.post(
+            "/user/complaints/new",
+            data={
+                "title": "Audit web complaint",
+                "description": "Pothole on the main road",
+            },
+        )
+        web.get("/auth/logout", expect=(302,))
+
+        # Admin web pages, on a second SOS to resolve from the admin side
+        second_sos_id = f"audit-{suffix}-2"
+        api.post("/api/sos/trigger", json={"sos_id": second_sos_id}, headers=user)
+        web.post("/auth/login", data={"email": admin_email, "password": AUDIT_PASSWORD})
+        user_id = User.query.filter_by(email=email).first().id
+        for url in (
+            "/admin/dashboard",
+            "/admin/sos",
+            f"/admin/sos/{sos_id}",
+            "/admin/complaints",
+            f"/admin/complaints/{complaint_id}",
+            "/admin/users",
+            f"/admin/users/{user_id}",
+            "/admin/map",
+            "/admin/map/locations",
+            "/admin/map/changes?since=0",
+            "/admin/analytics",
+        ):
+            web.get(url)
+        web.post(
+            f"/admin/complaints/{complaint_id}/update-status",
+            data={"status": "resolved", "notes": "Audited"},
+        )
+        web.post(f"/admin/sos/{second_sos_id}/resolve", data={"notes": "Audited"})
+
+        web.get(app.config["METRICS_PATH"])
+        web.get("/static/js/main.js")
+        return api.failures + web.failures
+
+    @staticmethod
+    def _seed(api, user: dict, suffix: str, location: dict) -> None:
+        """
+        Give the audited user a history of resolved SOS events and
+        complaints, and other users active SOS events of their own.
+        """
+        for index in range(AUDIT_ROWS):
+            sos_id = f"audit-{suffix}-history-{index}"
+            api.post(
+                "/api/sos/trigger",
+                json={"sos_id": sos_id, "location": location},
+                headers=user,
+            )
+            api.post("/api/sos/resolve", json={"sos_id": sos_id}, headers=user)
+            api.post(
+                "/api/complaints/file",
+                json={
+                    "complaint_id": f"audit-{suffix}-{index}",
+                    "title": "Audit complaint",
+                    "description": "Garbage not collected on the street",
+                    **location,
+                },
+                headers=user,
+            )
+
+            token = api.post(
+                "/api/auth/register",
+                json={
+                    "name": f"Audit Device {index}",
+                    "email": f"audit-device-{suffix}-{index}@pyraksha.test",
+                    "phone": "0",
+                    "password": AUDIT_PASSWORD,
+                },
+            ).get_json()["token"]
+            api.post(
+                "/api/sos/trigger",
+                json={"sos_id": f"audit-{suffix}-device-{index}", "location": location},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+
+    @staticmethod
+    def budget_report(worst: Dict[str, RequestQueries]) -> List[Tuple[str, str]]:
+        """(status, line) for every endpoint, status being "ok" or a problem."""
+        lines = []
+        for endpoint in sorted(worst):
+            queries = worst[endpoint]
+            budget = QUERY_BUDGETS.get(endpoint)
+            summary = f"{endpoint}: {queries.count} queries (budget {budget})"
+            if budget is None:
+                lines.append(("no budget", summary))
+            elif queries.over_budget:
+                lines.append(("over budget", summary))
+            else:
+                lines.append(("ok", summary))
+            for shape, n in queries.repeated.items():
+                lines.append(("n+1", f"  {n}x {shape[:160]}"))
+        return lines
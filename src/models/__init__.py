@@ -2,5 +2,18 @@ from .user import User
 from .location import Location
 from .sos import SOS
 from .complaint import Complaint
+from .rollup import ActivityRollup
+from .map_marker import MapMarker
+from .job_checkpoint import JobCheckpoint
+from .auth_invalidation import AuthInvalidation
 
-__all__ = ["User", "Location", "SOS", "Complaint"]
+__all__ = [
+    "User",
+    "Location",
+    "SOS",
+    "Complaint",
+    "ActivityRollup",
+    "MapMarker",
+    "JobCheckpoint",
+    "AuthInvalidation",
+]
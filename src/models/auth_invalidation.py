@@ -0,0 +1,23 @@
+from datetime import datetime
+from src.core.extensions import db
+
+
+class AuthInvalidation(db.Model):
+    """
+    A change to a user's role, password or account, written in the same
+    transaction as the change so every worker can drop the user from its
+    auth cache. Rows are only read for a few minutes; AuthCache prunes older
+    ones.
+    """
+
+    __tablename__ = "auth_invalidations"
+
+    id = db.Column(db.Integer, primary_key=True)
+    # No foreign key: deleting a user is one of the changes recorded
+    user_id = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(
+        db.DateTime, default=datetime.utcnow, nullable=False, index=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<AuthInvalidation user {self.user_id}>"
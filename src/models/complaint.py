@@ -1,11 +1,17 @@
 from datetime import datetime
 from typing import Optional
+from sqlalchemy import event
 from src.core.extensions import db
 from src.core.constants import ComplaintStatus
+from src.utils import geohash
 
 
 class Complaint(db.Model):
     __tablename__ = "complaints"
+    __table_args__ = (
+        db.Index("ix_complaints_timestamp_id", "timestamp", "id"),
+        db.Index("ix_complaints_user_id_timestamp_id", "user_id", "timestamp", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     complaint_id = db.Column(db.String(36), unique=True, nullable=False, index=True)
@@ -25,6 +31,16 @@ class Complaint(db.Model):
     resolution_notes = db.Column(db.Text)
     latitude = db.Column(db.Float)
     longitude = db.Column(db.Float)
+    geohash = db.Column(db.String(geohash.PRECISION), index=True)
+    # Bumped on every change to the row or to data served with it, for ETags
+    version = db.Column(db.Integer, default=1, server_default="1", nullable=False)
+    updated_at = db.Column(
+        db.DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        server_default=db.func.now(),
+        nullable=False,
+    )
 
     user = db.relationship("User", foreign_keys=[user_id], back_populates="complaints")
     resolver = db.relationship("User", foreign_keys=[resolved_by])
@@ -73,3 +89,18 @@ class Complaint(db.Model):
 
     def __repr__(self) -> str:
         return f"<Complaint {self.complaint_id}>"
+
+
+@event.listens_for(Complaint, "before_insert")
+@event.listens_for(Complaint, "before_update")
+def _set_geohash(mapper, connection, target: Complaint) -> None:
+    if target.latitude is not None and target.longitude is not None:
+        target.geohash = geohash.encode(target.latitude, target.longitude)
+    else:
+        target.geohash = None
+
+
+@event.listens_for(Complaint, "before_update")
+def _bump_version(mapper, connection, target: Complaint) -> None:
+    # Incremented in SQL, so concurrent bulk bumps are never lost
+    target.version = Complaint.version + 1
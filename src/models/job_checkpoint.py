@@ -0,0 +1,21 @@
+from datetime import datetime
+from src.core.extensions import db
+
+
+class JobCheckpoint(db.Model):
+    """
+    Resume position of a batched maintenance job, saved in the same
+    transaction as the batch it follows so an interrupted run picks up
+    where the last committed batch ended.
+    """
+
+    __tablename__ = "job_checkpoints"
+
+    name = db.Column(db.String(100), primary_key=True)
+    position = db.Column(db.Text)
+    updated_at = db.Column(
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<JobCheckpoint {self.name}>"
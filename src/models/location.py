@@ -1,11 +1,22 @@
 from datetime import datetime
 from typing import Optional
+from sqlalchemy import event
 from src.core.extensions import db
 from src.core.constants import LocationUpdateType
+from src.utils import geohash
 
 
 class Location(db.Model):
     __tablename__ = "locations"
+    __table_args__ = (
+        db.Index(
+            "ix_locations_update_type_user_id_timestamp_id",
+            "update_type",
+            "user_id",
+            "timestamp",
+            "id",
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(
@@ -14,6 +25,7 @@ class Location(db.Model):
     sos_id = db.Column(db.Integer, db.ForeignKey("sos.id"), nullable=True, index=True)
     latitude = db.Column(db.Float, nullable=False)
     longitude = db.Column(db.Float, nullable=False)
+    geohash = db.Column(db.String(geohash.PRECISION), index=True)
     accuracy = db.Column(db.Float)
     timestamp = db.Column(
         db.DateTime, default=datetime.utcnow, nullable=False, index=True
@@ -48,3 +60,10 @@ class Location(db.Model):
 
     def __repr__(self) -> str:
         return f"<Location {self.latitude}, {self.longitude}>"
+
+
+@event.listens_for(Location, "before_insert")
+@event.listens_for(Location, "before_update")
+def _set_geohash(mapper, connection, target: Location) -> None:
+    if target.latitude is not None and target.longitude is not None:
+        target.geohash = geohash.encode(target.latitude, target.longitude)
@@ -0,0 +1,23 @@
+from src.core.extensions import db
+
+
+class MapMarker(db.Model):
+    """
+    Latest known position of an SOS event on the admin live map. Resolved
+    events keep their row with active=False so clients syncing from an
+    older version learn about the removal.
+    """
+
+    __tablename__ = "map_markers"
+
+    sos_id = db.Column(db.Integer, db.ForeignKey("sos.id"), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    latitude = db.Column(db.Float, nullable=False)
+    longitude = db.Column(db.Float, nullable=False)
+    accuracy = db.Column(db.Float)
+    timestamp = db.Column(db.DateTime, nullable=False)
+    active = db.Column(db.Boolean, default=True, nullable=False)
+    version = db.Column(db.BigInteger, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<MapMarker sos={self.sos_id} v{self.version}>"
@@ -0,0 +1,33 @@
+from src.core.extensions import db
+
+
+class ActivityRollup(db.Model):
+    __tablename__ = "activity_rollups"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "kind",
+            "granularity",
+            "bucket_start",
+            "status",
+            name="uq_activity_rollups_bucket",
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)
+    granularity = db.Column(db.String(10), nullable=False)
+    bucket_start = db.Column(db.DateTime, nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    count = db.Column(db.Integer, default=0, nullable=False)
+
+    def to_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "granularity": self.granularity,
+            "bucket_start": self.bucket_start.isoformat(),
+            "status": self.status,
+            "count": self.count,
+        }
+
+    def __repr__(self) -> str:
+        return f"<ActivityRollup {self.kind} {self.granularity} {self.bucket_start}>"
@@ -1,11 +1,17 @@
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict
+from sqlalchemy import event
 from src.core.extensions import db
 from src.core.constants import SOSStatus
+from src.models.location import Location
 
 
 class SOS(db.Model):
     __tablename__ = "sos"
+    __table_args__ = (
+        db.Index("ix_sos_start_time_id", "start_time", "id"),
+        db.Index("ix_sos_user_id_start_time_id", "user_id", "start_time", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     sos_id = db.Column(db.String(36), unique=True, nullable=False, index=True)
@@ -21,6 +27,15 @@ class SOS(db.Model):
     end_time = db.Column(db.DateTime)
     resolved_by = db.Column(db.Integer, db.ForeignKey("users.id"))
     notes = db.Column(db.Text)
+    # Bumped on every change to the row or to data served with it, for ETags
+    version = db.Column(db.Integer, default=1, server_default="1", nullable=False)
+    updated_at = db.Column(
+        db.DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        server_default=db.func.now(),
+        nullable=False,
+    )
 
     user = db.relationship("User", foreign_keys=[user_id], back_populates="sos_events")
     resolver = db.relationship("User", foreign_keys=[resolved_by])
@@ -53,7 +68,12 @@ class SOS(db.Model):
     def get_latest_location(self):
         return self.location_history.order_by(Location.timestamp.desc()).first()
 
-    def to_dict(self, include_locations: bool = False) -> dict:
+    def to_dict(
+        self,
+        include_locations: bool = False,
+        latest_locations: Optional[Dict[int, Location]] = None,
+        location_histories: Optional[Dict[int, List[Location]]] = None,
+    ) -> dict:
         data = {
             "id": self.id,
             "sos_id": self.sos_id,
@@ -67,11 +87,16 @@ class SOS(db.Model):
         }
 
         if include_locations:
-            data["location_history"] = [
-                loc.to_dict() for loc in self.location_history.all()
-            ]
+            if location_histories is not None:
+                history = location_histories.get(self.id, [])
+            else:
+                history = self.location_history.all()
+            data["location_history"] = [loc.to_dict() for loc in history]
         else:
-            latest = self.get_latest_location()
+            if latest_locations is not None:
+                latest = latest_locations.get(self.id)
+            else:
+                latest = self.get_latest_location()
             data["latest_location"] = latest.to_dict() if latest else None
 
         return data
@@ -86,3 +111,9 @@ class SOS(db.Model):
 
     def __repr__(self) -> str:
         return f"<SOS {self.sos_id} - {self.status}>"
+
+
+@event.listens_for(SOS, "before_update")
+def _bump_version(mapper, connection, target: SOS) -> None:
+    # Incremented in SQL, so concurrent bulk bumps are never lost
+    target.version = SOS.version + 1
@@ -1,12 +1,13 @@
 from datetime import datetime
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
 from src.core.extensions import db
 from src.core.constants import UserRole
+from src.core.security import password_hasher
 
 
 class User(UserMixin, db.Model):
     __tablename__ = "users"
+    __table_args__ = (db.Index("ix_users_created_at_id", "created_at", "id"),)
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.String(36), unique=True, nullable=False, index=True)
@@ -61,10 +62,13 @@ class User(UserMixin, db.Model):
     )
 
     def set_password(self, password: str) -> None:
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password: str) -> bool:
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(password, self.password_hash)
+
+    def password_needs_rehash(self) -> bool:
+        return password_hasher.needs_rehash(self.password_hash)
 
     def is_admin(self) -> bool:
         return self.role == UserRole.ADMIN.value
@@ -1,77 +1,65 @@
 from datetime import datetime, timedelta
 from typing import Dict, List
-from sqlalchemy import func
-from src.core.extensions import db
+from sqlalchemy.orm import joinedload
 from src.models.user import User
 from src.models.sos import SOS
 from src.models.complaint import Complaint
 from src.models.location import Location
-from src.core.constants import SOSStatus, ComplaintStatus
+from src.core.constants import (
+    SOSStatus,
+    ActivityType,
+    RollupGranularity,
+)
+from src.services.rollup_service import RollupService
+from src.services.metrics_service import MetricsService
+from src.services.serialization_service import SerializationService
 
 
 class AnalyticsService:
     @staticmethod
     def get_dashboard_metrics() -> Dict:
-        total_users = User.query.count()
-        total_complaints = Complaint.query.count()
-        total_sos = SOS.query.count()
-        active_sos = SOS.query.filter_by(status=SOSStatus.ACTIVE.value).count()
-
-        pending_complaints = Complaint.query.filter_by(
-            status=ComplaintStatus.PENDING.value
-        ).count()
+        counts = MetricsService.get_counts()
 
         return {
-            "total_users": total_users,
-            "total_complaints": total_complaints,
-            "total_sos": total_sos,
-            "active_sos": active_sos,
-            "pending_complaints": pending_complaints,
+            "total_users": counts["total_users"],
+            "total_complaints": counts["total_complaints"],
+            "total_sos": counts["total_sos"],
+            "active_sos": counts["active_sos"],
+            "pending_complaints": counts["pending_complaints"],
         }
 
     @staticmethod
     def get_sos_trends(days: int = 7) -> List[Dict]:
         start_date = datetime.utcnow() - timedelta(days=days)
-
-        sos_by_day = (
-            db.session.query(
-                func.date(SOS.start_time).label("date"),
-                func.count(SOS.id).label("count"),
-            )
-            .filter(SOS.start_time >= start_date)
-            .group_by(func.date(SOS.start_time))
-            .all()
-        )
-
-        return [{"date": str(date), "count": count} for date, count in sos_by_day]
+        trends = RollupService.get_trends(ActivityType.SOS.value, start_date)
+        return [
+            {"date": trend["bucket_start"].date().isoformat(), "count": trend["count"]}
+            for trend in trends
+        ]
 
     @staticmethod
     def get_complaint_trends(days: int = 7) -> List[Dict]:
         start_date = datetime.utcnow() - timedelta(days=days)
+        trends = RollupService.get_trends(ActivityType.COMPLAINT.value, start_date)
+        return [
+            {"date": trend["bucket_start"].date().isoformat(), "count": trend["count"]}
+            for trend in trends
+        ]
 
-        complaints_by_day = (
-            db.session.query(
-                func.date(Complaint.timestamp).label("date"),
-                func.count(Complaint.id).label("count"),
-            )
-            .filter(Complaint.timestamp >= start_date)
-            .group_by(func.date(Complaint.timestamp))
-            .all()
+    @staticmethod
+    def get_hourly_trends(kind: str, hours: int = 48) -> List[Dict]:
+        start_time = datetime.utcnow() - timedelta(hours=hours)
+        trends = RollupService.get_trends(
+            kind, start_time, RollupGranularity.HOUR.value
         )
-
         return [
-            {"date": str(date), "count": count} for date, count in complaints_by_day
+            {"hour": trend["bucket_start"].isoformat(), "count": trend["count"]}
+            for trend in trends
         ]
 
     @staticmethod
     def get_complaint_status_distribution() -> Dict:
-        status_counts = (
-            db.session.query(Complaint.status, func.count(Complaint.id))
-            .group_by(Complaint.status)
-            .all()
-        )
-
-        return {status: count for status, count in status_counts}
+        return RollupService.get_status_totals(ActivityType.COMPLAINT.value)
 
     @staticmethod
     def get_user_activity(user_id: int) -> Dict:
@@ -107,29 +95,39 @@ class AnalyticsService:
 
     @staticmethod
     def get_recent_activities(limit: int = 10) -> List[Dict]:
-        recent_sos = SOS.query.order_by(SOS.start_time.desc()).limit(limit).all()
+        recent_sos = (
+            SOS.query.options(joinedload(SOS.user))
+            .order_by(SOS.start_time.desc())
+            .limit(limit)
+            .all()
+        )
         recent_complaints = (
-            Complaint.query.order_by(Complaint.timestamp.desc()).limit(limit).all()
+            Complaint.query.options(joinedload(Complaint.user))
+            .order_by(Complaint.timestamp.desc())
+            .limit(limit)
+            .all()
         )
 
         activities = []
 
-        for sos in recent_sos:
+        sos_data = SerializationService.sos_events_to_dict(recent_sos)
+        for sos, data in zip(recent_sos, sos_data):
             activities.append(
                 {
                     "type": "sos",
                     "timestamp": sos.start_time,
-                    "data": sos.to_dict(),
+                    "data": data,
                     "user": sos.user.to_dict(),
                 }
             )
 
-        for complaint in recent_complaints:
+        complaint_data = SerializationService.complaints_to_dict(recent_complaints)
+        for complaint, data in zip(recent_complaints, complaint_data):
             activities.append(
                 {
                     "type": "complaint",
                     "timestamp": complaint.timestamp,
-                    "data": complaint.to_dict(),
+                    "data": data,
                     "user": complaint.user.to_dict(),
                 }
             )
@@ -0,0 +1,234 @@
+import atexit
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from src.core.extensions import db
+from src.models.auth_invalidation import AuthInvalidation
+from src.models.user import User
+from src.core.constants import UserRole
+from src.utils.cache import TTLCache
+
+_PENDING_KEY = "auth_cache_invalidations"
+
+# Changes other workers must see before their cached snapshot expires
+_WATCHED_FIELDS = ("role", "is_active", "password_hash")
+
+
+class CachedUser:
+    """
+    Read-only snapshot of the user fields API handlers need once a token has
+    been accepted. Mirrors the parts of User that token-authenticated routes
+    use.
+    """
+
+    __slots__ = (
+        "id",
+        "user_id",
+        "name",
+        "email",
+        "phone",
+        "role",
+        "created_at",
+        "last_login",
+        "is_active",
+    )
+
+    def __init__(self, user: User):
+        self.id: int = user.id
+        self.user_id: str = user.user_id
+        self.name: str = user.name
+        self.email: str = user.email
+        self.phone: str = user.phone
+        self.role: str = user.role
+        self.created_at: Optional[datetime] = user.created_at
+        self.last_login: Optional[datetime] = user.last_login
+        self.is_active: bool = user.is_active
+
+    def is_admin(self) -> bool:
+        return self.role == UserRole.ADMIN.value
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "name": self.name,
+            "email": self.email,
+            "phone": self.phone,
+            "role": self.role,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "last_login": self.last_login.isoformat() if self.last_login else None,
+            "is_active": self.is_active,
+        }
+
+
+class AuthCache:
+    """
+    Bounded LRU of CachedUser snapshots keyed by user id, so accepting a JWT
+    does not cost a database round-trip. Any flushed change to a user drops
+    its entry, again once the change commits.
+
+    Role, password and account changes, and deletes, are also written to
+    auth_invalidations in the same transaction. A thread in each worker
+    reads new rows every AUTH_CACHE_SYNC_INTERVAL seconds and drops those
+    users too, so other workers stop honouring a demoted or deactivated
+    user within about a second. Other profile fields are picked up within
+    AUTH_CACHE_TTL seconds.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.sync_interval = 0.0
+        self._cache = TTLCache()
+        self._listening = False
+        # Invalidation id -> created_at, for rows this worker has applied
+        self._applied: Dict[int, datetime] = {}
+        self._next_prune = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        atexit.register(self.stop)
+
+    def init_app(self, app) -> None:
+        self.app = app
+        self.sync_interval = app.config["AUTH_CACHE_SYNC_INTERVAL"]
+        self._cache.maxsize = app.config["AUTH_CACHE_SIZE"]
+        self._cache.ttl = app.config["AUTH_CACHE_TTL"]
+        app.extensions["auth_cache"] = self
+
+        if not self._listening:
+            event.listen(User, "after_update", self._on_user_changed)
+            event.listen(User, "after_delete", self._on_user_deleted)
+            event.listen(Session, "after_commit", self._on_commit)
+            event.listen(Session, "after_rollback", self._on_rollback)
+            self._listening = True
+
+    def get(self, user_id: int) -> Optional[CachedUser]:
+        if self.sync_interval > 0:
+            self._ensure_syncing()
+
+        cached = self._cache.get(user_id)
+        if cached is not None:
+            return cached
+
+        user = User.query.get(user_id)
+        if not user:
+            return None
+
+        cached = CachedUser(user)
+        self._cache.set(user_id, cached)
+        return cached
+
+    def invalidate(self, user_id: int) -> None:
+        self._cache.pop(user_id)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        thread = self._thread
+        if thread and thread.is_alive() and self._pid == os.getpid():
+            self._stopping.set()
+            thread.join(timeout)
+        self._thread = None
+
+    def _on_user_changed(self, mapper, connection, target: User) -> None:
+        self._drop(target)
+        state = inspect(target)
+        if any(state.attrs[field].history.has_changes() for field in _WATCHED_FIELDS):
+            self._publish(connection, target.id)
+
+    def _on_user_deleted(self, mapper, connection, target: User) -> None:
+        self._drop(target)
+        self._publish(connection, target.id)
+
+    def _drop(self, target: User) -> None:
+        self.invalidate(target.id)
+        # A request may re-cache the old row before this transaction commits
+        Session.object_session(target).info.setdefault(_PENDING_KEY, set()).add(
+            target.id
+        )
+
+    @staticmethod
+    def _publish(connection, user_id: int) -> None:
+        connection.execute(
+            AuthInvalidation.__table__.insert().values(
+                user_id=user_id, created_at=datetime.utcnow()
+            )
+        )
+
+    def _on_commit(self, session: Session) -> None:
+        for user_id in session.info.pop(_PENDING_KEY, ()):
+            self.invalidate(user_id)
+
+    def _on_rollback(self, session: Session) -> None:
+        session.info.pop(_PENDING_KEY, None)
+
+    def _ensure_syncing(self) -> None:
+        # Threads do not survive fork(), so each worker starts its own
+        if self._thread and self._thread.is_alive() and self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._thread and self._thread.is_alive() and self._pid == os.getpid():
+                return
+
+            self._pid = os.getpid()
+            self._stopping = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run, name="auth-cache-sync", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.sync_interval):
+            with self.app.app_context():
+                try:
+                    self.sync()
+                except Exception:
+                    db.session.rollback()
+                    self.app.logger.exception("Auth cache sync failed")
+                finally:
+                    db.session.remove()
+
+    def sync(self) -> None:
+        """
+        Drop the users changed by rows this worker has not applied yet. Rows
+        are read for twice AUTH_CACHE_TTL after they were written, so one
+        whose transaction committed late, or written by a host whose clock
+        runs behind, is still seen; anything cached before it has expired
+        by the time it is pruned.
+        """
+        since = datetime.utcnow() - timedelta(seconds=2 * self._cache.ttl)
+        rows = (
+            db.session.query(
+                AuthInvalidation.id,
+                AuthInvalidation.user_id,
+                AuthInvalidation.created_at,
+            )
+            .filter(AuthInvalidation.created_at >= since)
+            .all()
+        )
+        for row in rows:
+            if row.id not in self._applied:
+                self._applied[row.id] = row.created_at
+                self.invalidate(row.user_id)
+        self._applied = {
+            row_id: created_at
+            for row_id, created_at in self._applied.items()
+            if created_at >= since
+        }
+
+        if time.monotonic() >= self._next_prune:
+            db.session.query(AuthInvalidation).filter(
+                AuthInvalidation.created_at < since
+            ).delete(synchronize_session=False)
+            db.session.commit()
+            self._next_prune = time.monotonic() + self._cache.ttl
+
+
+auth_cache = AuthCache()
@@ -1,9 +1,11 @@
 from datetime import datetime
-from typing import Optional, Tuple
+from typing import Optional, Tuple, List
 from flask_login import login_user, logout_user
 from src.core.extensions import db
 from src.models.user import User
-from src.core.constants import UserRole
+from src.core.constants import UserRole, DEFAULT_PAGE_SIZE
+from src.services.metrics_service import MetricsService
+from src.utils.pagination import keyset_paginate
 import uuid
 
 
@@ -34,6 +36,7 @@ class AuthService:
         try:
             db.session.add(user)
             db.session.commit()
+            MetricsService.invalidate()
             return True, "Registration successful", user
         except Exception as e:
             db.session.rollback()
@@ -53,6 +56,9 @@ class AuthService:
         if not user.is_active:
             return False, "Account is deactivated", None
 
+        if user.password_needs_rehash():
+            user.set_password(password)
+
         user.last_login = datetime.utcnow()
         db.session.commit()
 
@@ -71,6 +77,12 @@ class AuthService:
     def get_user_by_email(email: str) -> Optional[User]:
         return User.query.filter_by(email=email).first()
 
+    @staticmethod
+    def get_users_page(
+        cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> Tuple[List[User], Optional[str]]:
+        return keyset_paginate(User.query, User.created_at, User.id, cursor, limit)
+
     @staticmethod
     def change_password(
         user: User, old_password: str, new_password: str
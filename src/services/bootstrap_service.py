@@ -0,0 +1,134 @@
+import os
+import uuid
+from typing import List, Tuple
+from flask import current_app
+from sqlalchemy import inspect
+from src.core.extensions import db
+from src.core.constants import UserRole
+from src.models.complaint import Complaint
+from src.models.location import Location
+from src.models.rollup import ActivityRollup
+from src.models.sos import SOS
+from src.models.user import User
+from src.services.geo_service import GeoService
+from src.services.rollup_service import RollupService
+from src.services.map_service import MapService
+from src.services.search_service import ComplaintSearchService
+import src.models  # noqa: F401  registers every table on db.metadata
+
+# The schema as it was before migrations were added
+BASELINE_REVISION = "49b5bee086f8"
+
+# Rows per commit when filling in data for new columns and tables
+BACKFILL_BATCH_SIZE = 10000
+
+
+class BootstrapService:
+    """
+    One-time database setup: schema, full-text and map indexes, data for
+    new columns, and the default admin. Run by `flask bootstrap` before the workers start, or at
+    startup when BOOTSTRAP_ON_STARTUP is set.
+    """
+
+    @staticmethod
+    def run() -> List[str]:
+        """Run every step; returns one line per step describing what it did."""
+        return [
+            BootstrapService.create_schema(),
+            BootstrapService.install_indexes(),
+            BootstrapService.backfill_geohashes(),
+            BootstrapService.backfill_rollups(),
+            BootstrapService.create_default_admin()[1],
+        ]
+
+    @staticmethod
+    def create_schema() -> str:
+        """
+        Upgrade to the latest migration. A database created with create_all()
+        before migrations existed is stamped with the initial revision first;
+        later revisions check for the tables and indexes it may already have.
+        """
+        from flask_migrate import stamp, upgrade
+
+        directory = current_app.extensions["migrate"].directory
+        inspector = inspect(db.engine)
+        if inspector.has_table("users") and not inspector.has_table("alembic_version"):
+            stamp(directory, BASELINE_REVISION)
+
+        upgrade(directory)
+        return f"Schema upgraded from {directory}"
+
+    @staticmethod
+    def install_indexes() -> str:
+        backend = ComplaintSearchService.install()
+        MapService.install()
+        return f"Complaint search uses {backend}; map markers installed"
+
+    @staticmethod
+    def backfill_geohashes() -> str:
+        """
+        Compute the geohash of rows stored before the column existed. Rows
+        that already have one are left alone, so this is a no-op once the
+        first deploy after the migration has filled them in.
+        """
+        counts = [
+            f"{model.__tablename__} {GeoService.backfill(model, BACKFILL_BATCH_SIZE)}"
+            for model in (Location, Complaint)
+        ]
+        return f"Geohashes backfilled: {', '.join(counts)}"
+
+    @staticmethod
+    def backfill_rollups() -> str:
+        """
+        Build the rollups from the raw tables when there are none yet but
+        there are events to count, i.e. on the first deploy after the table
+        was added. From then on every event updates them as it is written.
+        """
+        if db.session.query(ActivityRollup.id).first() is not None:
+            return "Rollups already built"
+        if (
+            db.session.query(SOS.id).first() is None
+            and db.session.query(Complaint.id).first() is None
+        ):
+            return "No events to roll up"
+
+        totals = RollupService.backfill(BACKFILL_BATCH_SIZE)
+        counts = ", ".join(f"{kind} {events}" for kind, events in totals.items())
+        return f"Rollups backfilled: {counts}"
+
+    @staticmethod
+    def create_default_admin() -> Tuple[bool, str]:
+        """
+        Create the default admin unless an admin exists. Credentials come from
+        ADMIN_NAME, ADMIN_EMAIL, ADMIN_PASSWORD and ADMIN_PHONE.
+        """
+        if User.query.filter_by(role=UserRole.ADMIN.value).first():
+            return False, "Admin user already exists"
+
+        admin_email = os.getenv("ADMIN_EMAIL", "admin@pyraksha.com")
+        admin_password = os.getenv("ADMIN_PASSWORD", "Admin@2024")
+        admin_phone = os.getenv("ADMIN_PHONE", "+919876543210")
+
+        admin_user = User(
+            user_id=str(uuid.uuid4()),
+            name=os.getenv("ADMIN_NAME", "Admin"),
+            email=admin_email,
+            phone=admin_phone,
+            role=UserRole.ADMIN.value,
+        )
+        admin_user.set_password(admin_password)
+
+        try:
+            db.session.add(admin_user)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            return False, f"Failed to create admin user: {str(e)}"
+
+        return True, (
+            "Default admin user created\n"
+            f"   Email: {admin_email}\n"
+            f"   Password: {admin_password}\n"
+            f"   Phone: {admin_phone}\n"
+            "IMPORTANT: Change the password after first login!"
+        )
@@ -1,8 +1,14 @@
+from datetime import datetime
 from typing import Optional, List, Tuple
-from sqlalchemy import or_
+from sqlalchemy.orm import joinedload
 from src.core.extensions import db
 from src.models.complaint import Complaint
-from src.core.constants import ComplaintStatus
+from src.core.constants import ComplaintStatus, DEFAULT_PAGE_SIZE, ActivityType
+from src.services.rollup_service import RollupService
+from src.services.metrics_service import MetricsService
+from src.services.search_service import ComplaintSearchService
+from src.utils.pagination import keyset_paginate
+from src.services.geo_service import GeoService
 
 
 class ComplaintService:
@@ -31,11 +37,17 @@ class ComplaintService:
             description=description,
             latitude=latitude,
             longitude=longitude,
+            status=ComplaintStatus.PENDING.value,
+            timestamp=datetime.utcnow(),
         )
 
         try:
             db.session.add(complaint)
+            RollupService.record(
+                ActivityType.COMPLAINT.value, complaint.timestamp, complaint.status
+            )
             db.session.commit()
+            MetricsService.invalidate()
             return True, "Complaint filed successfully", complaint
         except Exception as e:
             db.session.rollback()
@@ -54,15 +66,63 @@ class ComplaintService:
     def get_all_complaints(
         status: Optional[str] = None, limit: int = 100
     ) -> List[Complaint]:
-        query = Complaint.query
+        query = Complaint.query.options(joinedload(Complaint.user))
         if status:
             query = query.filter_by(status=status)
         return query.order_by(Complaint.timestamp.desc()).limit(limit).all()
 
+    @staticmethod
+    def get_complaints_page(
+        user_id: Optional[int] = None,
+        status: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> Tuple[List[Complaint], Optional[str]]:
+        query = ComplaintService._filter_page(
+            Complaint.query.options(joinedload(Complaint.user)), user_id, status
+        )
+        return keyset_paginate(query, Complaint.timestamp, Complaint.id, cursor, limit)
+
+    @staticmethod
+    def get_complaints_page_versions(
+        user_id: Optional[int] = None,
+        status: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> Tuple[list, Optional[str]]:
+        """The (id, version) of every row get_complaints_page would return."""
+        query = ComplaintService._filter_page(
+            Complaint.query.with_entities(
+                Complaint.id, Complaint.timestamp, Complaint.version
+            ),
+            user_id,
+            status,
+        )
+        return keyset_paginate(query, Complaint.timestamp, Complaint.id, cursor, limit)
+
+    @staticmethod
+    def _filter_page(query, user_id: Optional[int], status: Optional[str]):
+        if user_id:
+            query = query.filter_by(user_id=user_id)
+        if status:
+            query = query.filter_by(status=status)
+        return query
+
     @staticmethod
     def get_complaint_by_id(complaint_id: str) -> Optional[Complaint]:
         return Complaint.query.filter_by(complaint_id=complaint_id).first()
 
+    @staticmethod
+    def get_complaint_version(complaint_id: str):
+        """Return (id, user_id, version, updated_at) without loading the row."""
+        return (
+            Complaint.query.with_entities(
+                Complaint.id, Complaint.user_id, Complaint.version, Complaint.updated_at
+            )
+            .filter_by(complaint_id=complaint_id)
+            .first()
+        )
+
     @staticmethod
     def update_complaint_status(
         complaint_id: str,
@@ -74,45 +134,88 @@ class ComplaintService:
         if not complaint:
             return False, "Complaint not found"
 
+        old_status = complaint.status
         complaint.update_status(new_status, resolved_by_id, notes)
 
         try:
+            RollupService.record(
+                ActivityType.COMPLAINT.value,
+                complaint.timestamp,
+                complaint.status,
+                old_status,
+            )
             db.session.commit()
+            MetricsService.invalidate()
             return True, "Complaint status updated"
         except Exception as e:
             db.session.rollback()
             return False, f"Failed to update status: {str(e)}"
 
     @staticmethod
-    def search_complaints(query: str, user_id: Optional[int] = None) -> List[Complaint]:
-        search = f"%{query}%"
-        base_query = Complaint.query.filter(
-            or_(Complaint.title.ilike(search), Complaint.description.ilike(search))
+    def search_complaints(
+        query: str,
+        user_id: Optional[int] = None,
+        page: int = 1,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> Tuple[List[Complaint], Optional[int]]:
+        complaints, has_more = ComplaintSearchService.search(
+            query, user_id, limit, (page - 1) * limit
         )
-
-        if user_id:
-            base_query = base_query.filter_by(user_id=user_id)
-
-        return base_query.order_by(Complaint.timestamp.desc()).limit(50).all()
+        return complaints, page + 1 if has_more else None
 
     @staticmethod
     def get_complaint_statistics() -> dict:
-        total = Complaint.query.count()
-        pending = Complaint.query.filter_by(
-            status=ComplaintStatus.PENDING.value
-        ).count()
-        under_review = Complaint.query.filter_by(
-            status=ComplaintStatus.UNDER_REVIEW.value
-        ).count()
-        resolved = Complaint.query.filter_by(
-            status=ComplaintStatus.RESOLVED.value
-        ).count()
-        closed = Complaint.query.filter_by(status=ComplaintStatus.CLOSED.value).count()
+        counts = MetricsService.get_counts()
 
         return {
-            "total": total,
-            "pending": pending,
-            "under_review": under_review,
-            "resolved": resolved,
-            "closed": closed,
+            "total": counts["total_complaints"],
+            "pending": counts["pending_complaints"],
+            "under_review": counts["under_review_complaints"],
+            "resolved": counts["resolved_complaints"],
+            "closed": counts["closed_complaints"],
         }
+
+    @staticmethod
+    def find_in_bbox(
+        box: Tuple[float, float, float, float],
+        user_id: Optional[int] = None,
+        status: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> List[Complaint]:
+        """Complaints inside (min_lat, min_lon, max_lat, max_lon), newest first."""
+        query = ComplaintService._geo_query(user_id, status)
+        return GeoService.in_bbox(query, Complaint, box, limit)
+
+    @staticmethod
+    def find_within_radius(
+        latitude: float,
+        longitude: float,
+        radius: float,
+        user_id: Optional[int] = None,
+        status: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> List[Tuple[Complaint, float]]:
+        query = ComplaintService._geo_query(user_id, status)
+        return GeoService.within_radius(
+            query, Complaint, latitude, longitude, radius, limit
+        )
+
+    @staticmethod
+    def find_nearest(
+        latitude: float,
+        longitude: float,
+        k: int,
+        user_id: Optional[int] = None,
+        status: Optional[str] = None,
+    ) -> List[Tuple[Complaint, float]]:
+        query = ComplaintService._geo_query(user_id, status)
+        return GeoService.nearest(query, Complaint, latitude, longitude, k)
+
+    @staticmethod
+    def _geo_query(user_id: Optional[int], status: Optional[str]):
+        query = Complaint.query
+        if user_id:
+            query = query.filter(Complaint.user_id == user_id)
+        if status:
+            query = query.filter(Complaint.status == status)
+        return query
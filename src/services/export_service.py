@@ -0,0 +1,341 @@
+import csv
+import io
+import json
+from importlib.util import find_spec
+from datetime import datetime
+from itertools import groupby
+from typing import Iterator, List, Optional, Tuple
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+from src.core.extensions import db
+from src.models.complaint import Complaint
+from src.models.location import Location
+from src.models.sos import SOS
+from src.models.user import User
+from src.services.location_service import parse_timestamp
+
+# Checked without importing it; pyarrow is loaded by the first columnar export
+HAS_PYARROW = find_spec("pyarrow") is not None
+
+FORMAT_CSV = "csv"
+FORMAT_NDJSON = "ndjson"
+FORMAT_ARROW = "arrow"
+FORMAT_PARQUET = "parquet"
+
+EXPORT_FORMATS = {
+    FORMAT_CSV: ("text/csv", "csv"),
+    FORMAT_NDJSON: ("application/x-ndjson", "ndjson"),
+    FORMAT_ARROW: ("application/vnd.apache.arrow.stream", "arrow"),
+    FORMAT_PARQUET: ("application/vnd.apache.parquet", "parquet"),
+}
+
+# Column kinds, used to build the Arrow schema
+STRING, INTEGER, FLOAT, TIMESTAMP = "string", "integer", "float", "timestamp"
+
+# Fields of an SOS export row that belong to a track point rather than the event
+_TRACK_FIELDS = ("latitude", "longitude", "accuracy", "location_time")
+
+
+class ExportOptions:
+    """Rows to export: an optional time window, owner and status."""
+
+    __slots__ = ("since", "until", "user_id", "status")
+
+    def __init__(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        user_id: Optional[int] = None,
+        status: Optional[str] = None,
+    ):
+        self.since = since
+        self.until = until
+        self.user_id = user_id
+        self.status = status
+
+    @staticmethod
+    def from_args(args) -> "ExportOptions":
+        """
+        Build options from request arguments: since, until, user_id and
+        status. Raises ValueError on bad input.
+        """
+        options = ExportOptions(
+            user_id=args.get("user_id", type=int), status=args.get("status")
+        )
+        for name in ("since", "until"):
+            value = args.get(name)
+            if value:
+                setattr(options, name, parse_timestamp(value))
+
+        if options.since and options.until and options.since >= options.until:
+            raise ValueError("since must be before until")
+        return options
+
+
+def _sos_export():
+    owner = aliased(User)
+    columns = [
+        ("sos_id", SOS.sos_id, STRING),
+        ("user_id", owner.user_id, STRING),
+        ("status", SOS.status, STRING),
+        ("start_time", SOS.start_time, TIMESTAMP),
+        ("end_time", SOS.end_time, TIMESTAMP),
+        ("resolved_by", SOS.resolved_by, INTEGER),
+        ("notes", SOS.notes, STRING),
+        ("latitude", Location.latitude, FLOAT),
+        ("longitude", Location.longitude, FLOAT),
+        ("accuracy", Location.accuracy, FLOAT),
+        ("location_time", Location.timestamp, TIMESTAMP),
+    ]
+    # One row per track point, so an event is exported as consecutive rows
+    statement = (
+        select(*(column for _, column, _ in columns))
+        .join(owner, owner.id == SOS.user_id)
+        .outerjoin(Location, Location.sos_id == SOS.id)
+        .order_by(SOS.start_time, SOS.id, Location.timestamp, Location.id)
+    )
+    return columns, statement, SOS.start_time, SOS.user_id, SOS.status
+
+
+def _complaint_export():
+    owner = aliased(User)
+    columns = [
+        ("complaint_id", Complaint.complaint_id, STRING),
+        ("user_id", owner.user_id, STRING),
+        ("title", Complaint.title, STRING),
+        ("description", Complaint.description, STRING),
+        ("status", Complaint.status, STRING),
+        ("timestamp", Complaint.timestamp, TIMESTAMP),
+        ("resolved_at", Complaint.resolved_at, TIMESTAMP),
+        ("resolved_by", Complaint.resolved_by, INTEGER),
+        ("resolution_notes", Complaint.resolution_notes, STRING),
+        ("latitude", Complaint.latitude, FLOAT),
+        ("longitude", Complaint.longitude, FLOAT),
+    ]
+    statement = (
+        select(*(column for _, column, _ in columns))
+        .join(owner, owner.id == Complaint.user_id)
+        .order_by(Complaint.timestamp, Complaint.id)
+    )
+    return (
+        columns,
+        statement,
+        Complaint.timestamp,
+        Complaint.user_id,
+        Complaint.status,
+    )
+
+
+def _location_export():
+    owner = aliased(User)
+    columns = [
+        ("id", Location.id, INTEGER),
+        ("user_id", owner.user_id, STRING),
+        ("sos_id", SOS.sos_id, STRING),
+        ("latitude", Location.latitude, FLOAT),
+        ("longitude", Location.longitude, FLOAT),
+        ("accuracy", Location.accuracy, FLOAT),
+        ("timestamp", Location.timestamp, TIMESTAMP),
+        ("update_type", Location.update_type, STRING),
+    ]
+    statement = (
+        select(*(column for _, column, _ in columns))
+        .join(owner, owner.id == Location.user_id)
+        .outerjoin(SOS, SOS.id == Location.sos_id)
+        .order_by(Location.timestamp, Location.id)
+    )
+    # Raw locations have no status, so the status filter matches update_type
+    return (
+        columns,
+        statement,
+        Location.timestamp,
+        Location.user_id,
+        Location.update_type,
+    )
+
+
+EXPORT_DATASETS = {
+    "sos": _sos_export,
+    "complaints": _complaint_export,
+    "locations": _location_export,
+}
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that buffers what pyarrow writes until it is drained."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _to_text(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+class ExportService:
+    """
+    Streams whole tables as CSV, NDJSON, Arrow IPC or Parquet. Rows are read
+    with yield_per (a server-side cursor where the driver supports one) and
+    encoded one partition at a time, so memory stays flat however many rows
+    match.
+    """
+
+    @staticmethod
+    def available_formats() -> List[str]:
+        if not HAS_PYARROW:
+            return [FORMAT_CSV, FORMAT_NDJSON]
+        return list(EXPORT_FORMATS)
+
+    @staticmethod
+    def validate(dataset: str, export_format: str) -> Tuple[bool, str]:
+        if dataset not in EXPORT_DATASETS:
+            return False, f"Unknown dataset: {dataset}"
+        if export_format not in EXPORT_FORMATS:
+            return False, f"Unknown format: {export_format}"
+        if export_format not in ExportService.available_formats():
+            return False, f"The {export_format} format requires pyarrow"
+        return True, "OK"
+
+    @staticmethod
+    def stream(
+        dataset: str, export_format: str, options: ExportOptions
+    ) -> Iterator[bytes]:
+        columns, partitions = ExportService._partitions(dataset, options)
+        names = [name for name, _, _ in columns]
+
+        if export_format == FORMAT_CSV:
+            return ExportService._csv(names, partitions)
+        if export_format == FORMAT_NDJSON:
+            return ExportService._ndjson(dataset, names, partitions)
+        return ExportService._columnar(export_format, columns, partitions)
+
+    @staticmethod
+    def _partitions(dataset: str, options: ExportOptions):
+        columns, statement, time_column, user_column, status_column = EXPORT_DATASETS[
+            dataset
+        ]()
+        if options.since:
+            statement = statement.where(time_column >= options.since)
+        if options.until:
+            statement = statement.where(time_column < options.until)
+        if options.user_id is not None:
+            statement = statement.where(user_column == options.user_id)
+        if options.status:
+            statement = statement.where(status_column == options.status)
+
+        result = db.session.execute(
+            statement.execution_options(
+                yield_per=current_app.config["EXPORT_CHUNK_SIZE"]
+            )
+        )
+        return columns, result.partitions()
+
+    @staticmethod
+    def _csv(names: List[str], partitions) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(names)
+        for rows in partitions:
+            writer.writerows([_to_text(value) for value in row] for row in rows)
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue().encode()
+
+    @staticmethod
+    def _ndjson(dataset: str, names: List[str], partitions) -> Iterator[bytes]:
+        records = (
+            {name: _to_text(value) for name, value in zip(names, row)}
+            for rows in partitions
+            for row in rows
+        )
+        if dataset == "sos":
+            records = ExportService._nest_tracks(records)
+
+        lines = []
+        for record in records:
+            lines.append(json.dumps(record, separators=(",", ":")))
+            if len(lines) >= current_app.config["EXPORT_CHUNK_SIZE"]:
+                yield ("\n".join(lines) + "\n").encode()
+                lines = []
+        if lines:
+            yield ("\n".join(lines) + "\n").encode()
+
+    @staticmethod
+    def _nest_tracks(records) -> Iterator[dict]:
+        """Fold the consecutive per-point rows of each SOS into one record."""
+        for _, rows in groupby(records, key=lambda record: record["sos_id"]):
+            event = None
+            for row in rows:
+                if event is None:
+                    event = {
+                        key: value
+                        for key, value in row.items()
+                        if key not in _TRACK_FIELDS
+                    }
+                    event["locations"] = []
+                if row["latitude"] is not None:
+                    event["locations"].append(
+                        {
+                            "latitude": row["latitude"],
+                            "longitude": row["longitude"],
+                            "accuracy": row["accuracy"],
+                            "timestamp": row["location_time"],
+                        }
+                    )
+            yield event
+
+    @staticmethod
+    def _columnar(export_format: str, columns, partitions) -> Iterator[bytes]:
+        # Imported on first use; pyarrow adds a lot to every worker's startup
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+
+        types = {
+            STRING: pyarrow.string(),
+            INTEGER: pyarrow.int64(),
+            FLOAT: pyarrow.float64(),
+            TIMESTAMP: pyarrow.timestamp("us"),
+        }
+        schema = pyarrow.schema([(name, types[kind]) for name, _, kind in columns])
+        sink = _ChunkSink()
+        if export_format == FORMAT_PARQUET:
+            writer = pyarrow.parquet.ParquetWriter(sink, schema)
+        else:
+            writer = pyarrow.ipc.new_stream(sink, schema)
+
+        for rows in partitions:
+            batch = pyarrow.RecordBatch.from_arrays(
+                [
+                    pyarrow.array([row[i] for row in rows], type=field.type)
+                    for i, field in enumerate(schema)
+                ],
+                schema=schema,
+            )
+            # Each partition becomes one Parquet row group or Arrow batch
+            writer.write_batch(batch)
+            yield sink.drain()
+
+        writer.close()
+        yield sink.drain()
@@ -0,0 +1,169 @@
+import math
+from typing import List, Optional, Tuple
+from sqlalchemy import and_, case, or_, update
+from src.core.extensions import db
+from src.core.constants import MAX_SEARCH_RADIUS_METERS, NEAREST_INITIAL_RADIUS_METERS
+from src.utils import geohash
+from src.utils.geometry import EARTH_RADIUS_METERS, bounding_boxes, haversine_meters
+
+Box = Tuple[float, float, float, float]
+
+# How far past the radius the approximate distance may reach, so rows the
+# approximation puts just outside still get their exact distance checked
+_APPROX_SLACK = 0.02
+
+
+class GeoService:
+    """
+    Spatial queries over models with latitude, longitude and geohash
+    columns. Each box is translated into index range scans over the few
+    geohash cells that cover it, then filtered exactly, so only rows in the
+    relevant cells are read.
+    """
+
+    @staticmethod
+    def in_bbox(query, model, box: Box, limit: int) -> List:
+        min_lat, min_lon, max_lat, max_lon = box
+        if min_lon > max_lon:
+            boxes = [
+                (min_lat, min_lon, max_lat, 180.0),
+                (min_lat, -180.0, max_lat, max_lon),
+            ]
+        else:
+            boxes = [box]
+
+        return (
+            query.filter(GeoService._box_filter(model, boxes))
+            .order_by(model.id.desc())
+            .limit(limit)
+            .all()
+        )
+
+    @staticmethod
+    def within_radius(
+        query,
+        model,
+        latitude: float,
+        longitude: float,
+        radius: float,
+        limit: Optional[int],
+    ) -> List[Tuple[object, float]]:
+        """
+        Return (row, distance in meters) pairs, nearest first. The database
+        orders rows by an equirectangular distance and applies the limit, so
+        only rows that are returned are read back. Below latitude 70 that
+        distance is within 1% of the exact one even at
+        MAX_SEARCH_RADIUS_METERS, so only rows at nearly the same distance
+        can trade places at the limit.
+        """
+        distance = GeoService._approx_distance(model, latitude, longitude)
+        reach = math.degrees(radius / EARTH_RADIUS_METERS) * (1 + _APPROX_SLACK)
+        query = (
+            query.filter(
+                GeoService._box_filter(
+                    model, bounding_boxes(latitude, longitude, radius)
+                ),
+                distance <= reach * reach,
+            )
+            .order_by(distance)
+            .limit(limit)
+        )
+
+        hits = []
+        for row in query:
+            meters = haversine_meters(latitude, longitude, row.latitude, row.longitude)
+            if meters <= radius:
+                hits.append((row, meters))
+        hits.sort(key=lambda hit: hit[1])
+        return hits
+
+    @staticmethod
+    def nearest(
+        query, model, latitude: float, longitude: float, k: int
+    ) -> List[Tuple[object, float]]:
+        """
+        Return the k nearest rows within MAX_SEARCH_RADIUS_METERS. The search
+        radius grows until it holds k rows; anything outside it is further
+        away than everything inside, so those k are the nearest. No step
+        reads more than k rows.
+        """
+        radius = NEAREST_INITIAL_RADIUS_METERS
+        while True:
+            hits = GeoService.within_radius(
+                query, model, latitude, longitude, radius, k
+            )
+            if len(hits) >= k or radius >= MAX_SEARCH_RADIUS_METERS:
+                return hits
+            radius = min(radius * 4, MAX_SEARCH_RADIUS_METERS)
+
+    @staticmethod
+    def backfill(model, batch_size: int) -> int:
+        """Fill in the geohash of rows stored before the column existed."""
+        total = 0
+        last_id = 0
+        while True:
+            rows = (
+                db.session.query(model.id, model.latitude, model.longitude)
+                .filter(
+                    model.id > last_id,
+                    model.geohash.is_(None),
+                    model.latitude.isnot(None),
+                    model.longitude.isnot(None),
+                )
+                .order_by(model.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                return total
+
+            db.session.execute(
+                update(model),
+                [
+                    {
+                        "id": row.id,
+                        "geohash": geohash.encode(row.latitude, row.longitude),
+                    }
+                    for row in rows
+                ],
+            )
+            db.session.commit()
+            total += len(rows)
+            last_id = rows[-1].id
+
+    @staticmethod
+    def _box_filter(model, boxes: List[Box]):
+        clauses = []
+        for min_lat, min_lon, max_lat, max_lon in boxes:
+            cells = geohash.covering_cells(min_lat, min_lon, max_lat, max_lon)
+            clauses.append(
+                and_(
+                    or_(*[GeoService._cell_filter(model, cell) for cell in cells]),
+                    model.latitude.between(min_lat, max_lat),
+                    model.longitude.between(min_lon, max_lon),
+                )
+            )
+        return or_(*clauses)
+
+    @staticmethod
+    def _cell_filter(model, cell: str):
+        """Index range over the hashes that start with `cell`."""
+        end = geohash.prefix_end(cell)
+        if end is None:
+            return model.geohash >= cell
+        return and_(model.geohash >= cell, model.geohash < end)
+
+    @staticmethod
+    def _approx_distance(model, latitude: float, longitude: float):
+        """
+        Squared equirectangular distance from (latitude, longitude), in
+        degrees of latitude, as a SQL expression that needs no trigonometry
+        from the database.
+        """
+        scale = math.cos(math.radians(latitude))
+        d_lat = model.latitude - latitude
+        d_lon = model.longitude - longitude
+        d_lon = case(
+            (d_lon > 180, d_lon - 360), (d_lon < -180, d_lon + 360), else_=d_lon
+        )
+        return d_lat * d_lat + d_lon * d_lon * (scale * scale)
@@ -0,0 +1,138 @@
+import math
+import time
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+import numpy as np
+from flask import current_app
+from sqlalchemy import or_, select
+from src.core.extensions import db
+from src.core.constants import MAX_UNBOXED_HEATMAP_ZOOM
+from src.models.location import Location
+from src.utils.cache import TTLCache
+
+heatmap_cache = TTLCache(maxsize=256)
+
+Box = Tuple[float, float, float, float]
+
+
+def cell_size_for_zoom(zoom: int, cells_per_tile: int) -> float:
+    """Cell edge in degrees, so a map tile at `zoom` holds cells_per_tile cells."""
+    return 360.0 / ((1 << zoom) * cells_per_tile)
+
+
+def snap_box(box: Box, cell: float) -> Box:
+    """Grow a box outwards to whole cells, so nearby viewports share a cache entry."""
+    min_lat, min_lon, max_lat, max_lon = box
+    return (
+        max(math.floor((min_lat + 90) / cell) * cell - 90, -90.0),
+        max(math.floor((min_lon + 180) / cell) * cell - 180, -180.0),
+        min(math.ceil((max_lat + 90) / cell) * cell - 90, 90.0),
+        min(math.ceil((max_lon + 180) / cell) * cell - 180, 180.0),
+    )
+
+
+class HeatmapService:
+    """
+    Bins location points into a square grid whose cell size follows the map
+    zoom. Coordinates are streamed from the database as plain column chunks
+    and counted with NumPy, so no ORM objects are built.
+    """
+
+    @staticmethod
+    def get_heatmap(
+        hours: int,
+        zoom: int,
+        box: Optional[Box] = None,
+        update_type: Optional[str] = None,
+    ) -> dict:
+        config = current_app.config
+        if not box:
+            # A whole-world grid at street zoom is mostly empty cells and
+            # one cell per point; without a viewport, stop at city scale
+            zoom = min(zoom, MAX_UNBOXED_HEATMAP_ZOOM)
+        bucket_seconds = config["HEATMAP_BUCKET_SECONDS"]
+        cell = cell_size_for_zoom(zoom, config["HEATMAP_CELLS_PER_TILE"])
+        if box:
+            box = snap_box(box, cell)
+
+        bucket = int(time.time() // bucket_seconds)
+        until = datetime.utcfromtimestamp(bucket * bucket_seconds)
+        since = until - timedelta(hours=hours)
+
+        heatmap_cache.maxsize = config["HEATMAP_CACHE_SIZE"]
+        return heatmap_cache.get_or_set(
+            (bucket, hours, zoom, box, update_type),
+            lambda: HeatmapService._compute(since, until, cell, box, update_type),
+            bucket_seconds,
+        )
+
+    @staticmethod
+    def _compute(
+        since: datetime,
+        until: datetime,
+        cell: float,
+        box: Optional[Box],
+        update_type: Optional[str],
+    ) -> dict:
+        statement = select(Location.latitude, Location.longitude).where(
+            Location.timestamp >= since, Location.timestamp < until
+        )
+        if box:
+            min_lat, min_lon, max_lat, max_lon = box
+            if min_lon > max_lon:
+                # The box crosses the antimeridian
+                longitude = or_(
+                    Location.longitude >= min_lon, Location.longitude <= max_lon
+                )
+            else:
+                longitude = Location.longitude.between(min_lon, max_lon)
+            statement = statement.where(
+                Location.latitude.between(min_lat, max_lat), longitude
+            )
+        if update_type:
+            statement = statement.where(Location.update_type == update_type)
+
+        columns = round(360.0 / cell)
+        grid_rows = round(180.0 / cell)
+        chunk_keys, chunk_counts = [], []
+        result = db.session.execute(
+            statement.execution_options(
+                yield_per=current_app.config["HEATMAP_CHUNK_SIZE"]
+            )
+        )
+        for chunk in result.partitions():
+            coords = np.asarray(chunk, dtype=np.float64)
+            rows = np.floor((coords[:, 0] + 90.0) / cell).astype(np.int64)
+            cols = np.floor((coords[:, 1] + 180.0) / cell).astype(np.int64)
+            # Points on the north pole or the antimeridian at +180 fall into
+            # the last row and column instead of one past the grid
+            rows = np.minimum(rows, grid_rows - 1)
+            cols = np.minimum(cols, columns - 1)
+            keys, counts = np.unique(rows * columns + cols, return_counts=True)
+            chunk_keys.append(keys)
+            chunk_counts.append(counts)
+
+        heatmap = {
+            "since": since.isoformat(),
+            "until": until.isoformat(),
+            "cell_size": cell,
+            "max_weight": 0,
+            "cells": [],
+        }
+        if not chunk_keys:
+            return heatmap
+
+        keys, inverse = np.unique(np.concatenate(chunk_keys), return_inverse=True)
+        weights = np.bincount(inverse, weights=np.concatenate(chunk_counts))
+        rows, cols = np.divmod(keys, columns)
+        latitudes = np.round(-90.0 + (rows + 0.5) * cell, 6)
+        longitudes = np.round(-180.0 + (cols + 0.5) * cell, 6)
+
+        heatmap["max_weight"] = int(weights.max())
+        heatmap["cells"] = [
+            [lat, lon, int(weight)]
+            for lat, lon, weight in zip(
+                latitudes.tolist(), longitudes.tolist(), weights.tolist()
+            )
+        ]
+        return heatmap
@@ -1,8 +1,22 @@
-from datetime import datetime, timedelta
-from typing import Optional, List, Tuple
+from datetime import datetime, timezone
+from typing import Optional, List, Tuple, Dict
+from dateutil import parser as date_parser
+from sqlalchemy import func
 from src.core.extensions import db
 from src.models.location import Location
 from src.models.user import User
+from src.services.location_writer import location_writer
+from src.services.geo_service import GeoService
+from src.core.constants import DEFAULT_PAGE_SIZE
+from src.utils import geohash
+
+
+def parse_timestamp(value) -> datetime:
+    """Parse an ISO 8601 string into a naive UTC datetime."""
+    timestamp = date_parser.isoparse(str(value))
+    if timestamp.tzinfo:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
 
 
 class LocationService:
@@ -24,6 +38,26 @@ class LocationService:
             update_type=update_type,
         )
 
+        if location_writer.enabled:
+            location.timestamp = datetime.utcnow()
+            success, message = location_writer.write(
+                [
+                    {
+                        "user_id": user_id,
+                        "sos_id": sos_id,
+                        "latitude": latitude,
+                        "longitude": longitude,
+                        "geohash": geohash.encode(latitude, longitude),
+                        "accuracy": accuracy,
+                        "timestamp": location.timestamp,
+                        "update_type": update_type,
+                    }
+                ]
+            )
+            if not success:
+                return False, message, None
+            return True, "Location added", location
+
         try:
             db.session.add(location)
             db.session.commit()
@@ -32,6 +66,49 @@ class LocationService:
             db.session.rollback()
             return False, f"Failed to add location: {str(e)}", None
 
+    @staticmethod
+    def build_location_row(
+        data: dict, user_id: int, sos_id: Optional[int], update_type: str
+    ) -> Tuple[Optional[dict], Optional[str]]:
+        if not isinstance(data, dict):
+            return None, "Location must be an object"
+
+        try:
+            latitude = float(data.get("latitude"))
+            longitude = float(data.get("longitude"))
+        except (TypeError, ValueError):
+            return None, "Latitude and longitude must be numbers"
+
+        if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+            return None, "Latitude or longitude out of range"
+
+        accuracy = data.get("accuracy")
+        if accuracy is not None:
+            try:
+                accuracy = float(accuracy)
+            except (TypeError, ValueError):
+                return None, "Accuracy must be a number"
+
+        timestamp = data.get("timestamp")
+        if timestamp:
+            try:
+                timestamp = parse_timestamp(timestamp)
+            except ValueError:
+                return None, "Timestamp must be an ISO 8601 string"
+        else:
+            timestamp = datetime.utcnow()
+
+        return {
+            "user_id": user_id,
+            "sos_id": sos_id,
+            "latitude": latitude,
+            "longitude": longitude,
+            "geohash": geohash.encode(latitude, longitude),
+            "accuracy": accuracy,
+            "timestamp": timestamp,
+            "update_type": update_type,
+        }, None
+
     @staticmethod
     def get_user_locations(user_id: int, limit: int = 100) -> List[Location]:
         return (
@@ -58,40 +135,146 @@ class LocationService:
         )
 
     @staticmethod
-    def get_recent_locations(hours: int = 24) -> List[Location]:
-        since = datetime.utcnow() - timedelta(hours=hours)
-        return (
-            Location.query.filter(Location.timestamp >= since)
-            .order_by(Location.timestamp.desc())
+    def get_latest_sos_locations(sos_ids: List[int]) -> Dict[int, Location]:
+        if not sos_ids:
+            return {}
+
+        ranked = (
+            db.session.query(
+                Location.id.label("id"),
+                func.row_number()
+                .over(
+                    partition_by=Location.sos_id,
+                    order_by=(Location.timestamp.desc(), Location.id.desc()),
+                )
+                .label("rank"),
+            )
+            .filter(Location.sos_id.in_(sos_ids))
+            .subquery()
+        )
+        locations = (
+            Location.query.join(ranked, Location.id == ranked.c.id)
+            .filter(ranked.c.rank == 1)
             .all()
         )
+        return {location.sos_id: location for location in locations}
+
+    @staticmethod
+    def get_sos_location_histories(
+        sos_ids: List[int],
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Dict[int, List[Location]]:
+        histories: Dict[int, List[Location]] = {sos_id: [] for sos_id in sos_ids}
+        if not sos_ids:
+            return histories
+
+        query = Location.query.filter(Location.sos_id.in_(sos_ids))
+        if since:
+            query = query.filter(Location.timestamp >= since)
+        if until:
+            query = query.filter(Location.timestamp <= until)
+
+        locations = query.order_by(Location.timestamp.asc(), Location.id.asc()).all()
+        for location in locations:
+            histories[location.sos_id].append(location)
+        return histories
 
     @staticmethod
     def get_all_active_user_locations() -> List[dict]:
         from src.core.constants import SOSStatus
         from src.models.sos import SOS
 
-        active_sos_users = (
-            db.session.query(SOS.user_id).filter_by(status=SOSStatus.ACTIVE.value).all()
+        active_user_ids = db.session.query(SOS.user_id).filter(
+            SOS.status == SOSStatus.ACTIVE.value
         )
-        active_user_ids = [user_id for (user_id,) in active_sos_users]
-
-        locations = []
-        for user_id in active_user_ids:
-            latest = LocationService.get_user_latest_location(user_id)
-            if latest:
-                user = User.query.get(user_id)
-                locations.append(
-                    {
-                        "user_id": user_id,
-                        "user_name": user.name if user else "Unknown",
-                        "location": latest.to_dict(),
-                    }
+        ranked = (
+            db.session.query(
+                Location.id.label("id"),
+                func.row_number()
+                .over(
+                    partition_by=Location.user_id,
+                    order_by=(Location.timestamp.desc(), Location.id.desc()),
                 )
+                .label("rank"),
+            )
+            .filter(Location.user_id.in_(active_user_ids))
+            .subquery()
+        )
+        rows = (
+            db.session.query(Location, User.name)
+            .join(ranked, Location.id == ranked.c.id)
+            .join(User, User.id == Location.user_id)
+            .filter(ranked.c.rank == 1)
+            .all()
+        )
+
+        return [
+            {
+                "user_id": location.user_id,
+                "user_name": user_name,
+                "location": location.to_dict(),
+            }
+            for location, user_name in rows
+        ]
+
+    @staticmethod
+    def get_heatmap_data(
+        hours: int = 24,
+        zoom: int = 12,
+        box: Optional[Tuple[float, float, float, float]] = None,
+        update_type: Optional[str] = None,
+    ) -> dict:
+        """
+        Location density over the last `hours` as [lat, lon, weight] cells
+        sized for map `zoom`, optionally limited to a bounding box.
+        """
+        # Imported here so workers only load numpy once a heatmap is asked for
+        from src.services.heatmap_service import HeatmapService
 
-        return locations
+        return HeatmapService.get_heatmap(hours, zoom, box, update_type)
+
+    @staticmethod
+    def find_in_bbox(
+        box: Tuple[float, float, float, float],
+        update_type: Optional[str] = None,
+        since: Optional[datetime] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> List[Location]:
+        """Locations inside (min_lat, min_lon, max_lat, max_lon), newest first."""
+        query = LocationService._geo_query(update_type, since)
+        return GeoService.in_bbox(query, Location, box, limit)
+
+    @staticmethod
+    def find_within_radius(
+        latitude: float,
+        longitude: float,
+        radius: float,
+        update_type: Optional[str] = None,
+        since: Optional[datetime] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> List[Tuple[Location, float]]:
+        query = LocationService._geo_query(update_type, since)
+        return GeoService.within_radius(
+            query, Location, latitude, longitude, radius, limit
+        )
+
+    @staticmethod
+    def find_nearest(
+        latitude: float,
+        longitude: float,
+        k: int,
+        update_type: Optional[str] = None,
+        since: Optional[datetime] = None,
+    ) -> List[Tuple[Location, float]]:
+        query = LocationService._geo_query(update_type, since)
+        return GeoService.nearest(query, Location, latitude, longitude, k)
 
     @staticmethod
-    def get_heatmap_data(hours: int = 24) -> List[Tuple[float, float]]:
-        locations = LocationService.get_recent_locations(hours)
-        return [(loc.latitude, loc.longitude) for loc in locations]
+    def _geo_query(update_type: Optional[str], since: Optional[datetime]):
+        query = Location.query
+        if update_type:
+            query = query.filter(Location.update_type == update_type)
+        if since:
+            query = query.filter(Location.timestamp >= since)
+        return query
@@ -0,0 +1,210 @@
+import atexit
+import os
+import queue
+import threading
+import time
+from typing import List, Optional, Tuple
+from sqlalchemy import insert
+from src.core.extensions import db
+from src.core.instrumentation import instrumentation
+from src.models.location import Location
+from src.models.sos import SOS
+from src.services.map_service import MapService
+from src.utils.versioning import bump_versions
+
+DURABILITY_SYNC = "sync"
+DURABILITY_ASYNC = "async"
+
+
+class _PendingWrite:
+    def __init__(self, rows: List[dict]):
+        self.rows = rows
+        self.done = threading.Event()
+        self.error: Optional[str] = None
+        self._claimed = False
+        self._cancelled = False
+        self._lock = threading.Lock()
+
+    def claim(self) -> bool:
+        """Called by the writer before committing; False once cancelled."""
+        with self._lock:
+            if self._cancelled:
+                return False
+            self._claimed = True
+            return True
+
+    def cancel(self) -> bool:
+        """Called by a caller that gave up; False once the writer has it."""
+        with self._lock:
+            if self._claimed:
+                return False
+            self._cancelled = True
+            return True
+
+
+class LocationWriter:
+    """
+    Write-behind pipeline for location rows.
+
+    When enabled, request handlers only enqueue rows; a single writer thread
+    per process drains the queue and commits everything it collected in one
+    transaction, bounded by LOCATION_WRITE_BATCH_SIZE rows or
+    LOCATION_WRITE_MAX_DELAY_MS. In "sync" durability mode the caller waits
+    for the group commit that contains its rows, in "async" mode it returns
+    as soon as the rows are queued.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.enabled = False
+        self.batch_size = 500
+        self.max_delay = 0.05
+        self.durability = DURABILITY_SYNC
+        self.timeout = 5.0
+        self._queue: "queue.Queue[Optional[_PendingWrite]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        atexit.register(self.stop)
+
+    def init_app(self, app) -> None:
+        self.app = app
+        self.enabled = app.config["LOCATION_WRITE_BEHIND"]
+        self.batch_size = app.config["LOCATION_WRITE_BATCH_SIZE"]
+        self.max_delay = app.config["LOCATION_WRITE_MAX_DELAY_MS"] / 1000.0
+        self.durability = app.config["LOCATION_WRITE_DURABILITY"]
+        self.timeout = app.config["LOCATION_WRITE_TIMEOUT"]
+        app.extensions["location_writer"] = self
+
+    def write(self, rows: List[dict]) -> Tuple[bool, str]:
+        if not self.enabled:
+            return self._write_now(rows)
+
+        self._ensure_started()
+        pending = _PendingWrite(rows)
+        self._queue.put(pending)
+
+        if self.durability != DURABILITY_SYNC:
+            return True, "Locations queued"
+
+        if not pending.done.wait(self.timeout):
+            if pending.cancel():
+                # Dropped from the queue, so retrying cannot duplicate it
+                return False, "Timed out waiting for location write"
+            # Already part of a commit in flight; a retry would duplicate it
+            if not pending.done.wait(self.timeout):
+                return True, "Locations accepted, write not yet confirmed"
+
+        if pending.error:
+            return False, f"Failed to write locations: {pending.error}"
+
+        return True, "Locations written"
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        thread = self._thread
+        if thread and thread.is_alive() and self._pid == os.getpid():
+            self._queue.put(None)
+            thread.join(timeout)
+        self._thread = None
+
+    def _write_now(self, rows: List[dict]) -> Tuple[bool, str]:
+        try:
+            self._insert(rows)
+            db.session.commit()
+            return True, "Locations written"
+        except Exception as e:
+            db.session.rollback()
+            return False, f"Failed to write locations: {str(e)}"
+
+    @staticmethod
+    def _insert(rows: List[dict]) -> None:
+        db.session.execute(insert(Location), rows)
+        MapService.apply_locations(rows)
+        bump_versions(SOS, {row["sos_id"] for row in rows if row.get("sos_id")})
+
+    def _ensure_started(self) -> None:
+        # Threads do not survive fork(), so a worker that inherited a writer
+        # from its parent starts its own on first use.
+        if self._thread and self._thread.is_alive() and self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._thread and self._thread.is_alive() and self._pid == os.getpid():
+                return
+
+            self._queue = queue.Queue()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, name="location-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            group = [first]
+            row_count = len(first.rows)
+            deadline = time.monotonic() + self.max_delay
+            stopping = False
+
+            while row_count < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    pending = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if pending is None:
+                    stopping = True
+                    break
+                group.append(pending)
+                row_count += len(pending.rows)
+
+            self._commit_group(group)
+
+            if stopping:
+                return
+
+    def _commit_group(self, group: List[_PendingWrite]) -> None:
+        group = [pending for pending in group if pending.claim()]
+        if not group:
+            return
+
+        with self.app.app_context():
+            try:
+                self._insert([row for pending in group for row in pending.rows])
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                # Retry each submission on its own so one bad batch does not
+                # fail every request that shared its group commit.
+                for pending in group:
+                    try:
+                        self._insert(pending.rows)
+                        db.session.commit()
+                    except Exception as e:
+                        db.session.rollback()
+                        pending.error = str(e)
+                        # In async mode nobody waits for the error, so this
+                        # log line and counter are all that is left of it
+                        self.app.logger.exception(
+                            "Location write of %d rows failed", len(pending.rows)
+                        )
+                        instrumentation.location_write_failures.inc(
+                            self.durability, amount=len(pending.rows)
+                        )
+            finally:
+                db.session.remove()
+
+        for pending in group:
+            pending.done.set()
+
+
+location_writer = LocationWriter()
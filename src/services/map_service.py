@@ -0,0 +1,185 @@
+from typing import List, Optional
+from sqlalchemy import and_, func, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from src.core.extensions import db
+from src.models.map_marker import MapMarker
+from src.models.sos import SOS
+from src.models.user import User
+from src.core.constants import SOSStatus
+
+_MARKER_FIELDS = ("user_id", "latitude", "longitude", "accuracy", "timestamp")
+
+
+class MapService:
+    """
+    Keeps one marker per SOS event for the admin live map, stamped with a
+    version when it last changed, so clients can ask for everything that
+    changed from the cursor they hold.
+
+    Versions come without a shared counter row, which would serialize every
+    location write on one row lock. On Postgres a marker's version is the id
+    of the transaction that wrote it, and the cursor handed to clients is
+    the oldest transaction still running when they read: everything below it
+    has committed, and anything at or above it is sent again on the next
+    poll. Other databases have a single writer, so the next version is
+    max(version) + 1 read under that writer's lock.
+    """
+
+    @staticmethod
+    def install() -> None:
+        """
+        Seed markers for SOS events that were already active before markers
+        were tracked.
+        """
+        from src.services.location_service import LocationService
+
+        if db.session.query(MapMarker.sos_id).first() is not None:
+            return
+
+        active_ids = [
+            sos_id
+            for (sos_id,) in db.session.query(SOS.id).filter(
+                SOS.status == SOSStatus.ACTIVE.value
+            )
+        ]
+        latest = LocationService.get_latest_sos_locations(active_ids)
+        MapService.apply_locations(
+            [
+                {
+                    "sos_id": location.sos_id,
+                    "user_id": location.user_id,
+                    "latitude": location.latitude,
+                    "longitude": location.longitude,
+                    "accuracy": location.accuracy,
+                    "timestamp": location.timestamp,
+                }
+                for location in latest.values()
+            ]
+        )
+        db.session.commit()
+
+    @staticmethod
+    def apply_locations(rows: List[dict]) -> None:
+        """
+        Move the markers of the SOS events in `rows` to their newest position.
+        Runs inside the caller's transaction, next to the location insert.
+        """
+        latest = {}
+        for row in rows:
+            sos_id = row.get("sos_id")
+            if sos_id is None:
+                continue
+            current = latest.get(sos_id)
+            if current is None or row["timestamp"] >= current["timestamp"]:
+                latest[sos_id] = row
+
+        if not latest:
+            return
+
+        version = MapService._next_version()
+        values = [
+            {
+                "sos_id": sos_id,
+                **{field: row.get(field) for field in _MARKER_FIELDS},
+                "active": True,
+                "version": version,
+            }
+            for sos_id, row in latest.items()
+        ]
+        dialect = db.session.get_bind().dialect.name
+
+        if dialect in ("sqlite", "postgresql"):
+            insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            statement = insert(MapMarker).values(values)
+            statement = statement.on_conflict_do_update(
+                index_elements=["sos_id"],
+                set_={
+                    **{field: statement.excluded[field] for field in _MARKER_FIELDS},
+                    "version": statement.excluded.version,
+                },
+                # Late writes never move a marker back or revive a resolved one
+                where=and_(
+                    MapMarker.active.is_(True),
+                    statement.excluded.timestamp >= MapMarker.timestamp,
+                ),
+            )
+            db.session.execute(statement)
+            return
+
+        for value in values:
+            marker = db.session.get(MapMarker, value["sos_id"])
+            if marker is None:
+                db.session.add(MapMarker(**value))
+            elif marker.active and value["timestamp"] >= marker.timestamp:
+                for field in _MARKER_FIELDS + ("version",):
+                    setattr(marker, field, value[field])
+
+    @staticmethod
+    def remove_marker(sos_id: int) -> None:
+        """Mark the SOS event's marker removed, inside the caller's transaction."""
+        version = MapService._next_version()
+        db.session.execute(
+            update(MapMarker)
+            .where(MapMarker.sos_id == sos_id, MapMarker.active.is_(True))
+            .values(active=False, version=version)
+        )
+
+    @staticmethod
+    def get_changes(since: Optional[int] = None) -> dict:
+        """
+        Return the markers that changed at or after cursor `since`, the
+        sos_ids of markers removed since then, and the cursor to send next
+        time. Without a usable `since` (first load, or a cursor from another
+        database) every active marker is returned with reset=True.
+        """
+        cursor = MapService._cursor()
+        changes = {"version": cursor, "reset": False, "markers": [], "removed": []}
+
+        query = (
+            db.session.query(MapMarker, SOS.sos_id, User.name)
+            .join(SOS, SOS.id == MapMarker.sos_id)
+            .join(User, User.id == MapMarker.user_id)
+        )
+        if since is None or since > cursor:
+            changes["reset"] = True
+            query = query.filter(MapMarker.active.is_(True))
+        else:
+            query = query.filter(MapMarker.version >= since)
+
+        for marker, sos_id, user_name in query.order_by(MapMarker.version):
+            if not marker.active:
+                changes["removed"].append(sos_id)
+                continue
+            changes["markers"].append(
+                {
+                    "sos_id": sos_id,
+                    "user_id": marker.user_id,
+                    "user_name": user_name,
+                    "latitude": marker.latitude,
+                    "longitude": marker.longitude,
+                    "accuracy": marker.accuracy,
+                    "timestamp": marker.timestamp.isoformat(),
+                }
+            )
+
+        return changes
+
+    @staticmethod
+    def _next_version():
+        """SQL expression for the version of markers written in this transaction."""
+        if db.session.get_bind().dialect.name == "postgresql":
+            return text("pg_current_xact_id()::text::bigint")
+        return select(
+            func.coalesce(func.max(MapMarker.version), 0) + 1
+        ).scalar_subquery()
+
+    @staticmethod
+    def _cursor() -> int:
+        """Lowest version a change not yet visible to this reader can get."""
+        if db.session.get_bind().dialect.name == "postgresql":
+            return db.session.execute(
+                text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+            ).scalar()
+        return (
+            db.session.query(func.coalesce(func.max(MapMarker.version), 0)).scalar() + 1
+        )
@@ -0,0 +1,69 @@
+from typing import Dict
+from flask import current_app
+from sqlalchemy import case, func, select, true
+from src.core.extensions import db
+from src.models.user import User
+from src.models.sos import SOS
+from src.models.complaint import Complaint
+from src.core.constants import SOSStatus, ComplaintStatus
+from src.utils.cache import TTLCache
+
+_COUNTS_KEY = "counts"
+
+metrics_cache = TTLCache(maxsize=1)
+
+
+def _count_where(condition):
+    return func.count(case((condition, 1)))
+
+
+class MetricsService:
+    @staticmethod
+    def get_counts() -> Dict[str, int]:
+        """
+        Return the user, SOS and complaint counters shown on the admin pages.
+        Results are cached for METRICS_CACHE_TTL seconds and dropped whenever
+        this process writes a user, SOS or complaint.
+        """
+        # One request recomputes while the others wait for its result; counts
+        # computed across an invalidate() are served once but not cached
+        return metrics_cache.get_or_set(
+            _COUNTS_KEY,
+            MetricsService._query_counts,
+            current_app.config["METRICS_CACHE_TTL"],
+        )
+
+    @staticmethod
+    def invalidate() -> None:
+        metrics_cache.pop(_COUNTS_KEY)
+
+    @staticmethod
+    def _query_counts() -> Dict[str, int]:
+        user_counts = select(func.count(User.id).label("total_users")).subquery()
+        sos_counts = select(
+            func.count(SOS.id).label("total_sos"),
+            _count_where(SOS.status == SOSStatus.ACTIVE.value).label("active_sos"),
+            _count_where(SOS.status == SOSStatus.RESOLVED.value).label("resolved_sos"),
+        ).subquery()
+        complaint_counts = select(
+            func.count(Complaint.id).label("total_complaints"),
+            _count_where(Complaint.status == ComplaintStatus.PENDING.value).label(
+                "pending_complaints"
+            ),
+            _count_where(Complaint.status == ComplaintStatus.UNDER_REVIEW.value).label(
+                "under_review_complaints"
+            ),
+            _count_where(Complaint.status == ComplaintStatus.RESOLVED.value).label(
+                "resolved_complaints"
+            ),
+            _count_where(Complaint.status == ComplaintStatus.CLOSED.value).label(
+                "closed_complaints"
+            ),
+        ).subquery()
+
+        row = db.session.execute(
+            select(user_counts, sos_counts, complaint_counts).select_from(
+                user_counts.join(sos_counts, true()).join(complaint_counts, true())
+            )
+        ).one()
+        return dict(row._mapping)
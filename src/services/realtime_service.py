@@ -0,0 +1,65 @@
+from typing import Optional
+from src.core.extensions import socketio
+from src.models.sos import SOS
+from src.services.sos_registry import active_sos_registry
+
+ADMINS_ROOM = "admins"
+
+
+def user_room(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def sos_room(sos_id: str) -> str:
+    return f"sos:{sos_id}"
+
+
+class RealtimeService:
+    """
+    Socket.IO fan-out for SOS events.
+
+    Every authenticated socket joins its own user room, and admin sockets
+    also join the admins room. Location updates only go to the sos:<id> room,
+    which a socket joins by sending "subscribe" for an SOS it may watch, so
+    outbound traffic grows with the number of watchers rather than with the
+    number of connected clients.
+    """
+
+    @staticmethod
+    def notify_sos_triggered(sos_data: dict, user) -> None:
+        RealtimeService._emit(
+            "sos_triggered",
+            {"sos": sos_data, "user": user.to_dict()},
+            [ADMINS_ROOM, user_room(user.id)],
+        )
+
+    @staticmethod
+    def notify_location_update(sos_id: str, payload: dict) -> None:
+        RealtimeService._emit("sos_location_update", payload, sos_room(sos_id))
+
+    @staticmethod
+    def notify_sos_resolved(sos_id: str, owner_id: int, resolved_by: int) -> None:
+        RealtimeService._emit(
+            "sos_resolved",
+            {"sos_id": sos_id, "resolved_by": resolved_by},
+            [ADMINS_ROOM, user_room(owner_id), sos_room(sos_id)],
+        )
+
+    @staticmethod
+    def _emit(event: str, payload: dict, to) -> None:
+        socketio.emit(event, payload, to=to)
+
+    @staticmethod
+    def can_watch(user, sos_id: str) -> bool:
+        if user.is_admin():
+            return True
+        return RealtimeService._get_owner_id(sos_id) == user.id
+
+    @staticmethod
+    def _get_owner_id(sos_id: str) -> Optional[int]:
+        entry = active_sos_registry.get(sos_id)
+        if entry:
+            return entry.user_id
+
+        row = SOS.query.with_entities(SOS.user_id).filter_by(sos_id=sos_id).first()
+        return row.user_id if row else None
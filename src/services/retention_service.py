@@ -0,0 +1,287 @@
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from flask import current_app
+from sqlalchemy import delete, func, or_, select, tuple_
+from src.core.extensions import db
+from src.models.location import Location
+from src.models.sos import SOS
+from src.models.job_checkpoint import JobCheckpoint
+from src.core.constants import LocationUpdateType, SOSStatus
+from src.utils.versioning import bump_versions
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+class LocationRetentionService:
+    """
+    Applies LOCATION_RETENTION_POLICIES to the locations table in short
+    batches. Every batch deletes at most `batch_size` rows and commits
+    together with its checkpoint, so the job can run alongside production
+    traffic and be stopped and restarted at any point.
+    """
+
+    @staticmethod
+    def run(
+        batch_size: int,
+        max_batches: Optional[int] = None,
+        pause: float = 0.0,
+        update_types: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Dict[str, int]]:
+        policies = current_app.config["LOCATION_RETENTION_POLICIES"]
+        update_types = list(update_types or policies.keys())
+        budget = [max_batches]
+        totals: Dict[str, Dict[str, int]] = {}
+
+        for update_type in update_types:
+            policy = policies.get(update_type)
+            if not policy:
+                continue
+
+            steps = (
+                (
+                    "expired",
+                    policy.get("max_age_days"),
+                    LocationRetentionService._expire,
+                ),
+                ("capped", policy.get("max_per_user"), LocationRetentionService._cap),
+                (
+                    "downsampled",
+                    policy.get("full_resolution_days") is not None
+                    and policy.get("downsample_seconds"),
+                    LocationRetentionService._downsample,
+                ),
+            )
+            totals[update_type] = {}
+            for rule, enabled, step in steps:
+                if not enabled:
+                    continue
+                totals[update_type][rule] = LocationRetentionService._run_step(
+                    lambda: step(update_type, policy, batch_size), budget, pause
+                )
+
+        return totals
+
+    @staticmethod
+    def _run_step(
+        step: Callable[[], Tuple[int, bool]], budget: list, pause: float
+    ) -> int:
+        deleted = 0
+        while budget[0] is None or budget[0] > 0:
+            try:
+                count, done = step()
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+
+            deleted += count
+            if budget[0] is not None:
+                budget[0] -= 1
+            if done:
+                break
+            if pause:
+                time.sleep(pause)
+        return deleted
+
+    @staticmethod
+    def _expire(update_type: str, policy: dict, batch_size: int) -> Tuple[int, bool]:
+        cutoff = datetime.utcnow() - timedelta(days=policy["max_age_days"])
+        ids = db.session.scalars(
+            LocationRetentionService._eligible(select(Location.id), update_type)
+            .where(Location.timestamp < cutoff)
+            .order_by(Location.id)
+            .limit(batch_size)
+        ).all()
+
+        LocationRetentionService._delete(ids)
+        return len(ids), len(ids) < batch_size
+
+    @staticmethod
+    def _cap(update_type: str, policy: dict, batch_size: int) -> Tuple[int, bool]:
+        """Trim the next user after the checkpoint that is over the cap."""
+        name = f"locations.cap.{update_type}"
+        cap = policy["max_per_user"]
+        after_user = (LocationRetentionService._load(name) or {}).get("user_id", 0)
+
+        user_id = db.session.scalar(
+            LocationRetentionService._eligible(select(Location.user_id), update_type)
+            .where(Location.user_id > after_user)
+            .group_by(Location.user_id)
+            .having(func.count(Location.id) > cap)
+            .order_by(Location.user_id)
+            .limit(1)
+        )
+        if user_id is None:
+            LocationRetentionService._save(name, None)
+            return 0, True
+
+        user_rows = LocationRetentionService._eligible(
+            select(Location.timestamp, Location.id), update_type
+        ).where(Location.user_id == user_id)
+        oldest_kept = db.session.execute(
+            user_rows.order_by(Location.timestamp.desc(), Location.id.desc())
+            .offset(cap - 1)
+            .limit(1)
+        ).one()
+        ids = db.session.scalars(
+            user_rows.with_only_columns(Location.id)
+            .where(
+                tuple_(Location.timestamp, Location.id)
+                < tuple_(oldest_kept.timestamp, oldest_kept.id)
+            )
+            .order_by(Location.timestamp, Location.id)
+            .limit(batch_size)
+        ).all()
+
+        LocationRetentionService._delete(ids)
+        # Stay on this user until everything over its cap is gone
+        if len(ids) < batch_size:
+            LocationRetentionService._save(name, {"user_id": user_id})
+        return len(ids), False
+
+    @staticmethod
+    def _downsample(
+        update_type: str, policy: dict, batch_size: int
+    ) -> Tuple[int, bool]:
+        """
+        Keep the first point of every downsample_seconds bucket of each track
+        (user and SOS event) and delete the rest. Rows are visited in
+        (user_id, timestamp, id) order, so a bucket's first point is always
+        the one seen first, also across batches.
+
+        A finished pass leaves a high-water mark, so the next pass only
+        visits rows that aged past full resolution since then, from the
+        start of the bucket the mark falls in, plus rows stored since (late
+        uploads) and, for SOS tracks, events resolved since. A late point in
+        a bucket thinned by an earlier pass is kept next to the one already
+        kept there.
+        """
+        name = f"locations.downsample.{update_type}"
+        interval = policy["downsample_seconds"]
+        checkpoint = LocationRetentionService._load(name) or {}
+
+        if "cutoff" not in checkpoint:
+            # Start a pass; every batch of it uses the same window
+            checkpoint["cutoff"] = (
+                datetime.utcnow() - timedelta(days=policy["full_resolution_days"])
+            ).isoformat()
+            checkpoint["started"] = datetime.utcnow().isoformat()
+            checkpoint["max_id"] = db.session.scalar(select(func.max(Location.id)))
+        cutoff = datetime.fromisoformat(checkpoint["cutoff"])
+
+        query = LocationRetentionService._eligible(
+            select(Location.id, Location.user_id, Location.sos_id, Location.timestamp),
+            update_type,
+        ).where(Location.timestamp < cutoff)
+        if "through" in checkpoint:
+            through = datetime.fromisoformat(checkpoint["through"])
+            bucket_start = _EPOCH + timedelta(
+                seconds=(through - _EPOCH).total_seconds() // interval * interval
+            )
+            unvisited = [
+                Location.timestamp >= bucket_start,
+                Location.id > (checkpoint["through_id"] or 0),
+            ]
+            if update_type == LocationUpdateType.SOS.value:
+                unvisited.append(
+                    Location.sos_id.in_(
+                        select(SOS.id).where(
+                            SOS.end_time
+                            >= datetime.fromisoformat(checkpoint["through_started"])
+                        )
+                    )
+                )
+            query = query.where(or_(*unvisited))
+
+        previous = None
+        if "id" in checkpoint:
+            query = query.where(
+                tuple_(Location.user_id, Location.timestamp, Location.id)
+                > tuple_(
+                    checkpoint["user_id"],
+                    datetime.fromisoformat(checkpoint["timestamp"]),
+                    checkpoint["id"],
+                )
+            )
+            previous = tuple(checkpoint["bucket"])
+
+        rows = db.session.execute(
+            query.order_by(Location.user_id, Location.timestamp, Location.id).limit(
+                batch_size
+            )
+        ).all()
+
+        ids = []
+        for row in rows:
+            seconds = (row.timestamp - _EPOCH).total_seconds()
+            bucket = (row.user_id, row.sos_id, int(seconds // interval))
+            if bucket == previous:
+                ids.append(row.id)
+            previous = bucket
+
+        LocationRetentionService._delete(ids)
+
+        done = len(rows) < batch_size
+        if done:
+            # The next pass picks up from where this one's window ended
+            LocationRetentionService._save(
+                name,
+                {
+                    "through": checkpoint["cutoff"],
+                    "through_id": checkpoint["max_id"],
+                    "through_started": checkpoint["started"],
+                },
+            )
+        else:
+            last = rows[-1]
+            checkpoint.update(
+                user_id=last.user_id,
+                timestamp=last.timestamp.isoformat(),
+                id=last.id,
+                bucket=list(previous),
+            )
+            LocationRetentionService._save(name, checkpoint)
+        return len(ids), done
+
+    @staticmethod
+    def _eligible(query, update_type: str):
+        query = query.where(Location.update_type == update_type)
+        if update_type == LocationUpdateType.SOS.value:
+            # Tracks of SOS events still in progress are kept in full
+            query = query.where(
+                Location.sos_id.in_(
+                    select(SOS.id).where(SOS.status != SOSStatus.ACTIVE.value)
+                )
+            )
+        return query
+
+    @staticmethod
+    def _delete(ids) -> None:
+        if ids:
+            # Pruned points change the tracks served with their SOS events
+            bump_versions(
+                SOS,
+                db.session.scalars(
+                    select(Location.sos_id)
+                    .where(Location.id.in_(ids), Location.sos_id.isnot(None))
+                    .distinct()
+                ),
+            )
+            db.session.execute(delete(Location).where(Location.id.in_(ids)))
+
+    @staticmethod
+    def _load(name: str) -> Optional[dict]:
+        checkpoint = db.session.get(JobCheckpoint, name)
+        if checkpoint is None or not checkpoint.position:
+            return None
+        return json.loads(checkpoint.position)
+
+    @staticmethod
+    def _save(name: str, position: Optional[dict]) -> None:
+        checkpoint = db.session.get(JobCheckpoint, name)
+        if checkpoint is None:
+            checkpoint = JobCheckpoint(name=name)
+            db.session.add(checkpoint)
+        checkpoint.position = json.dumps(position) if position else None
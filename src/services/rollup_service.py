@@ -0,0 +1,172 @@
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func, text
+from sqlalchemy.dialects import postgresql, sqlite
+from src.core.extensions import db
+from src.models.rollup import ActivityRollup
+from src.models.sos import SOS
+from src.models.complaint import Complaint
+from src.core.constants import ActivityType, RollupGranularity
+
+
+def bucket_start(timestamp: datetime, granularity: str) -> datetime:
+    if granularity == RollupGranularity.HOUR.value:
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class RollupService:
+    @staticmethod
+    def record(
+        kind: str,
+        timestamp: datetime,
+        new_status: str,
+        old_status: Optional[str] = None,
+    ) -> None:
+        """
+        Count an event created at `timestamp` under `new_status`, moving it out
+        of `old_status` when it is a status change. Runs inside the caller's
+        transaction so the rollups commit or roll back with the event itself.
+        """
+        if new_status == old_status:
+            return
+
+        rows = []
+        for granularity in RollupGranularity:
+            start = bucket_start(timestamp, granularity.value)
+            rows.append((granularity.value, start, new_status, 1))
+            if old_status:
+                rows.append((granularity.value, start, old_status, -1))
+        RollupService._increment(kind, rows)
+
+    @staticmethod
+    def get_trends(
+        kind: str, since: datetime, granularity: str = RollupGranularity.DAY.value
+    ) -> List[Dict]:
+        rows = (
+            db.session.query(
+                ActivityRollup.bucket_start, func.sum(ActivityRollup.count)
+            )
+            .filter(
+                ActivityRollup.kind == kind,
+                ActivityRollup.granularity == granularity,
+                ActivityRollup.bucket_start >= bucket_start(since, granularity),
+            )
+            .group_by(ActivityRollup.bucket_start)
+            .order_by(ActivityRollup.bucket_start)
+            .all()
+        )
+
+        return [
+            {"bucket_start": start, "count": int(count)}
+            for start, count in rows
+            if count
+        ]
+
+    @staticmethod
+    def get_status_totals(kind: str) -> Dict[str, int]:
+        rows = (
+            db.session.query(ActivityRollup.status, func.sum(ActivityRollup.count))
+            .filter(
+                ActivityRollup.kind == kind,
+                ActivityRollup.granularity == RollupGranularity.DAY.value,
+            )
+            .group_by(ActivityRollup.status)
+            .all()
+        )
+        return {status: int(count) for status, count in rows if count}
+
+    @staticmethod
+    def backfill(batch_size: int = 10000) -> Dict[str, int]:
+        """
+        Rebuild every rollup from the raw sos and complaints tables.
+
+        Runs as one transaction that holds the rollup table against writers,
+        so a record() from an event committed after the source tables were
+        read waits and applies its increment to the rebuilt rows instead of
+        being lost when they replace the old ones.
+        """
+        sources = {
+            ActivityType.SOS.value: (SOS.start_time, SOS.status),
+            ActivityType.COMPLAINT.value: (Complaint.timestamp, Complaint.status),
+        }
+        totals = {}
+
+        if db.session.get_bind().dialect.name == "postgresql":
+            # Conflicts with the row lock every upsert takes; reads still run
+            db.session.execute(
+                text(
+                    f"LOCK TABLE {ActivityRollup.__tablename__} "
+                    "IN SHARE ROW EXCLUSIVE MODE"
+                )
+            )
+        # On SQLite the delete takes the database write lock, which does the same
+        db.session.query(ActivityRollup).delete()
+
+        for kind, (timestamp_column, status_column) in sources.items():
+            counts = Counter()
+            events = 0
+            rows = db.session.query(timestamp_column, status_column).yield_per(
+                batch_size
+            )
+            for timestamp, status in rows:
+                events += 1
+                for granularity in RollupGranularity:
+                    start = bucket_start(timestamp, granularity.value)
+                    counts[(granularity.value, start, status)] += 1
+
+            db.session.bulk_insert_mappings(
+                ActivityRollup,
+                [
+                    {
+                        "kind": kind,
+                        "granularity": granularity,
+                        "bucket_start": start,
+                        "status": status,
+                        "count": count,
+                    }
+                    for (granularity, start, status), count in counts.items()
+                ],
+            )
+            totals[kind] = events
+
+        db.session.commit()
+        return totals
+
+    @staticmethod
+    def _increment(kind: str, rows: List[Tuple[str, datetime, str, int]]) -> None:
+        """Apply (granularity, bucket_start, status, delta) rows in one upsert."""
+        values = [
+            {
+                "kind": kind,
+                "granularity": granularity,
+                "bucket_start": start,
+                "status": status,
+                "count": delta,
+            }
+            for granularity, start, status, delta in rows
+        ]
+        dialect = db.session.get_bind().dialect.name
+
+        if dialect in ("sqlite", "postgresql"):
+            insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            statement = insert(ActivityRollup).values(values)
+            statement = statement.on_conflict_do_update(
+                index_elements=["kind", "granularity", "bucket_start", "status"],
+                set_={"count": ActivityRollup.count + statement.excluded.count},
+            )
+            db.session.execute(statement)
+            return
+
+        for row in values:
+            rollup = ActivityRollup.query.filter_by(
+                kind=kind,
+                granularity=row["granularity"],
+                bucket_start=row["bucket_start"],
+                status=row["status"],
+            ).first()
+            if rollup:
+                rollup.count += row["count"]
+            else:
+                db.session.add(ActivityRollup(**row))
@@ -0,0 +1,181 @@
+import re
+from typing import List, Optional, Tuple
+from sqlalchemy import Float, Integer, func, inspect, literal_column, or_, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import joinedload
+from src.core.extensions import db
+from src.models.complaint import Complaint
+
+BACKEND_FTS5 = "fts5"
+BACKEND_TSVECTOR = "tsvector"
+BACKEND_LIKE = "like"
+
+SQLITE_FTS_TABLE = "complaints_fts"
+
+SQLITE_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5(
+        title, description,
+        content='complaints', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS complaints_fts_insert AFTER INSERT ON complaints
+    BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS complaints_fts_delete AFTER DELETE ON complaints
+    BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS complaints_fts_update
+    AFTER UPDATE OF title, description ON complaints
+    BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+# The generated column keeps itself current on insert and update (PostgreSQL 12+)
+POSTGRES_DDL = [
+    """
+    ALTER TABLE complaints ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_complaints_search_vector
+    ON complaints USING GIN (search_vector)
+    """,
+]
+
+_backends = {}
+
+
+class ComplaintSearchService:
+    @staticmethod
+    def install() -> str:
+        """
+        Create the full-text index for complaints if it does not exist yet.
+        Returns the backend searches will use.
+        """
+        engine = db.engine
+        dialect = engine.dialect.name
+
+        if dialect == "sqlite":
+            existed = inspect(engine).has_table(SQLITE_FTS_TABLE)
+            try:
+                with engine.begin() as connection:
+                    for statement in SQLITE_DDL:
+                        connection.exec_driver_sql(statement)
+                    if not existed:
+                        # Index the complaints that predate the FTS table
+                        connection.exec_driver_sql(
+                            f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) "
+                            "VALUES ('rebuild')"
+                        )
+                backend = BACKEND_FTS5
+            except OperationalError:
+                # SQLite build without FTS5
+                backend = BACKEND_LIKE
+        elif dialect == "postgresql":
+            with engine.begin() as connection:
+                for statement in POSTGRES_DDL:
+                    connection.exec_driver_sql(statement)
+            backend = BACKEND_TSVECTOR
+        else:
+            backend = BACKEND_LIKE
+
+        _backends[engine.url] = backend
+        return backend
+
+    @staticmethod
+    def search(
+        query: str, user_id: Optional[int] = None, limit: int = 50, offset: int = 0
+    ) -> Tuple[List[Complaint], bool]:
+        """
+        Rank complaints matching every term of `query`, treating each term as
+        a prefix. Returns one page and whether more results follow it.
+        """
+        terms = re.findall(r"\w+", query.lower())
+        if not terms:
+            return [], False
+
+        backend = ComplaintSearchService._backend()
+        base_query = Complaint.query.options(joinedload(Complaint.user))
+
+        if backend == BACKEND_FTS5:
+            match = " ".join(f'"{term}"*' for term in terms)
+            ranked = (
+                text(
+                    f"SELECT rowid AS id, bm25({SQLITE_FTS_TABLE}, 10.0, 1.0) AS rank "
+                    f"FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH :match"
+                )
+                .bindparams(match=match)
+                .columns(id=Integer, rank=Float)
+                .subquery()
+            )
+            # bm25() is lower for better matches
+            base_query = base_query.join(ranked, Complaint.id == ranked.c.id).order_by(
+                ranked.c.rank.asc(), Complaint.id.desc()
+            )
+        elif backend == BACKEND_TSVECTOR:
+            tsquery = func.to_tsquery(
+                "simple", " & ".join(f"{term}:*" for term in terms)
+            )
+            vector = literal_column("complaints.search_vector")
+            base_query = base_query.filter(vector.op("@@")(tsquery)).order_by(
+                func.ts_rank_cd(vector, tsquery).desc(), Complaint.id.desc()
+            )
+        else:
+            for term in terms:
+                pattern = f"%{term}%"
+                base_query = base_query.filter(
+                    or_(
+                        Complaint.title.ilike(pattern),
+                        Complaint.description.ilike(pattern),
+                    )
+                )
+            base_query = base_query.order_by(
+                Complaint.timestamp.desc(), Complaint.id.desc()
+            )
+
+        if user_id:
+            base_query = base_query.filter(Complaint.user_id == user_id)
+
+        complaints = base_query.limit(limit + 1).offset(offset).all()
+        return complaints[:limit], len(complaints) > limit
+
+    @staticmethod
+    def _backend() -> str:
+        engine = db.engine
+        backend = _backends.get(engine.url)
+        if backend:
+            return backend
+
+        dialect = engine.dialect.name
+        inspector = inspect(engine)
+        if dialect == "sqlite" and inspector.has_table(SQLITE_FTS_TABLE):
+            backend = BACKEND_FTS5
+        elif dialect == "postgresql" and any(
+            column["name"] == "search_vector"
+            for column in inspector.get_columns("complaints")
+        ):
+            backend = BACKEND_TSVECTOR
+        else:
+            backend = BACKEND_LIKE
+
+        _backends[engine.url] = backend
+        return backend
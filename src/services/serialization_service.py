@@ -0,0 +1,54 @@
+from typing import List, Optional
+from sqlalchemy import inspect
+from sqlalchemy.orm.attributes import set_committed_value
+from src.models.sos import SOS
+from src.models.complaint import Complaint
+from src.models.user import User
+from src.services.location_service import LocationService
+from src.services.track_service import TrackOptions, TrackService
+
+
+class SerializationService:
+    @staticmethod
+    def sos_events_to_dict(
+        sos_events: List[SOS],
+        include_locations: bool = False,
+        track: Optional[TrackOptions] = None,
+    ) -> List[dict]:
+        SerializationService._preload_users(sos_events)
+        sos_ids = [sos.id for sos in sos_events]
+
+        if include_locations:
+            track = track or TrackOptions()
+            histories = LocationService.get_sos_location_histories(
+                sos_ids, track.since, track.until
+            )
+            if track.simplify:
+                histories = {
+                    sos_id: TrackService.simplify(history, track)
+                    for sos_id, history in histories.items()
+                }
+            return [
+                sos.to_dict(include_locations=True, location_histories=histories)
+                for sos in sos_events
+            ]
+
+        latest_locations = LocationService.get_latest_sos_locations(sos_ids)
+        return [sos.to_dict(latest_locations=latest_locations) for sos in sos_events]
+
+    @staticmethod
+    def complaints_to_dict(complaints: List[Complaint]) -> List[dict]:
+        SerializationService._preload_users(complaints)
+        return [complaint.to_dict() for complaint in complaints]
+
+    @staticmethod
+    def _preload_users(rows: list) -> None:
+        # Load every owner the rows have not loaded yet in one IN query
+        pending = [row for row in rows if "user" in inspect(row).unloaded]
+        if not pending:
+            return
+
+        user_ids = {row.user_id for row in pending}
+        users = {user.id: user for user in User.query.filter(User.id.in_(user_ids))}
+        for row in pending:
+            set_committed_value(row, "user", users.get(row.user_id))
@@ -0,0 +1,175 @@
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from src.core.extensions import db
+from src.models.sos import SOS
+from src.models.user import User
+from src.core.constants import SOSStatus
+
+
+class ActiveSOSEntry:
+    __slots__ = ("id", "sos_id", "user_id", "user_uuid", "user_name", "start_time")
+
+    def __init__(
+        self,
+        id: int,
+        sos_id: str,
+        user_id: int,
+        user_uuid: str,
+        user_name: str,
+        start_time: datetime,
+    ):
+        self.id = id
+        self.sos_id = sos_id
+        self.user_id = user_id
+        self.user_uuid = user_uuid
+        self.user_name = user_name
+        self.start_time = start_time
+
+    def get_duration_seconds(self) -> int:
+        return int((datetime.utcnow() - self.start_time).total_seconds())
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "sos_id": self.sos_id,
+            "user_id": self.user_uuid,
+            "user_name": self.user_name,
+            "status": SOSStatus.ACTIVE.value,
+            "start_time": self.start_time.isoformat() if self.start_time else None,
+            "duration_seconds": self.get_duration_seconds(),
+        }
+
+
+class ActiveSOSRegistry:
+    """
+    In-process index of active SOS events keyed by sos_id and user id.
+
+    create_sos and resolve_sos keep it current for their own process. Every
+    ACTIVE_SOS_REGISTRY_TTL seconds it is rebuilt from the database so that
+    changes made by other workers show up within that window; a TTL of 0
+    disables the periodic rebuild. One thread rebuilds at a time; adds and
+    removes made while its query runs are replayed onto the new snapshot
+    before it is swapped in, so the rebuild cannot undo them.
+    """
+
+    def __init__(self):
+        self.ttl = 5
+        self._by_sos_id: Dict[str, ActiveSOSEntry] = {}
+        self._by_user_id: Dict[int, ActiveSOSEntry] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+        # Changes made during a rebuild, as ("add", entry) / ("remove", sos_id)
+        self._journal: Optional[List[Tuple[str, object]]] = None
+
+    def init_app(self, app) -> None:
+        self.ttl = app.config["ACTIVE_SOS_REGISTRY_TTL"]
+        app.extensions["active_sos_registry"] = self
+
+    def rebuild(self) -> None:
+        with self._rebuild_lock:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        with self._lock:
+            self._journal = []
+
+        try:
+            rows = self._load()
+        except Exception:
+            with self._lock:
+                self._journal = None
+            raise
+
+        by_sos_id = {}
+        by_user_id = {}
+        for id, sos_id, user_id, start_time, user in rows:
+            entry = ActiveSOSEntry(
+                id, sos_id, user_id, user.user_id, user.name, start_time
+            )
+            by_sos_id[sos_id] = entry
+            by_user_id[user_id] = entry
+
+        with self._lock:
+            for change, value in self._journal:
+                if change == "add":
+                    self._put(by_sos_id, by_user_id, value)
+                else:
+                    self._pop(by_sos_id, by_user_id, value)
+            self._journal = None
+            self._by_sos_id = by_sos_id
+            self._by_user_id = by_user_id
+            self._loaded_at = time.monotonic()
+
+    @staticmethod
+    def _load():
+        return (
+            db.session.query(SOS.id, SOS.sos_id, SOS.user_id, SOS.start_time, User)
+            .join(User, SOS.user_id == User.id)
+            .filter(SOS.status == SOSStatus.ACTIVE.value)
+            .all()
+        )
+
+    def add(self, sos: SOS) -> ActiveSOSEntry:
+        entry = ActiveSOSEntry(
+            sos.id,
+            sos.sos_id,
+            sos.user_id,
+            sos.user.user_id,
+            sos.user.name,
+            sos.start_time,
+        )
+        with self._lock:
+            self._put(self._by_sos_id, self._by_user_id, entry)
+            if self._journal is not None:
+                self._journal.append(("add", entry))
+        return entry
+
+    def remove(self, sos_id: str) -> None:
+        with self._lock:
+            self._pop(self._by_sos_id, self._by_user_id, sos_id)
+            if self._journal is not None:
+                self._journal.append(("remove", sos_id))
+
+    def get(self, sos_id: str) -> Optional[ActiveSOSEntry]:
+        self._ensure_fresh()
+        return self._by_sos_id.get(sos_id)
+
+    def get_for_user(self, user_id: int) -> Optional[ActiveSOSEntry]:
+        self._ensure_fresh()
+        return self._by_user_id.get(user_id)
+
+    def all(self) -> List[ActiveSOSEntry]:
+        self._ensure_fresh()
+        return sorted(
+            self._by_sos_id.values(), key=lambda entry: entry.start_time, reverse=True
+        )
+
+    def _is_stale(self) -> bool:
+        return self._loaded_at is None or bool(
+            self.ttl and time.monotonic() - self._loaded_at > self.ttl
+        )
+
+    def _ensure_fresh(self) -> None:
+        if not self._is_stale():
+            return
+        with self._rebuild_lock:
+            # Threads that waited here find the snapshot another one just built
+            if self._is_stale():
+                self._rebuild()
+
+    @staticmethod
+    def _put(by_sos_id: dict, by_user_id: dict, entry: ActiveSOSEntry) -> None:
+        by_sos_id[entry.sos_id] = entry
+        by_user_id[entry.user_id] = entry
+
+    @staticmethod
+    def _pop(by_sos_id: dict, by_user_id: dict, sos_id: str) -> None:
+        entry = by_sos_id.pop(sos_id, None)
+        if entry and by_user_id.get(entry.user_id) is entry:
+            del by_user_id[entry.user_id]
+
+
+active_sos_registry = ActiveSOSRegistry()
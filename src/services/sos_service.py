@@ -1,11 +1,25 @@
 from datetime import datetime
 from typing import Optional, List, Tuple
 from sqlalchemy import and_, or_
+from sqlalchemy.orm import joinedload
 from src.core.extensions import db
 from src.models.sos import SOS
 from src.models.location import Location
 from src.models.user import User
-from src.core.constants import SOSStatus, LocationUpdateType
+from src.services.location_service import LocationService
+from src.services.location_writer import location_writer
+from src.services.sos_registry import active_sos_registry, ActiveSOSEntry
+from src.core.constants import (
+    SOSStatus,
+    LocationUpdateType,
+    MAX_LOCATION_BATCH_SIZE,
+    DEFAULT_PAGE_SIZE,
+    ActivityType,
+)
+from src.services.rollup_service import RollupService
+from src.services.metrics_service import MetricsService
+from src.services.map_service import MapService
+from src.utils.pagination import keyset_paginate
 
 
 class SOSService:
@@ -31,8 +45,24 @@ class SOSService:
                 location = Location.from_dict(initial_location, user_id, sos.id)
                 location.update_type = LocationUpdateType.SOS.value
                 db.session.add(location)
+                db.session.flush()
+                MapService.apply_locations(
+                    [
+                        {
+                            "sos_id": sos.id,
+                            "user_id": user_id,
+                            "latitude": location.latitude,
+                            "longitude": location.longitude,
+                            "accuracy": location.accuracy,
+                            "timestamp": location.timestamp,
+                        }
+                    ]
+                )
 
+            RollupService.record(ActivityType.SOS.value, sos.start_time, sos.status)
             db.session.commit()
+            active_sos_registry.add(sos)
+            MetricsService.invalidate()
             return True, "SOS created successfully", sos
         except Exception as e:
             db.session.rollback()
@@ -40,23 +70,59 @@ class SOSService:
 
     @staticmethod
     def add_location_update(sos_id: str, location_data: dict) -> Tuple[bool, str]:
-        sos = SOS.query.filter_by(sos_id=sos_id).first()
+        sos, error = SOSService._get_active_entry(sos_id)
         if not sos:
-            return False, "SOS not found"
+            return False, error
 
-        if sos.status != SOSStatus.ACTIVE.value:
-            return False, "SOS is not active"
+        row, error = LocationService.build_location_row(
+            location_data, sos.user_id, sos.id, LocationUpdateType.SOS.value
+        )
+        if error:
+            return False, error
 
-        location = Location.from_dict(location_data, sos.user_id, sos.id)
-        location.update_type = LocationUpdateType.SOS.value
+        success, message = location_writer.write([row])
+        if not success:
+            return False, message
 
-        try:
-            db.session.add(location)
-            db.session.commit()
-            return True, "Location updated"
-        except Exception as e:
-            db.session.rollback()
-            return False, f"Failed to update location: {str(e)}"
+        return True, "Location updated"
+
+    @staticmethod
+    def add_location_updates(
+        sos_id: str, locations_data: List[dict], user_id: Optional[int] = None
+    ) -> Tuple[bool, str, List[dict]]:
+        if not isinstance(locations_data, list) or not locations_data:
+            return False, "At least one location is required", []
+
+        if len(locations_data) > MAX_LOCATION_BATCH_SIZE:
+            return (
+                False,
+                f"A batch may contain at most {MAX_LOCATION_BATCH_SIZE} locations",
+                [],
+            )
+
+        sos, error = SOSService._get_active_entry(sos_id)
+        if not sos:
+            return False, error, []
+
+        if user_id is not None and sos.user_id != user_id:
+            return False, "Unauthorized", []
+
+        rows = []
+        for index, location_data in enumerate(locations_data):
+            row, error = LocationService.build_location_row(
+                location_data, sos.user_id, sos.id, LocationUpdateType.SOS.value
+            )
+            if error:
+                return False, f"Location {index}: {error}", []
+            rows.append(row)
+
+        rows.sort(key=lambda row: row["timestamp"])
+
+        success, message = location_writer.write(rows)
+        if not success:
+            return False, message, []
+
+        return True, f"{len(rows)} locations updated", rows
 
     @staticmethod
     def resolve_sos(
@@ -69,19 +135,37 @@ class SOSService:
         if sos.status == SOSStatus.RESOLVED.value:
             return False, "SOS already resolved"
 
+        old_status = sos.status
         sos.resolve(resolved_by_id, notes)
 
         try:
+            RollupService.record(
+                ActivityType.SOS.value, sos.start_time, sos.status, old_status
+            )
+            MapService.remove_marker(sos.id)
             db.session.commit()
+            active_sos_registry.remove(sos_id)
+            MetricsService.invalidate()
             return True, "SOS resolved successfully"
         except Exception as e:
             db.session.rollback()
             return False, f"Failed to resolve SOS: {str(e)}"
 
     @staticmethod
-    def get_active_sos_events() -> List[SOS]:
+    def get_active_sos_snapshots() -> List[ActiveSOSEntry]:
+        return active_sos_registry.all()
+
+    @staticmethod
+    def get_user_active_sos(user_id: int) -> Optional[ActiveSOSEntry]:
+        return active_sos_registry.get_for_user(user_id)
+
+    @staticmethod
+    def get_sos_events_by_ids(ids: List[int]) -> List[SOS]:
+        if not ids:
+            return []
         return (
-            SOS.query.filter_by(status=SOSStatus.ACTIVE.value)
+            SOS.query.options(joinedload(SOS.user))
+            .filter(SOS.id.in_(ids))
             .order_by(SOS.start_time.desc())
             .all()
         )
@@ -100,16 +184,76 @@ class SOSService:
         return SOS.query.filter_by(sos_id=sos_id).first()
 
     @staticmethod
-    def get_all_sos_events(status: Optional[str] = None, limit: int = 100) -> List[SOS]:
-        query = SOS.query
+    def get_sos_version(sos_id: str):
+        """
+        Return (id, user_id, status, version, updated_at) without loading
+        the SOS.
+        """
+        return (
+            SOS.query.with_entities(
+                SOS.id, SOS.user_id, SOS.status, SOS.version, SOS.updated_at
+            )
+            .filter_by(sos_id=sos_id)
+            .first()
+        )
+
+    @staticmethod
+    def _get_active_entry(sos_id: str) -> Tuple[Optional[ActiveSOSEntry], str]:
+        entry = active_sos_registry.get(sos_id)
+        if entry:
+            return entry, ""
+
+        # Not known to this process yet, e.g. triggered through another worker
+        sos = SOS.query.filter_by(sos_id=sos_id).first()
+        if not sos:
+            return None, "SOS not found"
+
+        if sos.status != SOSStatus.ACTIVE.value:
+            return None, "SOS is not active"
+
+        return active_sos_registry.add(sos), ""
+
+    @staticmethod
+    def get_sos_page(
+        user_id: Optional[int] = None,
+        status: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> Tuple[List[SOS], Optional[str]]:
+        query = SOSService._filter_page(
+            SOS.query.options(joinedload(SOS.user)), user_id, status
+        )
+        return keyset_paginate(query, SOS.start_time, SOS.id, cursor, limit)
+
+    @staticmethod
+    def get_sos_page_versions(
+        user_id: Optional[int] = None,
+        status: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> Tuple[list, Optional[str]]:
+        """The (id, status, version) of every row get_sos_page would return."""
+        query = SOSService._filter_page(
+            SOS.query.with_entities(SOS.id, SOS.start_time, SOS.status, SOS.version),
+            user_id,
+            status,
+        )
+        return keyset_paginate(query, SOS.start_time, SOS.id, cursor, limit)
+
+    @staticmethod
+    def _filter_page(query, user_id: Optional[int], status: Optional[str]):
+        if user_id:
+            query = query.filter_by(user_id=user_id)
         if status:
             query = query.filter_by(status=status)
-        return query.order_by(SOS.start_time.desc()).limit(limit).all()
+        return query
 
     @staticmethod
     def get_sos_statistics() -> dict:
-        total = SOS.query.count()
-        active = SOS.query.filter_by(status=SOSStatus.ACTIVE.value).count()
-        resolved = SOS.query.filter_by(status=SOSStatus.RESOLVED.value).count()
+        counts = MetricsService.get_counts()
 
-        return {"total": total, "active": active, "resolved": resolved}
+        return {
+            "total": counts["total_sos"],
+            "active": counts["active_sos"],
+            "resolved": counts["resolved_sos"],
+        }
@@ -0,0 +1,78 @@
+from datetime import datetime
+from typing import List, Optional
+from src.models.location import Location
+from src.services.location_service import parse_timestamp
+from src.core.constants import DEFAULT_TRACK_TOLERANCE_METERS, MAX_TRACK_POINTS
+from src.utils.geometry import simplify_track
+
+_TRUE_VALUES = ("1", "true", "yes")
+
+
+class TrackOptions:
+    """
+    How an SOS location history is returned: an optional time window, and
+    optional simplification to within `tolerance` meters of the recorded
+    path and at most `max_points` points.
+    """
+
+    __slots__ = ("since", "until", "tolerance", "max_points")
+
+    def __init__(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        tolerance: Optional[float] = None,
+        max_points: Optional[int] = None,
+    ):
+        self.since = since
+        self.until = until
+        self.tolerance = tolerance
+        self.max_points = max_points
+
+    @property
+    def simplify(self) -> bool:
+        return self.tolerance is not None or self.max_points is not None
+
+    @staticmethod
+    def from_args(args) -> "TrackOptions":
+        """
+        Build options from request arguments: since, until, simplify,
+        tolerance (meters) and max_points. Raises ValueError on bad input.
+        """
+        options = TrackOptions()
+
+        for name in ("since", "until"):
+            value = args.get(name)
+            if value:
+                setattr(options, name, parse_timestamp(value))
+
+        tolerance = args.get("tolerance", type=float)
+        max_points = args.get("max_points", type=int)
+        if args.get("simplify", "").lower() in _TRUE_VALUES:
+            tolerance = (
+                DEFAULT_TRACK_TOLERANCE_METERS if tolerance is None else tolerance
+            )
+            max_points = MAX_TRACK_POINTS if max_points is None else max_points
+
+        if tolerance is not None and tolerance < 0:
+            raise ValueError("Tolerance must not be negative")
+        if max_points is not None and max_points < 2:
+            raise ValueError("max_points must be at least 2")
+
+        options.tolerance = tolerance
+        options.max_points = max_points
+        return options
+
+
+class TrackService:
+    @staticmethod
+    def simplify(locations: List[Location], options: TrackOptions) -> List[Location]:
+        if not options.simplify or len(locations) <= 2:
+            return locations
+
+        kept = simplify_track(
+            [(location.latitude, location.longitude) for location in locations],
+            options.tolerance or 0.0,
+            options.max_points,
+        )
+        return [locations[i] for i in kept]
@@ -0,0 +1,93 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded cache whose entries expire after `ttl` seconds.
+    The least recently used entry is evicted once `maxsize` is reached.
+    get_or_set() runs one factory per missing key at a time; threads that
+    miss the same key meanwhile wait for its result.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        # key -> [lock, threads using it], for keys a factory is computing
+        self._flights: Dict[Hashable, list] = {}
+        # Bumped by pop() and clear(), so a value computed across an
+        # invalidation is returned but not stored
+        self._invalidations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                return default
+
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def get_or_set(
+        self, key: Hashable, factory: Callable[[], Any], ttl: Optional[float] = None
+    ) -> Any:
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            flight = self._flights.setdefault(key, [threading.Lock(), 0])
+            flight[1] += 1
+        try:
+            with flight[0]:
+                # Filled in by the thread that held the lock before us
+                value = self.get(key, _MISSING)
+                if value is not _MISSING:
+                    return value
+
+                invalidations = self._invalidations
+                value = factory()
+                with self._lock:
+                    if self._invalidations == invalidations:
+                        self._store(key, value, ttl)
+                return value
+        finally:
+            with self._lock:
+                flight[1] -= 1
+                if not flight[1]:
+                    del self._flights[key]
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._invalidations += 1
+
+    def _store(self, key: Hashable, value: Any, ttl: Optional[float]) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,95 @@
+import math
+from typing import List, Optional, Tuple
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+PRECISION = 12
+
+
+def encode(latitude: float, longitude: float, precision: int = PRECISION) -> str:
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+
+    while len(chars) < precision:
+        if even:
+            mid = (lon_range[0] + lon_range[1]) / 2
+            if longitude >= mid:
+                value = (value << 1) | 1
+                lon_range[0] = mid
+            else:
+                value <<= 1
+                lon_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                value = (value << 1) | 1
+                lat_range[0] = mid
+            else:
+                value <<= 1
+                lat_range[1] = mid
+
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = 0
+            value = 0
+
+    return "".join(chars)
+
+
+def prefix_end(cell: str) -> Optional[str]:
+    """
+    Return the first hash after every hash that starts with `cell`, or None
+    when there is none (an empty cell, or one of only "z"s). Built from
+    geohash characters alone, whose order is the same under byte-wise and
+    locale collations, so [cell, prefix_end(cell)) is a safe index range on
+    any database.
+    """
+    stripped = cell.rstrip(BASE32[-1])
+    if not stripped:
+        return None
+    return stripped[:-1] + BASE32[BASE32.index(stripped[-1]) + 1]
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """Return the (latitude, longitude) size in degrees of a cell."""
+    lon_bits = math.ceil(precision * 5 / 2)
+    lat_bits = precision * 5 // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def covering_cells(
+    min_lat: float,
+    min_lon: float,
+    max_lat: float,
+    max_lon: float,
+    max_cells: int = 32,
+) -> List[str]:
+    """
+    Return the geohash cells of the finest precision that covers the box
+    with at most `max_cells` cells. The box must not cross the antimeridian.
+    """
+    for precision in range(PRECISION, 0, -1):
+        lat_size, lon_size = cell_size(precision)
+        rows, cols = round(180 / lat_size), round(360 / lon_size)
+        first_row = max(math.floor((min_lat + 90) / lat_size), 0)
+        last_row = min(math.floor((max_lat + 90) / lat_size), rows - 1)
+        first_col = max(math.floor((min_lon + 180) / lon_size), 0)
+        last_col = min(math.floor((max_lon + 180) / lon_size), cols - 1)
+
+        if (last_row - first_row + 1) * (last_col - first_col + 1) > max_cells:
+            continue
+
+        cells = set()
+        for row in range(first_row, last_row + 1):
+            lat = -90 + (row + 0.5) * lat_size
+            for col in range(first_col, last_col + 1):
+                lon = -180 + (col + 0.5) * lon_size
+                cells.add(encode(lat, lon, precision))
+        return sorted(cells)
+
+    return [""]
@@ -0,0 +1,183 @@
+import heapq
+import math
+from typing import List, Optional, Sequence, Tuple
+
+EARTH_RADIUS_METERS = 6371008.8
+
+Point = Tuple[float, float]
+
+
+def project(points: Sequence[Point]) -> List[Point]:
+    """
+    Project (latitude, longitude) pairs onto a local plane in meters. The
+    equirectangular approximation is accurate to well under a meter over
+    the extent of a single track.
+    """
+    if not points:
+        return []
+
+    mean_lat = math.radians(sum(lat for lat, _ in points) / len(points))
+    scale_x = EARTH_RADIUS_METERS * math.cos(mean_lat)
+    return [
+        (math.radians(lon) * scale_x, math.radians(lat) * EARTH_RADIUS_METERS)
+        for lat, lon in points
+    ]
+
+
+def haversine_meters(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = (
+        math.sin(d_phi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_METERS * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_boxes(
+    latitude: float, longitude: float, radius: float
+) -> List[Tuple[float, float, float, float]]:
+    """
+    Return (min_lat, min_lon, max_lat, max_lon) boxes covering the circle of
+    `radius` meters, split in two where it crosses the antimeridian.
+    """
+    d_lat = math.degrees(radius / EARTH_RADIUS_METERS)
+    min_lat, max_lat = latitude - d_lat, latitude + d_lat
+    if min_lat <= -90 or max_lat >= 90:
+        return [(max(min_lat, -90.0), -180.0, min(max_lat, 90.0), 180.0)]
+
+    d_lon = math.degrees(
+        radius / (EARTH_RADIUS_METERS * math.cos(math.radians(latitude)))
+    )
+    if d_lon >= 180:
+        return [(min_lat, -180.0, max_lat, 180.0)]
+
+    min_lon, max_lon = longitude - d_lon, longitude + d_lon
+    if min_lon < -180:
+        return [
+            (min_lat, min_lon + 360, max_lat, 180.0),
+            (min_lat, -180.0, max_lat, max_lon),
+        ]
+    if max_lon > 180:
+        return [
+            (min_lat, min_lon, max_lat, 180.0),
+            (min_lat, -180.0, max_lat, max_lon - 360),
+        ]
+    return [(min_lat, min_lon, max_lat, max_lon)]
+
+
+def _segment_distance(p: Point, a: Point, b: Point) -> float:
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    if dx == 0 and dy == 0:
+        return math.hypot(p[0] - a[0], p[1] - a[1])
+
+    t = ((p[0] - a[0]) * dx + (p[1] - a[1]) * dy) / (dx * dx + dy * dy)
+    t = max(0.0, min(1.0, t))
+    return math.hypot(p[0] - (a[0] + t * dx), p[1] - (a[1] + t * dy))
+
+
+def _triangle_area(a: Point, b: Point, c: Point) -> float:
+    return abs((b[0] - a[0]) * (c[1] - a[1]) - (c[0] - a[0]) * (b[1] - a[1])) / 2
+
+
+def douglas_peucker(points: Sequence[Point], tolerance: float) -> List[int]:
+    """
+    Return the indexes of the points Douglas-Peucker keeps so that no dropped
+    point lies further than `tolerance` from the simplified line. `points`
+    must already be planar (see project()).
+    """
+    count = len(points)
+    if count <= 2:
+        return list(range(count))
+
+    keep = [False] * count
+    keep[0] = keep[-1] = True
+    stack = [(0, count - 1)]
+
+    while stack:
+        start, end = stack.pop()
+        max_distance, index = -1.0, None
+        for i in range(start + 1, end):
+            distance = _segment_distance(points[i], points[start], points[end])
+            if distance > max_distance:
+                max_distance, index = distance, i
+
+        if index is not None and max_distance > tolerance:
+            keep[index] = True
+            stack.append((start, index))
+            stack.append((index, end))
+
+    return [i for i, kept in enumerate(keep) if kept]
+
+
+def visvalingam(points: Sequence[Point], max_points: int) -> List[int]:
+    """
+    Return the indexes of at most `max_points` points, repeatedly dropping the
+    point whose triangle with its neighbours has the smallest area
+    (Visvalingam-Whyatt). The first and last points are always kept.
+    """
+    count = len(points)
+    max_points = max(max_points, 2)
+    if count <= max_points:
+        return list(range(count))
+
+    previous = list(range(-1, count - 1))
+    following = list(range(1, count + 1))
+    removed = [False] * count
+    areas = [math.inf] * count
+
+    heap = []
+    for i in range(1, count - 1):
+        areas[i] = _triangle_area(points[i - 1], points[i], points[i + 1])
+        heap.append((areas[i], i))
+    heapq.heapify(heap)
+
+    remaining = count
+    while remaining > max_points and heap:
+        area, i = heapq.heappop(heap)
+        if removed[i] or area != areas[i]:
+            continue
+
+        removed[i] = True
+        remaining -= 1
+        before, after = previous[i], following[i]
+        following[before], previous[after] = after, before
+
+        # Never let a neighbour's area drop below the one just removed, so the
+        # points removed first stay the least significant ones
+        for j in (before, after):
+            if 0 < j < count - 1:
+                areas[j] = max(
+                    area,
+                    _triangle_area(
+                        points[previous[j]], points[j], points[following[j]]
+                    ),
+                )
+                heapq.heappush(heap, (areas[j], j))
+
+    return [i for i in range(count) if not removed[i]]
+
+
+def simplify_track(
+    points: Sequence[Point],
+    tolerance: float = 0.0,
+    max_points: Optional[int] = None,
+) -> List[int]:
+    """
+    Return the indexes of the (latitude, longitude) points to keep: first
+    Douglas-Peucker with `tolerance` meters, then Visvalingam-Whyatt if the
+    result still exceeds `max_points`.
+    """
+    planar = project(points)
+    kept = (
+        douglas_peucker(planar, tolerance)
+        if tolerance > 0
+        else list(range(len(planar)))
+    )
+
+    if max_points is not None and len(kept) > max_points:
+        subset = visvalingam([planar[i] for i in kept], max_points)
+        kept = [kept[i] for i in subset]
+
+    return kept
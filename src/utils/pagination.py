@@ -0,0 +1,54 @@
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import tuple_
+from src.core.constants import MAX_PAGE_SIZE
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    raw = json.dumps([timestamp.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def clamp_page_size(limit: Optional[int], default: int) -> int:
+    if not limit or limit < 1:
+        return default
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def keyset_paginate(
+    query, timestamp_column, id_column, cursor: Optional[str], limit: int
+) -> Tuple[List, Optional[str]]:
+    """
+    Return one page of `query` ordered newest first on (timestamp, id) and the
+    cursor for the next page. Seeks past the cursor with a row-value
+    comparison instead of OFFSET, so deep pages cost the same as the first.
+    """
+    if cursor:
+        timestamp, row_id = decode_cursor(cursor)
+        query = query.filter(
+            tuple_(timestamp_column, id_column) < tuple_(timestamp, row_id)
+        )
+
+    rows = (
+        query.order_by(timestamp_column.desc(), id_column.desc()).limit(limit + 1).all()
+    )
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(
+        getattr(last, timestamp_column.key), getattr(last, id_column.key)
+    )
@@ -0,0 +1,18 @@
+from typing import Iterable
+from sqlalchemy import update
+from src.core.extensions import db
+
+
+def bump_versions(model, ids: Iterable[int]) -> None:
+    """
+    Mark rows of a versioned model as changed inside the caller's
+    transaction, e.g. when rows served together with them are written.
+    """
+    ids = list(ids)
+    if ids:
+        db.session.execute(
+            update(model)
+            .where(model.id.in_(ids))
+            .values(version=model.version + 1)
+            .execution_options(synchronize_session=False)
+        )
@@ -3,9 +3,17 @@ from datetime import datetime
 from flask_login import login_required, current_user
 from src.services.complaint_service import ComplaintService
 from src.services.sos_service import SOSService
-from src.services.analytics_service import AnalyticsService
+from src.services.map_service import MapService
 from src.services.location_service import LocationService
-from src.models.user import User
+from src.services.analytics_service import AnalyticsService
+from src.services.auth_service import AuthService
+from src.services.track_service import TrackOptions
+from src.services.serialization_service import SerializationService
+from src.core.constants import (
+    ActivityType,
+    DEFAULT_TRACK_TOLERANCE_METERS,
+    MAX_TRACK_POINTS,
+)
 
 admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
 
@@ -21,7 +29,7 @@ def require_admin():
 @admin_bp.route("/dashboard")
 def dashboard():
     metrics = AnalyticsService.get_dashboard_metrics()
-    active_sos = SOSService.get_active_sos_events()
+    active_sos = SOSService.get_active_sos_snapshots()
     recent_complaints = ComplaintService.get_all_complaints(limit=5)
     recent_activities = AnalyticsService.get_recent_activities(limit=10)
 
@@ -37,9 +45,17 @@ def dashboard():
 @admin_bp.route("/sos")
 def sos_list():
     status_filter = request.args.get("status")
-    sos_events = SOSService.get_all_sos_events(status_filter, limit=100)
+    try:
+        sos_events, next_cursor = SOSService.get_sos_page(
+            status=status_filter, cursor=request.args.get("cursor"), limit=100
+        )
+    except ValueError:
+        flash("Invalid page", "danger")
+        return redirect(url_for("admin.sos_list", status=status_filter))
 
-    return render_template("admin/sos_list.html", sos_events=sos_events)
+    return render_template(
+        "admin/sos_list.html", sos_events=sos_events, next_cursor=next_cursor
+    )
 
 
 @admin_bp.route("/sos/<sos_id>")
@@ -49,7 +65,16 @@ def sos_detail(sos_id):
         flash("SOS not found", "danger")
         return redirect(url_for("admin.sos_list"))
 
-    return render_template("admin/sos_detail.html", sos=sos)
+    sos_data = SerializationService.sos_events_to_dict(
+        [sos],
+        include_locations=True,
+        track=TrackOptions(
+            tolerance=DEFAULT_TRACK_TOLERANCE_METERS, max_points=MAX_TRACK_POINTS
+        ),
+    )[0]
+    return render_template(
+        "admin/sos_detail.html", sos=sos, locations=sos_data["location_history"]
+    )
 
 
 @admin_bp.route("/sos/<sos_id>/resolve", methods=["POST"])
@@ -68,9 +93,17 @@ def resolve_sos(sos_id):
 @admin_bp.route("/complaints")
 def complaints_list():
     status_filter = request.args.get("status")
-    complaints = ComplaintService.get_all_complaints(status_filter, limit=100)
+    try:
+        complaints, next_cursor = ComplaintService.get_complaints_page(
+            status=status_filter, cursor=request.args.get("cursor"), limit=100
+        )
+    except ValueError:
+        flash("Invalid page", "danger")
+        return redirect(url_for("admin.complaints_list", status=status_filter))
 
-    return render_template("admin/complaints_list.html", complaints=complaints)
+    return render_template(
+        "admin/complaints_list.html", complaints=complaints, next_cursor=next_cursor
+    )
 
 
 @admin_bp.route("/complaints/<complaint_id>")
@@ -102,8 +135,17 @@ def update_complaint_status(complaint_id):
 
 @admin_bp.route("/users")
 def users_list():
-    users = User.query.all()
-    return render_template("admin/users_list.html", users=users)
+    try:
+        users, next_cursor = AuthService.get_users_page(
+            request.args.get("cursor"), limit=100
+        )
+    except ValueError:
+        flash("Invalid page", "danger")
+        return redirect(url_for("admin.users_list"))
+
+    return render_template(
+        "admin/users_list.html", users=users, next_cursor=next_cursor
+    )
 
 
 @admin_bp.route("/users/<int:user_id>")
@@ -127,8 +169,19 @@ def user_detail(user_id):
 
 @admin_bp.route("/map")
 def map_view():
+    return render_template("admin/map.html", map_state=MapService.get_changes())
+
+
+@admin_bp.route("/map/locations")
+def map_locations():
     active_locations = LocationService.get_all_active_user_locations()
-    return render_template("admin/map.html", active_locations=active_locations)
+    return jsonify({"success": True, "locations": active_locations})
+
+
+@admin_bp.route("/map/changes")
+def map_changes():
+    changes = MapService.get_changes(request.args.get("since", type=int))
+    return jsonify({"success": True, **changes})
 
 
 @admin_bp.route("/analytics")
@@ -136,6 +189,9 @@ def analytics():
     metrics = AnalyticsService.get_dashboard_metrics()
     sos_trends = AnalyticsService.get_sos_trends(days=30)
     complaint_trends = AnalyticsService.get_complaint_trends(days=30)
+    sos_hourly_trends = AnalyticsService.get_hourly_trends(
+        ActivityType.SOS.value, hours=24
+    )
     status_distribution = AnalyticsService.get_complaint_status_distribution()
 
     return render_template(
@@ -143,5 +199,6 @@ def analytics():
         metrics=metrics,
         sos_trends=sos_trends,
         complaint_trends=complaint_trends,
+        sos_hourly_trends=sos_hourly_trends,
         status_distribution=status_distribution,
     )
@@ -18,14 +18,13 @@ def require_login():
 def dashboard():
     complaints = ComplaintService.get_user_complaints(current_user.id, limit=5)
     sos_events = SOSService.get_user_sos_history(current_user.id, limit=5)
-    active_sos = SOSService.get_active_sos_events()
-    active_sos = [sos for sos in active_sos if sos.user_id == current_user.id]
+    active_sos = SOSService.get_user_active_sos(current_user.id)
 
     return render_template(
         "user/dashboard.html",
         complaints=complaints,
         sos_events=sos_events,
-        active_sos=active_sos[0] if active_sos else None,
+        active_sos=active_sos,
     )
 
 
@@ -66,7 +65,14 @@ def new_complaint():
 @user_bp.route("/sos-history")
 def sos_history():
     sos_events = SOSService.get_user_sos_history(current_user.id)
-    return render_template("user/sos_history.html", sos_events=sos_events)
+    latest_locations = LocationService.get_latest_sos_locations(
+        [sos.id for sos in sos_events]
+    )
+    return render_template(
+        "user/sos_history.html",
+        sos_events=sos_events,
+        latest_locations=latest_locations,
+    )
 
 
 @user_bp.route("/profile")
@@ -77,4 +83,6 @@ def profile():
 @user_bp.route("/map")
 def map_view():
     locations = LocationService.get_user_locations(current_user.id, limit=100)
-    return render_template("user/map.html", locations=locations)
+    return render_template(
+        "user/map.html", locations=[location.to_dict() for location in locations]
+    )
@@ -1,9 +1,31 @@
-const socket = io();
+const socket = io({
+    autoConnect: document.body.dataset.authenticated === "true",
+});
+const sosSubscriptions = new Set();
 
 socket.on("connect", () => {
     console.log("Connected to WebSocket");
+    // Rooms belong to the old connection, so join them again
+    sosSubscriptions.forEach((sosId) =>
+        socket.emit("subscribe", { sos_id: sosId }),
+    );
 });
 
+function subscribeSOS(sosId) {
+    if (sosSubscriptions.has(sosId)) return;
+    sosSubscriptions.add(sosId);
+    if (socket.connected) {
+        socket.emit("subscribe", { sos_id: sosId });
+    }
+}
+
+function unsubscribeSOS(sosId) {
+    if (!sosSubscriptions.delete(sosId)) return;
+    if (socket.connected) {
+        socket.emit("unsubscribe", { sos_id: sosId });
+    }
+}
+
 socket.on("sos_triggered", (data) => {
     showNotification(
         "SOS Alert!",
@@ -25,6 +47,7 @@ socket.on("sos_location_update", (data) => {
 });
 
 socket.on("sos_resolved", (data) => {
+    unsubscribeSOS(data.sos_id);
     showNotification(
         "SOS Resolved",
         "An SOS event has been resolved",
@@ -33,6 +56,9 @@ socket.on("sos_resolved", (data) => {
     if (typeof refreshSOSList === "function") {
         refreshSOSList();
     }
+    if (typeof updateMap === "function") {
+        updateMap();
+    }
 });
 
 function showNotification(title, message, type = "info") {
@@ -70,24 +96,28 @@ function initMap(
         attribution: "&copy; OpenStreetMap contributors",
     }).addTo(map);
 
-    locations.forEach((loc) => {
-        const markerColor = loc.type === "sos" ? "red" : "blue";
-        const marker = L.marker([loc.latitude, loc.longitude], {
-            icon: L.divIcon({
-                className: "custom-marker",
-                html: `<div style="background: ${markerColor}; width: 20px; height: 20px; border-radius: 50%; border: 3px solid white;"></div>`,
-                iconSize: [20, 20],
-            }),
-        }).addTo(map);
-
-        if (loc.popup) {
-            marker.bindPopup(loc.popup);
-        }
-    });
+    locations.forEach((loc) => createMarker(map, loc));
 
     return map;
 }
 
+function createMarker(map, loc) {
+    const markerColor = loc.type === "sos" ? "red" : "blue";
+    const marker = L.marker([loc.latitude, loc.longitude], {
+        icon: L.divIcon({
+            className: "custom-marker",
+            html: `<div style="background: ${markerColor}; width: 20px; height: 20px; border-radius: 50%; border: 3px solid white;"></div>`,
+            iconSize: [20, 20],
+        }),
+    }).addTo(map);
+
+    if (loc.popup) {
+        marker.bindPopup(loc.popup);
+    }
+
+    return marker;
+}
+
 function formatDate(dateString) {
     const date = new Date(dateString);
     const now = new Date();
@@ -0,0 +1,137 @@
+import time
+import uuid
+from datetime import datetime, timedelta
+import pytest
+from config import TestingConfig
+from src.app import create_app
+from src.core.constants import UserRole
+from src.core.extensions import db
+from src.models.auth_invalidation import AuthInvalidation
+from src.models.user import User
+from src.services.auth_cache import AuthCache
+from src.services.location_writer import location_writer
+
+
+@pytest.fixture(scope="module")
+def app(tmp_path_factory):
+    database = tmp_path_factory.mktemp("auth_cache") / "auth.db"
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(
+            TestingConfig, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{database}"
+        )
+        monkeypatch.setattr(TestingConfig, "BOOTSTRAP_ON_STARTUP", True)
+        monkeypatch.setattr(TestingConfig, "AUTH_CACHE_SYNC_INTERVAL", 0)
+        app = create_app("testing")
+
+    with app.app_context():
+        yield app
+        location_writer.stop()
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def other_worker(app):
+    """An auth cache that only learns of changes through the database."""
+    cache = AuthCache()
+    cache.app = app
+    cache._cache.ttl = app.config["AUTH_CACHE_TTL"]
+    yield cache
+    cache.stop()
+
+
+@pytest.fixture
+def user(app):
+    user = User(
+        user_id=str(uuid.uuid4()),
+        name="Cached",
+        email=f"{uuid.uuid4().hex}@pyraksha.test",
+        phone="0",
+        password_hash="x",
+        role=UserRole.USER.value,
+    )
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def _published(user):
+    return AuthInvalidation.query.filter_by(user_id=user.id).count()
+
+
+def test_role_change_reaches_other_workers(user, other_worker):
+    assert not other_worker.get(user.id).is_admin()
+
+    user.role = UserRole.ADMIN.value
+    db.session.commit()
+    assert not other_worker.get(user.id).is_admin()
+
+    other_worker.sync()
+    assert other_worker.get(user.id).is_admin()
+
+
+@pytest.mark.parametrize(
+    "field, value", [("is_active", False), ("password_hash", "changed")]
+)
+def test_account_changes_are_published(user, field, value):
+    setattr(user, field, value)
+    db.session.commit()
+    assert _published(user) == 1
+
+
+def test_profile_changes_are_not_published(user):
+    user.name = "Renamed"
+    user.last_login = datetime.utcnow()
+    db.session.commit()
+    assert _published(user) == 0
+
+
+def test_rolled_back_changes_are_not_published(user):
+    user.role = UserRole.ADMIN.value
+    db.session.flush()
+    db.session.rollback()
+    assert _published(user) == 0
+
+
+def test_delete_reaches_other_workers(user, other_worker):
+    user_id = user.id
+    assert other_worker.get(user_id) is not None
+
+    db.session.delete(user)
+    db.session.commit()
+    other_worker.sync()
+
+    assert other_worker.get(user_id) is None
+
+
+def test_sync_applies_each_row_once(user, other_worker):
+    user.role = UserRole.ADMIN.value
+    db.session.commit()
+    other_worker.sync()
+
+    cached = other_worker.get(user.id)
+    other_worker.sync()
+    assert other_worker.get(user.id) is cached
+
+
+def test_sync_prunes_expired_rows(user, other_worker):
+    expired = datetime.utcnow() - timedelta(seconds=3 * other_worker._cache.ttl)
+    db.session.add(AuthInvalidation(user_id=user.id, created_at=expired))
+    db.session.commit()
+
+    other_worker.sync()
+
+    assert _published(user) == 0
+
+
+def test_sync_thread_picks_up_changes(app, user, other_worker):
+    other_worker.sync_interval = 0.01
+    assert not other_worker.get(user.id).is_admin()
+
+    user.role = UserRole.ADMIN.value
+    db.session.commit()
+
+    deadline = time.monotonic() + 5
+    while not other_worker.get(user.id).is_admin():
+        assert time.monotonic() < deadline, "change never synced"
+        time.sleep(0.01)
@@ -0,0 +1,117 @@
+import threading
+import pytest
+from src.utils.cache import TTLCache
+
+
+def test_get_returns_default_for_missing_and_expired_keys():
+    cache = TTLCache(ttl=60)
+    cache.set("fresh", 1)
+    cache.set("stale", 2, ttl=0)
+
+    assert cache.get("fresh") == 1
+    assert cache.get("stale", "default") == "default"
+    assert cache.get("missing") is None
+    assert len(cache) == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_get_or_set_caches_the_factory_result():
+    cache = TTLCache()
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return "value"
+
+    assert cache.get_or_set("key", factory) == "value"
+    assert cache.get_or_set("key", factory) == "value"
+    assert len(calls) == 1
+
+
+def test_get_or_set_runs_one_factory_for_concurrent_misses():
+    cache = TTLCache()
+    started, release = threading.Event(), threading.Event()
+    calls, results = [], []
+
+    def factory():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "value"
+
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(cache.get_or_set("key", factory))
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    started.wait(5)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == ["value"] * 8
+    assert cache._flights == {}
+
+
+def test_get_or_set_does_not_serialize_different_keys():
+    cache = TTLCache()
+    inside, release = threading.Event(), threading.Event()
+
+    def slow():
+        inside.set()
+        release.wait(5)
+        return "slow"
+
+    thread = threading.Thread(target=cache.get_or_set, args=("slow", slow))
+    thread.start()
+    inside.wait(5)
+    try:
+        assert cache.get_or_set("fast", lambda: "fast") == "fast"
+    finally:
+        release.set()
+        thread.join(5)
+
+
+@pytest.mark.parametrize("invalidate", ["pop", "clear"])
+def test_value_computed_across_an_invalidation_is_not_stored(invalidate):
+    cache = TTLCache()
+
+    def factory():
+        # A write lands while the value is being computed
+        if invalidate == "pop":
+            cache.pop("key")
+        else:
+            cache.clear()
+        return "stale"
+
+    assert cache.get_or_set("key", factory) == "stale"
+    assert cache.get("key") is None
+    assert cache.get_or_set("key", lambda: "fresh") == "fresh"
+    assert cache.get("key") == "fresh"
+
+
+def test_factory_errors_propagate_and_are_not_cached():
+    cache = TTLCache()
+
+    def failing():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_set("key", failing)
+    assert cache._flights == {}
+    assert cache.get_or_set("key", lambda: "value") == "value"
@@ -0,0 +1,73 @@
+import pytest
+from flask import Flask
+from src.core.extensions import db
+from src.models.location import Location
+from src.services.geo_service import GeoService
+import src.models  # noqa: F401  registers every table on db.metadata
+
+
+@pytest.fixture
+def session(tmp_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'geo.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield db.session
+        db.session.remove()
+        db.engine.dispose()
+
+
+def _add(session, *points):
+    rows = [Location(user_id=1, latitude=lat, longitude=lon) for lat, lon in points]
+    session.add_all(rows)
+    session.commit()
+    return rows
+
+
+def test_within_radius_wraps_the_antimeridian(session):
+    east, west, far, _ = _add(
+        session, (0.0, 179.99), (0.0, -179.99), (0.0, -179.9), (0.0, 0.0)
+    )
+
+    hits = GeoService.within_radius(Location.query, Location, 0.0, 179.995, 5000, None)
+
+    assert [row for row, _ in hits] == [east, west]
+    assert hits[0][1] == pytest.approx(556, abs=1)
+    assert hits[1][1] == pytest.approx(1668, abs=1)
+    assert far not in [row for row, _ in hits]
+
+
+def test_within_radius_from_the_west_side(session):
+    east, west = _add(session, (0.0, 179.99), (0.0, -179.99))
+
+    hits = GeoService.within_radius(Location.query, Location, 0.0, -179.999, 5000, 1)
+
+    assert [row for row, _ in hits] == [west]
+
+
+def test_nearest_crosses_the_antimeridian(session):
+    east, west, _ = _add(session, (10.0, 179.999), (10.0, -179.9), (10.0, 170.0))
+
+    hits = GeoService.nearest(Location.query, Location, 10.0, -179.99, 2)
+
+    assert [row for row, _ in hits] == [east, west]
+
+
+def test_in_bbox_crossing_the_antimeridian(session):
+    east, west, _ = _add(session, (0.0, 179.5), (0.0, -179.5), (0.0, 0.0))
+
+    rows = GeoService.in_bbox(Location.query, Location, (-1, 179.0, 1, -179.0), 10)
+
+    assert sorted(row.id for row in rows) == [east.id, west.id]
+
+
+def test_backfill_fills_in_missing_geohashes(session):
+    (row,) = _add(session, (19.07, 72.87))
+    session.execute(db.update(Location).values(geohash=None))
+    session.commit()
+
+    assert GeoService.backfill(Location, batch_size=1) == 1
+    session.refresh(row)
+    assert row.geohash.startswith("te7u")
+    assert GeoService.backfill(Location, batch_size=1) == 0
@@ -0,0 +1,84 @@
+import pytest
+from src.utils import geohash
+
+
+@pytest.mark.parametrize(
+    "cell, end",
+    [
+        ("9", "b"),
+        ("tdr1", "tdr2"),
+        ("tdr1z", "tdr2"),
+        ("bzz", "c"),
+        ("z", None),
+        ("", None),
+    ],
+)
+def test_prefix_end(cell, end):
+    assert geohash.prefix_end(cell) == end
+
+
+def test_prefix_range_holds_exactly_the_cells_hashes():
+    cell = "tdr1"
+    end = geohash.prefix_end(cell)
+    for char in geohash.BASE32:
+        assert cell <= cell + char < end
+    assert not cell <= "tdr0z" < end
+    assert not cell <= end < end
+
+
+@pytest.mark.parametrize(
+    "latitude, longitude, expected",
+    [
+        (57.64911, 10.40744, "u4pruydqqvj"),
+        (42.6, -5.6, "ezs42"),
+        (0.0, 0.0, "s0000"),
+        (-90.0, -180.0, "00000"),
+    ],
+)
+def test_encode_known_hashes(latitude, longitude, expected):
+    assert geohash.encode(latitude, longitude, len(expected)) == expected
+
+
+def test_encode_is_a_prefix_of_finer_precisions():
+    full = geohash.encode(19.07, 72.87)
+    assert len(full) == geohash.PRECISION
+    for precision in range(1, geohash.PRECISION):
+        assert geohash.encode(19.07, 72.87, precision) == full[:precision]
+
+
+@pytest.mark.parametrize("precision", [1, 5, 6, 12])
+def test_cell_size_matches_the_bits_per_axis(precision):
+    lat_size, lon_size = geohash.cell_size(precision)
+    bits = precision * 5
+    assert lat_size == 180.0 / 2 ** (bits // 2)
+    assert lon_size == 360.0 / 2 ** (bits - bits // 2)
+
+
+def test_covering_cells_cover_the_whole_box():
+    box = (19.0, 72.8, 19.1, 72.95)
+    cells = geohash.covering_cells(*box)
+    assert 1 <= len(cells) <= 32
+    assert len({len(cell) for cell in cells}) == 1
+
+    min_lat, min_lon, max_lat, max_lon = box
+    for step in range(11):
+        lat = min_lat + (max_lat - min_lat) * step / 10
+        for col in range(11):
+            lon = min_lon + (max_lon - min_lon) * col / 10
+            assert geohash.encode(lat, lon).startswith(tuple(cells))
+
+
+def test_covering_cells_include_the_neighbours_across_a_cell_edge():
+    # A tiny box straddling the boundary between two cells at (0, 0)
+    cells = geohash.covering_cells(-1e-6, -1e-6, 1e-6, 1e-6)
+    assert len(cells) == 4
+    assert [cell[0] for cell in cells] == ["7", "e", "k", "s"]
+
+
+def test_covering_cells_respect_max_cells():
+    cells = geohash.covering_cells(0.0, 0.0, 40.0, 40.0, max_cells=4)
+    assert len(cells) <= 4
+
+
+def test_covering_the_whole_world_matches_every_hash():
+    assert geohash.covering_cells(-90, -180, 90, 180, max_cells=1) == [""]
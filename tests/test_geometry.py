@@ -0,0 +1,102 @@
+import math
+import pytest
+from src.utils.geometry import (
+    bounding_boxes,
+    douglas_peucker,
+    haversine_meters,
+    project,
+    simplify_track,
+    visvalingam,
+)
+
+
+def test_douglas_peucker_drops_collinear_points():
+    points = [(float(x), 0.0) for x in range(10)]
+    assert douglas_peucker(points, 0.1) == [0, 9]
+
+
+def test_douglas_peucker_keeps_points_beyond_tolerance():
+    points = [(0.0, 0.0), (1.0, 1.55), (2.0, 3.0), (3.0, 1.45), (4.0, 0.0)]
+    assert douglas_peucker(points, 0.5) == [0, 2, 4]
+    assert douglas_peucker(points, 0.01) == [0, 1, 2, 3, 4]
+
+
+def test_douglas_peucker_bounds_the_error():
+    points = [(float(x), math.sin(x / 3)) for x in range(60)]
+    tolerance = 0.05
+    kept = douglas_peucker(points, tolerance)
+    for start, end in zip(kept, kept[1:]):
+        (x1, y1), (x2, y2) = points[start], points[end]
+        length = math.hypot(x2 - x1, y2 - y1)
+        for x, y in points[start + 1 : end]:
+            distance = abs((x2 - x1) * (y1 - y) - (x1 - x) * (y2 - y1)) / length
+            assert distance <= tolerance
+
+
+@pytest.mark.parametrize("count", [0, 1, 2])
+def test_douglas_peucker_short_tracks(count):
+    points = [(0.0, 0.0), (1.0, 1.0)][:count]
+    assert douglas_peucker(points, 1.0) == list(range(count))
+
+
+def test_visvalingam_drops_the_smallest_triangles_first():
+    points = [(0.0, 0.0), (1.0, 0.1), (2.0, 5.0), (3.0, 0.2), (4.0, 0.0)]
+    assert visvalingam(points, 3) == [0, 2, 4]
+
+
+def test_visvalingam_keeps_the_endpoints():
+    points = [(float(x), float(x % 2)) for x in range(50)]
+    kept = visvalingam(points, 5)
+    assert len(kept) == 5
+    assert kept[0] == 0 and kept[-1] == 49
+    assert kept == sorted(kept)
+
+
+@pytest.mark.parametrize("max_points", [0, 1, 2])
+def test_visvalingam_never_goes_below_two_points(max_points):
+    points = [(float(x), float(x * x)) for x in range(10)]
+    assert visvalingam(points, max_points) == [0, 9]
+
+
+def test_simplify_track_without_limits_keeps_everything():
+    points = [(19.0 + i * 1e-4, 72.0) for i in range(5)]
+    assert simplify_track(points) == list(range(5))
+
+
+def test_simplify_track_applies_tolerance_in_meters():
+    # A point 5 m off a straight 200 m track
+    offset = math.degrees(5 / 6371008.8)
+    points = [(19.0, 72.0), (19.0009, 72.0 + offset), (19.0018, 72.0)]
+    assert simplify_track(points, tolerance=10) == [0, 2]
+    assert simplify_track(points, tolerance=1) == [0, 1, 2]
+
+
+def test_simplify_track_caps_the_point_count():
+    points = [(19.0 + i * 1e-4, 72.0 + (i % 3) * 1e-4) for i in range(100)]
+    kept = simplify_track(points, tolerance=0.5, max_points=10)
+    assert len(kept) == 10
+    assert kept[0] == 0 and kept[-1] == 99
+
+
+def test_project_preserves_distances():
+    a, b = (19.07, 72.87), (19.08, 72.88)
+    (x1, y1), (x2, y2) = project([a, b])
+    assert math.hypot(x2 - x1, y2 - y1) == pytest.approx(
+        haversine_meters(*a, *b), rel=1e-3
+    )
+
+
+def test_bounding_boxes_split_at_the_antimeridian():
+    east = bounding_boxes(0.0, 179.99, 5000)
+    assert len(east) == 2
+    assert east[0][1] < 180.0 and east[0][3] == 180.0
+    assert east[1][1] == -180.0 and east[1][3] > -180.0
+
+    west = bounding_boxes(0.0, -179.99, 5000)
+    assert len(west) == 2
+    assert west[0][3] == 180.0 and west[1][1] == -180.0
+
+
+def test_bounding_boxes_near_a_pole_span_every_longitude():
+    (box,) = bounding_boxes(89.99, 10.0, 5000)
+    assert box[1] == -180.0 and box[3] == 180.0 and box[2] == 90.0
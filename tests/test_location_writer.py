@@ -0,0 +1,127 @@
+import threading
+import pytest
+from flask import Flask
+from src.core.extensions import db
+from src.services.location_writer import (
+    DURABILITY_ASYNC,
+    DURABILITY_SYNC,
+    LocationWriter,
+    _PendingWrite,
+)
+
+ROWS = [{"user_id": 1, "latitude": 19.07, "longitude": 72.87}]
+
+
+@pytest.fixture
+def writer(tmp_path, monkeypatch):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'writer.db'}"
+    db.init_app(app)
+
+    writer = LocationWriter()
+    writer.app = app
+    writer.enabled = True
+    writer.durability = DURABILITY_SYNC
+    writer.timeout = 0.05
+    writer.max_delay = 0.001
+
+    inserted = writer.inserted = []
+    monkeypatch.setattr(LocationWriter, "_insert", staticmethod(inserted.extend))
+    yield writer
+    writer.stop()
+
+
+def _hold_writer(writer, monkeypatch):
+    """Queue writes without a writer thread to drain them."""
+    monkeypatch.setattr(writer, "_ensure_started", lambda: None)
+
+
+def test_claim_before_cancel_wins():
+    pending = _PendingWrite(ROWS)
+    assert pending.claim()
+    assert not pending.cancel()
+
+
+def test_cancel_before_claim_wins():
+    pending = _PendingWrite(ROWS)
+    assert pending.cancel()
+    assert not pending.claim()
+
+
+def test_sync_write_waits_for_the_group_commit(writer):
+    assert writer.write(ROWS) == (True, "Locations written")
+    assert writer.inserted == ROWS
+
+
+def test_async_write_returns_once_queued(writer, monkeypatch):
+    _hold_writer(writer, monkeypatch)
+    writer.durability = DURABILITY_ASYNC
+    assert writer.write(ROWS) == (True, "Locations queued")
+    assert writer.queue_depth() == 1
+
+
+def test_timed_out_write_is_cancelled_and_never_committed(writer, monkeypatch):
+    _hold_writer(writer, monkeypatch)
+
+    assert writer.write(ROWS) == (False, "Timed out waiting for location write")
+
+    # The writer reaches the submission after the caller gave up on it
+    writer._commit_group([writer._queue.get_nowait()])
+    assert writer.inserted == []
+
+
+def test_write_claimed_before_the_timeout_is_not_reported_failed(writer, monkeypatch):
+    _hold_writer(writer, monkeypatch)
+    writer.timeout = 0.2
+    committed = threading.Event()
+
+    def slow_writer():
+        pending = writer._queue.get(timeout=5)
+        assert pending.claim()
+        # Finishes after the first wait times out, within the second
+        threading.Timer(writer.timeout * 1.5, committed.set).start()
+        committed.wait(5)
+        pending.done.set()
+
+    thread = threading.Thread(target=slow_writer)
+    thread.start()
+    assert writer.write(ROWS) == (True, "Locations written")
+    thread.join(5)
+
+
+def test_write_still_in_flight_after_both_waits_is_accepted(writer, monkeypatch):
+    _hold_writer(writer, monkeypatch)
+    release = threading.Event()
+
+    def stuck_writer():
+        pending = writer._queue.get(timeout=5)
+        assert pending.claim()
+        release.wait(5)
+        pending.done.set()
+
+    thread = threading.Thread(target=stuck_writer)
+    thread.start()
+    try:
+        assert writer.write(ROWS) == (
+            True,
+            "Locations accepted, write not yet confirmed",
+        )
+    finally:
+        release.set()
+        thread.join(5)
+
+
+def test_failed_submission_does_not_fail_its_group(writer, monkeypatch):
+    def insert(rows):
+        if any(row.get("bad") for row in rows):
+            raise ValueError("bad row")
+        writer.inserted.extend(rows)
+
+    monkeypatch.setattr(LocationWriter, "_insert", staticmethod(insert))
+    good, bad = _PendingWrite(ROWS), _PendingWrite([{"bad": True}])
+
+    writer._commit_group([good, bad])
+
+    assert good.done.is_set() and good.error is None
+    assert bad.done.is_set() and bad.error == "bad row"
+    assert writer.inserted == ROWS
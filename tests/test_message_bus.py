@@ -0,0 +1,105 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import pytest
+from src.core.message_bus import SQLiteManager
+
+
+@pytest.fixture
+def url(tmp_path):
+    return f"sqlite:///{tmp_path / 'bus.db'}"
+
+
+class _Listener:
+    """Drains a manager's _listen() generator on a background thread."""
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.received = []
+        self._messages = manager._listen()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        _wait_for(lambda: manager._last_seen_id is not None)
+
+    def _run(self):
+        for payload in self._messages:
+            self.received.append(pickle.loads(payload))
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_rejects_other_urls():
+    with pytest.raises(ValueError):
+        SQLiteManager("redis://localhost:6379/0")
+
+
+def test_published_messages_reach_listeners_in_order(url):
+    listener = _Listener(SQLiteManager(url, poll_interval=0.001))
+    publisher = SQLiteManager(url, write_only=True)
+
+    for i in range(5):
+        publisher._publish({"method": "emit", "n": i})
+
+    _wait_for(lambda: len(listener.received) == 5)
+    assert [message["n"] for message in listener.received] == list(range(5))
+
+
+def test_listener_skips_messages_from_before_it_started(url):
+    publisher = SQLiteManager(url, write_only=True)
+    publisher._publish({"n": "old"})
+
+    listener = _Listener(SQLiteManager(url, poll_interval=0.001))
+    publisher._publish({"n": "new"})
+
+    _wait_for(lambda: listener.received)
+    assert listener.received == [{"n": "new"}]
+
+
+def test_channels_are_isolated(url):
+    listener = _Listener(SQLiteManager(url, channel="a", poll_interval=0.001))
+    SQLiteManager(url, channel="b", write_only=True)._publish({"n": "b"})
+    SQLiteManager(url, channel="a", write_only=True)._publish({"n": "a"})
+
+    _wait_for(lambda: listener.received)
+    time.sleep(0.02)
+    assert listener.received == [{"n": "a"}]
+
+
+def test_backlog_counts_unread_messages(url):
+    manager = SQLiteManager(url, poll_interval=0.001)
+    publisher = SQLiteManager(url, write_only=True)
+    assert manager.backlog() is None
+
+    # The listener's connection belongs to the thread that started it
+    messages = manager._listen()
+    with ThreadPoolExecutor(max_workers=1) as reader:
+        first = reader.submit(next, messages)
+        _wait_for(lambda: manager._last_seen_id is not None)
+        publisher._publish({"n": 0})
+        assert pickle.loads(first.result(5)) == {"n": 0}
+        assert manager.backlog() == 0
+
+        for i in range(1, 4):
+            publisher._publish({"n": i})
+        assert manager.backlog() == 3
+
+        rest = [reader.submit(next, messages).result(5) for _ in range(3)]
+        assert [pickle.loads(payload)["n"] for payload in rest] == [1, 2, 3]
+        assert manager.backlog() == 0
+
+
+def test_prune_removes_expired_messages(url):
+    manager = SQLiteManager(url, retention=0.0)
+    manager._publish({"n": 0})
+    conn = manager._connect()
+    try:
+        manager._prune(conn)
+        assert conn.execute("SELECT COUNT(*) FROM socketio_messages").fetchone()[0] == 0
+    finally:
+        conn.close()
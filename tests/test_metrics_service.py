@@ -0,0 +1,71 @@
+import threading
+import pytest
+from flask import Flask
+from src.services.metrics_service import MetricsService, metrics_cache
+
+
+@pytest.fixture
+def app_context():
+    app = Flask(__name__)
+    app.config["METRICS_CACHE_TTL"] = 60
+    metrics_cache.clear()
+    with app.app_context():
+        yield
+    metrics_cache.clear()
+
+
+def test_counts_are_cached(app_context, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        MetricsService, "_query_counts", lambda: calls.append(1) or {"total_sos": 1}
+    )
+
+    assert MetricsService.get_counts() == {"total_sos": 1}
+    assert MetricsService.get_counts() == {"total_sos": 1}
+    assert len(calls) == 1
+
+
+def test_invalidate_during_query_is_not_overwritten(app_context, monkeypatch):
+    results = iter([{"total_sos": 1}, {"total_sos": 2}])
+
+    def query_counts():
+        # A write lands while the counts are being read
+        MetricsService.invalidate()
+        return next(results)
+
+    monkeypatch.setattr(MetricsService, "_query_counts", query_counts)
+    assert MetricsService.get_counts() == {"total_sos": 1}
+
+    monkeypatch.setattr(MetricsService, "_query_counts", lambda: next(results))
+    assert MetricsService.get_counts() == {"total_sos": 2}
+
+
+def test_concurrent_misses_query_once(app_context, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def query_counts():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"total_sos": 1}
+
+    monkeypatch.setattr(MetricsService, "_query_counts", query_counts)
+    app = Flask(__name__)
+    app.config["METRICS_CACHE_TTL"] = 60
+    results = []
+
+    def read():
+        with app.app_context():
+            results.append(MetricsService.get_counts())
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    started.wait(5)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == [{"total_sos": 1}] * 8
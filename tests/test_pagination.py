@@ -0,0 +1,67 @@
+import base64
+from datetime import datetime
+import pytest
+from src.core.constants import MAX_PAGE_SIZE
+from src.utils.pagination import clamp_page_size, decode_cursor, encode_cursor
+
+
+def _raw_cursor(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+@pytest.mark.parametrize(
+    "timestamp, row_id",
+    [
+        (datetime(2026, 10, 18, 13, 45, 12, 345678), 42),
+        (datetime(2026, 1, 1), 1),
+        (datetime(1999, 12, 31, 23, 59, 59), 10**12),
+    ],
+)
+def test_cursor_round_trip(timestamp, row_id):
+    cursor = encode_cursor(timestamp, row_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (timestamp, row_id)
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor(datetime(2026, 10, 18, 23, 59, 59, 999999), 2**40 - 1)
+    assert set(cursor) <= set(
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+    )
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "",
+        "not a cursor",
+        "%%%%",
+        _raw_cursor(b"\xff\xfe"),
+        _raw_cursor(b"{}"),
+        _raw_cursor(b"null"),
+        _raw_cursor(b"42"),
+        _raw_cursor(b'["2026-10-18T13:45:12"]'),
+        _raw_cursor(b'["2026-10-18T13:45:12", 1, 2]'),
+        _raw_cursor(b'["yesterday", 1]'),
+        _raw_cursor(b"[1700000000, 1]"),
+        _raw_cursor(b'["2026-10-18T13:45:12", "one"]'),
+        _raw_cursor(b'["2026-10-18T13:45:12", [1]]'),
+    ],
+)
+def test_tampered_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
+
+
+def test_truncated_cursor_is_rejected():
+    cursor = encode_cursor(datetime(2026, 10, 18, 13, 45), 42)
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor[:-3])
+
+
+@pytest.mark.parametrize(
+    "limit, expected",
+    [(None, 50), (0, 50), (-5, 50), (10, 10), (MAX_PAGE_SIZE + 1, MAX_PAGE_SIZE)],
+)
+def test_clamp_page_size(limit, expected):
+    assert clamp_page_size(limit, 50) == expected
@@ -0,0 +1,47 @@
+import pytest
+from config import TestingConfig
+from src.app import create_app
+from src.core.extensions import db
+from src.core.query_audit import QUERY_BUDGETS
+from src.devtools.route_audit import RouteAudit
+from src.services.auth_cache import auth_cache
+from src.services.location_writer import location_writer
+
+
+@pytest.fixture(scope="module")
+def audit(tmp_path_factory):
+    """Run the route audit once against a fresh, migrated database."""
+    database = tmp_path_factory.mktemp("audit") / "audit.db"
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(
+            TestingConfig, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{database}"
+        )
+        monkeypatch.setattr(TestingConfig, "BOOTSTRAP_ON_STARTUP", True)
+        app = create_app("testing")
+
+    with app.app_context():
+        yield RouteAudit.run()
+        location_writer.stop()
+        auth_cache.stop()
+        db.engine.dispose()
+
+
+def test_every_route_succeeds(audit):
+    _, _, failures = audit
+    assert failures == []
+
+
+def test_every_route_is_exercised(audit):
+    _, missing, _ = audit
+    assert missing == []
+
+
+def test_every_route_has_a_budget(audit):
+    worst, _, _ = audit
+    assert sorted(set(worst) - set(QUERY_BUDGETS)) == []
+
+
+def test_every_route_stays_within_its_budget(audit):
+    worst, _, _ = audit
+    problems = [problem for queries in worst.values() for problem in queries.problems()]
+    assert problems == []